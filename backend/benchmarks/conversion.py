@@ -0,0 +1,99 @@
+"""
+Benchmark: end-to-end /api/convert-resume throughput on an offline model backend
+
+Run from the backend directory:
+    python -m benchmarks.conversion [--requests 200] [--concurrency 50] [--backend stub]
+Record real responses once with --backend record (needs OPENAI_API_KEY), then
+rerun deterministically with --backend replay. Stub latency and error rates
+follow the LLM_STUB_* settings.
+"""
+import argparse
+import asyncio
+import os
+import time
+from collections import Counter
+import httpx
+from main import app
+from middleware.rate_limit import limiter
+from routers import convert
+from services.cache import conversion_cache
+from services.upstream import upstream_limiter
+
+
+def build_resume(index: int) -> str:
+    """Distinct but deterministic resume text, so runs can be recorded and replayed"""
+    roles = "\n".join(
+        f"Senior Engineer {index}-{role} at Company {role}, 2018 - 2022\n"
+        f"- Reduced latency by {role + 10}% across {index % 7 + 2} services"
+        for role in range(4)
+    )
+    return (
+        f"Candidate {index}\ncandidate{index}@example.com\n+1 555 01{index % 100:02d}\n\n"
+        f"SUMMARY\nBackend engineer with {index % 15 + 3} years of experience.\n\n"
+        f"EXPERIENCE\n{roles}\n\nEDUCATION\nBSc Computer Science\n\nSKILLS\nPython, Go, SQL"
+    )
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(requests: int, concurrency: int, standard: str):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], Counter()
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        async def one(index: int):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/convert-resume",
+                    json={"resume_text": build_resume(index), "standard": standard}
+                )
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(requests)])
+        elapsed = time.perf_counter() - started
+
+    print(f"{requests} requests, concurrency {concurrency}, {elapsed:.2f}s, {requests / elapsed:.1f} req/s")
+    print(
+        f"latency p50 {percentile(latencies, 50) * 1000:.0f}ms  "
+        f"p95 {percentile(latencies, 95) * 1000:.0f}ms  "
+        f"p99 {percentile(latencies, 99) * 1000:.0f}ms"
+    )
+    print(f"status codes {dict(sorted(statuses.items()))}")
+    print(f"upstream {upstream_limiter.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--backend", choices=convert.LLM_BACKENDS, default="stub")
+    parser.add_argument("--standard", default="us_ats")
+    parser.add_argument("--cache", action="store_true", help="keep the conversion cache enabled")
+    args = parser.parse_args()
+
+    os.environ["LLM_BACKEND"] = args.backend
+    if not args.cache:
+        os.environ["CONVERT_CACHE_MAX_MB"] = "0"
+    limiter.enabled = False
+    conversion_cache.configure()
+    upstream_limiter.configure()
+
+    async def session():
+        await convert.startup_openai_client()
+        try:
+            await run(args.requests, args.concurrency, args.standard)
+        finally:
+            await convert.shutdown_openai_client()
+
+    asyncio.run(session())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: streaming DOCX extractor vs python-docx
+
+Run from the backend directory:
+    python -m benchmarks.docx_extraction [--roles 40] [--iterations 50]
+"""
+import argparse
+import time
+import tracemalloc
+from io import BytesIO
+from docx import Document
+from routers.resume import parse_docx, parse_docx_stream
+
+
+def build_resume(roles: int) -> bytes:
+    """Build a resume-like DOCX with a header, skills table and many roles"""
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Smith | jane@example.com | +1 555 0100"
+    doc.add_heading("Professional Summary", level=1)
+    doc.add_paragraph("Engineer with a track record of shipping reliable systems. " * 3)
+    table = doc.add_table(rows=4, cols=3)
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text = "Python, Go, Kubernetes, PostgreSQL"
+    doc.add_heading("Work Experience", level=1)
+    for i in range(roles):
+        doc.add_paragraph(f"Senior Engineer {i} - Company {i} - 01/20{i % 20:02d} to 12/20{i % 20:02d}")
+        for j in range(5):
+            doc.add_paragraph(f"Reduced latency by {j + 10}% across {i + 3} services", style="List Bullet")
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(parser, content: bytes, iterations: int):
+    """Return (mean ms, peak traced KB, characters extracted)"""
+    text = parser(content)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        parser(content)
+    mean_ms = (time.perf_counter() - started) / iterations * 1000
+
+    tracemalloc.start()
+    parser(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mean_ms, peak / 1024, len(text)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--roles", type=int, default=40)
+    arg_parser.add_argument("--iterations", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    content = build_resume(args.roles)
+    print(f"Document: {len(content) / 1024:.1f}KB, {args.roles} roles, {args.iterations} iterations")
+    print(f"{'engine':<14}{'mean ms':>10}{'peak KB':>10}{'chars':>8}")
+    for name, parser in (("python-docx", parse_docx), ("docx-stream", parse_docx_stream)):
+        mean_ms, peak_kb, chars = measure(parser, content, args.iterations)
+        print(f"{name:<14}{mean_ms:>10.2f}{peak_kb:>10.0f}{chars:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+OpenAI-compatible stub server for offline load tests
+
+Serves /v1/chat/completions from the local stub backend, so the real OpenAI
+client, connection pool and upstream limiter are exercised without network
+access or spend. Run from the backend directory:
+    uvicorn benchmarks.stub_openai_server:app --port 8001
+and point the backend at it:
+    OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=stub uvicorn main:app
+Latency and error injection follow the LLM_STUB_* settings.
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from openai import APIStatusError
+from services.llm import StubChatClient
+
+app = FastAPI(title="LLM stub")
+stub = StubChatClient.from_env()
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    try:
+        result = await stub.chat.completions.create(**body)
+    except APIStatusError as e:
+        headers = {
+            name: value for name, value in e.response.headers.items()
+            if name in ("retry-after", "retry-after-ms")
+        }
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"error": {"message": e.message, "type": "stub_error", "code": None}},
+            headers=headers,
+        )
+
+    if body.get("stream"):
+        async def events():
+            async for chunk in result:
+                yield f"data: {chunk.model_dump_json()}\n\n"
+            yield "data: [DONE]\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+    return JSONResponse(result.model_dump())
@@ -7,8 +7,17 @@ from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import os
 from dotenv import load_dotenv
-from routers import resume, convert, download
+from routers import resume, bulk, convert, download, jobs
 from middleware.rate_limit import limiter, RateLimitExceeded, _rate_limit_exceeded_handler
+from middleware.body_limit import BodySizeLimitMiddleware, FORM_OVERHEAD
+from services.extraction import extraction_engine
+from services.cache import parse_cache, conversion_cache
+from services.singleflight import conversion_flight
+from services.upstream import upstream_limiter
+from services.routing import routing_policy
+from services.hedging import hedger
+from services.jobs import job_queue
+from services.repair import repair_stats
 
 # Load environment variables
 load_dotenv()
@@ -25,9 +34,21 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events"""
     # Startup
     print("🚀 Resumate Backend starting up...")
+    extraction_engine.start()
+    parse_cache.configure()
+    conversion_cache.configure()
+    upstream_limiter.configure()
+    routing_policy.configure()
+    hedger.configure()
+    await convert.startup_openai_client()
+    await jobs.startup_job_queue()
     yield
     # Shutdown
     print("👋 Resumate Backend shutting down...")
+    extraction_engine.shutdown()
+    await jobs.shutdown_job_queue()
+    await convert.shutdown_openai_client()
+    conversion_cache.close()
 
 
 app = FastAPI(
@@ -41,6 +62,21 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Cap upload bodies before they are parsed (inside CORS so rejections carry its headers)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        "/api/parse-resume": (
+            resume.MAX_FILE_SIZE + FORM_OVERHEAD,
+            "File size exceeds maximum allowed size (2MB)"
+        ),
+        "/api/parse-resumes/bulk": (
+            bulk.MAX_ARCHIVE_SIZE + FORM_OVERHEAD,
+            "Upload exceeds maximum allowed size (100MB)"
+        ),
+    },
+)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -52,8 +88,10 @@ app.add_middleware(
 
 # Include routers
 app.include_router(resume.router)
+app.include_router(bulk.router)
 app.include_router(convert.router)
 app.include_router(download.router)
+app.include_router(jobs.router)
 
 
 @app.get("/health")
@@ -66,6 +104,22 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for the parsing and conversion pipelines"""
+    return {
+        "extraction": extraction_engine.stats(),
+        "parse_cache": parse_cache.stats(),
+        "conversion_cache": conversion_cache.stats(),
+        "conversion_flight": conversion_flight.stats(),
+        "upstream": upstream_limiter.stats(),
+        "routes": routing_policy.stats(),
+        "hedging": hedger.stats(),
+        "jobs": job_queue.stats(),
+        "repair": repair_stats.stats(),
+    }
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -73,5 +127,6 @@ async def root():
         "message": "Resumate API",
         "docs": "/docs",
         "health": "/health",
+        "metrics": "/metrics",
     }
 
@@ -16,6 +16,7 @@ RATE_LIMITS = {
     "convert": "10/hour",
     "download": "20/hour",
     "parse": "50/hour",
+    "jobs": "10/hour",
 }
 
 
@@ -1,6 +1,17 @@
 """
 Prompt templates for resume conversion to different standards
+
+Templates are built once at import into a registry. Each template keeps its
+static instructions and output schema first and the per-request values last,
+so every call for a template shares the longest possible prompt prefix for
+provider-side prompt caching.
 """
+import hashlib
+import json
+import re
+from typing import Dict
+
+SYSTEM_PROMPT = "You are an expert resume conversion assistant. Always return valid JSON only, no markdown, no explanations."
 
 RESUME_STANDARDS = {
     "us_ats": "US ATS",
@@ -10,6 +21,44 @@ RESUME_STANDARDS = {
 }
 
 
+# Per-request values such as {resume_text}; JSON braces in the schemas never match
+_PLACEHOLDER = re.compile(r"\{([a-z_]+)\}")
+
+
+class PromptTemplate:
+    """
+    A prompt template with a content-derived version.
+
+    The version hashes the system prompt and template text, so any edit
+    changes it; it is used in conversion cache keys and logs.
+    """
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+        match = _PLACEHOLDER.search(text)
+        self.prefix = text[:match.start()] if match else text
+        digest = hashlib.sha256(f"{SYSTEM_PROMPT}\x1f{text}".encode("utf-8")).hexdigest()
+        self.version = digest[:12]
+
+    def render(self, **values: str) -> str:
+        """
+        Fill placeholders in one pass (the templates contain literal JSON
+        braces, so str.format cannot be used).
+        """
+        return _PLACEHOLDER.sub(lambda m: values.get(m.group(1), m.group(0)), self.text)
+
+
+def get_prompt(name: str) -> PromptTemplate:
+    """
+    Get a registered prompt: a resume standard, "canonical", "summary_style",
+    "section_repair" or a chunk prompt such as "us_ats:experience".
+    """
+    if name not in PROMPTS:
+        raise ValueError(f"Unknown standard: {name}")
+    return PROMPTS[name]
+
+
 def get_prompt_template(standard: str) -> str:
     """
     Get prompt template for the specified resume standard.
@@ -20,17 +69,10 @@ def get_prompt_template(standard: str) -> str:
     Returns:
         Prompt template string
     """
-    templates = {
-        "us_ats": _get_us_ats_prompt(),
-        "europass": _get_europass_prompt(),
-        "indian_corporate": _get_indian_corporate_prompt(),
-        "uk_professional": _get_uk_professional_prompt()
-    }
-    
-    if standard not in templates:
+    if standard not in RESUME_STANDARDS:
         raise ValueError(f"Unknown standard: {standard}")
     
-    return templates[standard]
+    return PROMPTS[standard].text
 
 
 def _get_us_ats_prompt() -> str:
@@ -83,10 +125,10 @@ OUTPUT FORMAT (valid JSON only):
   "skills": ["string (technical and soft skills)"]
 }
 
-Resume text to convert:
-{resume_text}
+Return ONLY valid JSON. No markdown, no explanations, no code blocks.
 
-Return ONLY valid JSON. No markdown, no explanations, no code blocks."""
+Resume text to convert:
+{resume_text}"""
 
 
 def _get_europass_prompt() -> str:
@@ -146,10 +188,10 @@ OUTPUT FORMAT (valid JSON only):
   ]
 }
 
-Resume text to convert:
-{resume_text}
+Return ONLY valid JSON. No markdown, no explanations, no code blocks.
 
-Return ONLY valid JSON. No markdown, no explanations, no code blocks."""
+Resume text to convert:
+{resume_text}"""
 
 
 def _get_indian_corporate_prompt() -> str:
@@ -208,10 +250,10 @@ OUTPUT FORMAT (valid JSON only):
   }
 }
 
-Resume text to convert:
-{resume_text}
+Return ONLY valid JSON. No markdown, no explanations, no code blocks.
 
-Return ONLY valid JSON. No markdown, no explanations, no code blocks."""
+Resume text to convert:
+{resume_text}"""
 
 
 def _get_uk_professional_prompt() -> str:
@@ -266,8 +308,188 @@ OUTPUT FORMAT (valid JSON only):
   "skills": ["string (technical and professional skills)"]
 }
 
+Return ONLY valid JSON. No markdown, no explanations, no code blocks.
+
 Resume text to convert:
-{resume_text}
+{resume_text}"""
+
 
-Return ONLY valid JSON. No markdown, no explanations, no code blocks."""
+def _get_canonical_prompt() -> str:
+    """
+    Prompt for a standard-neutral extraction used by multi-standard conversion.
+    
+    The schema is a superset of every standard's fields so each standard can be
+    derived from it without another model call.
+    """
+    return """You are an expert resume writer. Extract every fact from the following resume text into a single, standard-neutral structured record.
+
+CRITICAL REQUIREMENTS:
+- Extract facts only; do not invent details that are not in the resume
+- Use null for any field that is not present
+- Rewrite achievements as concise bullet points with action verbs and metrics where the text provides them
+- NO emojis, symbols, or special characters
+- Use MM/YYYY for experience dates and YYYY for graduation dates
+- Use reverse chronological order for experience and education
+- Group skills into categories such as "Technical Skills", "Soft Skills" and "Languages"
+
+OUTPUT FORMAT (valid JSON only):
+{
+  "personal_info": {
+    "full_name": "string",
+    "email": "string",
+    "phone": "string",
+    "location": "string (City, Region/Country)",
+    "address": "string or null",
+    "linkedin": "string or null",
+    "website": "string or null",
+    "nationality": "string or null",
+    "date_of_birth": "DD/MM/YYYY or null",
+    "current_ctc": "string or null",
+    "expected_ctc": "string or null",
+    "notice_period": "string or null",
+    "professional_qualifications": "string or null"
+  },
+  "summary": "string (professional summary, 2-3 sentences)",
+  "experience": [
+    {
+      "title": "string",
+      "company": "string",
+      "location": "string",
+      "start_date": "MM/YYYY",
+      "end_date": "MM/YYYY or 'Present'",
+      "description": "string (one sentence describing the role)",
+      "achievements": ["string (quantified bullet points)"]
+    }
+  ],
+  "education": [
+    {
+      "degree": "string",
+      "field_of_study": "string or null",
+      "institution": "string",
+      "university": "string or null (affiliating university, if different)",
+      "location": "string",
+      "graduation_date": "YYYY",
+      "gpa": "string or null",
+      "grade": "string or null (e.g. 'First Class Honours', '2:1')",
+      "percentage": "string or null",
+      "honors": "string or null",
+      "qualifications": "string or null"
+    }
+  ],
+  "skills": [
+    {
+      "category": "string",
+      "items": ["string"]
+    }
+  ]
+}
+
+Return ONLY valid JSON. No markdown, no explanations, no code blocks.
+
+Resume text to convert:
+{resume_text}"""
+
+
+def _get_summary_style_prompt() -> str:
+    """Prompt that rewrites the summary for several standards in one call"""
+    return """You are an expert resume writer. Rewrite the professional summary below once for each requested resume standard.
+
+STYLE BY STANDARD:
+- us_ats: 2-3 sentences, ATS-optimized, keyword-rich, action oriented
+- europass: 2-3 sentences, clear professional tone for European employers
+- indian_corporate: 2-3 sentences, formal Indian business English, highlight technical skills
+- uk_professional: 2-3 sentence professional profile in British English spelling
+
+Use only facts from the summary and resume facts. NO emojis, symbols, or special characters.
+
+OUTPUT FORMAT (valid JSON only):
+{
+  "summaries": {
+    "<standard>": "string"
+  }
+}
+
+Return ONLY valid JSON. No markdown, no explanations, no code blocks.
+
+Requested standards: {standards}
+
+Summary and resume facts:
+{resume_facts}"""
+
+
+def _get_section_repair_prompt() -> str:
+    """
+    Follow-up sent after a conversion prompt when sections came back missing
+    or invalid. The earlier answer is not sent back, so this must stand alone.
+    """
+    return """Convert the resume above again, but return ONLY a JSON object containing exactly the sections listed below, each in the shape given in the OUTPUT FORMAT above. Do not include any other section. An earlier conversion of this resume left these sections missing or not matching the OUTPUT FORMAT.
+
+Return ONLY valid JSON. No markdown, no explanations, no code blocks.
+
+Sections to return: {sections}
+
+Problems found:
+{problems}"""
+
+
+# Parts of a long resume converted concurrently in chunked mode: every
+# section except experience, and groups of experience entries
+CHUNK_PARTS = ("profile", "experience")
+
+_REQUIREMENTS = re.compile(r"CRITICAL REQUIREMENTS:\n(.*?)\n\n", re.DOTALL)
+_OUTPUT_FORMAT = re.compile(r"OUTPUT FORMAT \(valid JSON only\):\n(.*?)\n\nReturn ONLY", re.DOTALL)
+
+
+def _get_chunk_prompt(template: str, part: str) -> str:
+    """
+    Prompt for one part of a chunked conversion, derived from a standard's
+    template: the same requirements, with the output format cut down to the
+    part's sections.
+    """
+    intro = template.split("\n\n", 1)[0]
+    requirements = _REQUIREMENTS.search(template).group(1)
+    output_format = json.loads(_OUTPUT_FORMAT.search(template).group(1))
+    if part == "experience":
+        task = ("The text below is a group of work experience entries from a longer resume. "
+                "Convert every role in it and nothing else; do not merge, drop or invent roles.")
+        output_format = {"experience": output_format["experience"]}
+    else:
+        task = ("Convert the resume text below. Its work experience is converted separately, "
+                "so leave the experience section out.")
+        output_format = {name: value for name, value in output_format.items() if name != "experience"}
+    return f"""{intro}
+
+{task}
+
+CRITICAL REQUIREMENTS:
+{requirements}
+
+OUTPUT FORMAT (valid JSON only):
+{json.dumps(output_format, indent=2)}
+
+Return ONLY valid JSON. No markdown, no explanations, no code blocks.
+
+Resume text to convert:
+{{resume_text}}"""
+
+
+# Registry built once at import
+PROMPTS: Dict[str, PromptTemplate] = {
+    name: PromptTemplate(name, builder())
+    for name, builder in [
+        ("us_ats", _get_us_ats_prompt),
+        ("europass", _get_europass_prompt),
+        ("indian_corporate", _get_indian_corporate_prompt),
+        ("uk_professional", _get_uk_professional_prompt),
+        ("canonical", _get_canonical_prompt),
+        ("summary_style", _get_summary_style_prompt),
+        ("section_repair", _get_section_repair_prompt),
+    ]
+}
 
+# Chunk prompts, registered as "<standard>:<part>"
+PROMPTS.update({
+    f"{name}:{part}": PromptTemplate(f"{name}:{part}", _get_chunk_prompt(PROMPTS[name].text, part))
+    for name in [*RESUME_STANDARDS, "canonical"]
+    for part in CHUNK_PARTS
+})
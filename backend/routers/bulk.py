@@ -0,0 +1,156 @@
+"""
+Bulk resume ingestion router - parse many resumes per request
+"""
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import asyncio
+import json
+import os
+import posixpath
+import zipfile
+from routers.resume import MAX_FILE_SIZE, parse_upload
+from services.uploads import spool_upload, spool_zip_member, UploadTooLargeError
+from services.filetype import sniff_file_type
+
+router = APIRouter(prefix="/api", tags=["resume"])
+
+# Maximum archive size: 100MB
+MAX_ARCHIVE_SIZE = 100 * 1024 * 1024
+
+# Maximum number of resumes per bulk request
+MAX_BULK_FILES = 500
+
+
+def _is_hidden(name: str) -> bool:
+    """Skip macOS resource forks and dotfiles inside archives"""
+    return name.startswith("__MACOSX/") or posixpath.basename(name).startswith(".")
+
+
+async def _parse_item(index: int, file_name: str, load, semaphore: asyncio.Semaphore) -> dict:
+    """Parse one file of the batch, reporting failures inline"""
+    async with semaphore:
+        try:
+            upload = await load()
+            with upload:
+                result = await parse_upload(upload, file_name)
+            return {"index": index, "success": True, **result}
+        except UploadTooLargeError:
+            status_code, detail = 400, "File size exceeds maximum allowed size (2MB)"
+        except HTTPException as e:
+            status_code, detail = e.status_code, e.detail
+        except Exception as e:
+            status_code, detail = 500, f"An error occurred while parsing the resume: {str(e)}"
+    return {
+        "index": index,
+        "success": False,
+        "file_name": file_name,
+        "status_code": status_code,
+        "detail": detail,
+    }
+
+
+@router.post("/parse-resumes/bulk")
+async def parse_resumes_bulk(
+    files: Optional[List[UploadFile]] = File(None),
+    archive: Optional[UploadFile] = File(None)
+):
+    """
+    Parse a batch of resumes from a ZIP archive or a multipart file list.
+
+    Files are parsed with bounded parallelism (BULK_PARSE_CONCURRENCY) and
+    streamed back as NDJSON, one line per file as soon as it finishes,
+    followed by a summary line. Per-file errors are reported inline.
+    """
+    if not files and not archive:
+        raise HTTPException(
+            status_code=400,
+            detail="Either files or an archive must be provided"
+        )
+
+    items = []  # (file name, coroutine function returning a SpooledUpload)
+    spooled = []
+
+    if archive:
+        try:
+            archive_upload = await spool_upload(archive, MAX_ARCHIVE_SIZE)
+        except UploadTooLargeError:
+            raise HTTPException(
+                status_code=400,
+                detail="Archive exceeds maximum allowed size (100MB)"
+            )
+        spooled.append(archive_upload)
+
+        if sniff_file_type(archive_upload.path) != "zip":
+            archive_upload.close()
+            raise HTTPException(
+                status_code=400,
+                detail="Archive must be a ZIP file"
+            )
+        with zipfile.ZipFile(archive_upload.path) as zf:
+            members = [m for m in zf.infolist() if not m.is_dir() and not _is_hidden(m.filename)]
+
+        for member in members:
+            items.append((
+                member.filename,
+                lambda member=member: asyncio.to_thread(
+                    spool_zip_member, archive_upload.path, member, MAX_FILE_SIZE
+                )
+            ))
+    else:
+        # Spool now: FastAPI closes the uploads as soon as this handler returns
+        for file in files:
+            try:
+                upload = await spool_upload(file, MAX_FILE_SIZE)
+            except UploadTooLargeError as e:
+                items.append((file.filename, _raiser(e)))
+                continue
+            spooled.append(upload)
+            items.append((file.filename, _returner(upload)))
+
+    if len(items) > MAX_BULK_FILES:
+        for upload in spooled:
+            upload.close()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files ({len(items)}). Maximum per request is {MAX_BULK_FILES}."
+        )
+
+    async def stream():
+        semaphore = asyncio.Semaphore(int(os.getenv("BULK_PARSE_CONCURRENCY", "4")))
+        tasks = [
+            asyncio.ensure_future(_parse_item(index, name, load, semaphore))
+            for index, (name, load) in enumerate(items)
+        ]
+        succeeded = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                line = await next_done
+                succeeded += line["success"]
+                yield json.dumps(line) + "\n"
+            yield json.dumps({
+                "done": True,
+                "total": len(tasks),
+                "succeeded": succeeded,
+                "failed": len(tasks) - succeeded,
+            }) + "\n"
+        finally:
+            # Client went away or batch finished: stop work and drop temp files
+            for task in tasks:
+                task.cancel()
+            for upload in spooled:
+                upload.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _returner(upload):
+    async def load():
+        return upload
+    return load
+
+
+def _raiser(error: Exception):
+    async def load():
+        raise error
+    return load
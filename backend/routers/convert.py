@@ -2,39 +2,166 @@
 Resume conversion router - AI-powered conversion to different standards
 """
 from fastapi import APIRouter, HTTPException, Body, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple
 import os
 import json
-from openai import OpenAI, APIError, RateLimitError, APIConnectionError, APITimeoutError
-from prompts.resume_templates import get_prompt_template, RESUME_STANDARDS
+import time
+import asyncio
+import logging
+import httpx
+from functools import lru_cache
+from openai import AsyncOpenAI, APIError, RateLimitError, APIConnectionError, APITimeoutError
+from prompts.resume_templates import get_prompt, PromptTemplate, RESUME_STANDARDS, SYSTEM_PROMPT
+from services.standards import to_standard
+from services.sections import segment_resume, format_sections, parse_sections, PREAMBLE_SECTION
+from services.chunking import split_roles, group_roles, sort_reverse_chronological
+from services.incremental import changed_sections, affected_outputs, source_sections, match_roles
+from services.cache import conversion_cache
+from services.json_stream import JSONObjectStream
+from services.singleflight import conversion_flight
+from services.upstream import upstream_limiter, UpstreamBusyError
+from services.routing import routing_policy, Route
+from services.hedging import hedger
+from services.llm import StubChatClient, RecordReplayClient
+from services.repair import EMPTY_SECTIONS, SECTION_SCHEMAS, salvage_resume, validate_resume, repair_stats
+from services.tokens import count_tokens, compact_text, fit_to_budget, PromptTooLargeError
 from middleware.rate_limit import limiter, RATE_LIMITS
 
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 router = APIRouter(prefix="/api", tags=["convert"])
 
-# Initialize OpenAI client
+logger = logging.getLogger(__name__)
+
+# Shared model client, created and closed by the application lifespan
 openai_client = None
 
+# Model clients selectable with LLM_BACKEND: the OpenAI API, a local stub, or
+# the OpenAI API with responses recorded to / replayed from LLM_RECORD_DIR
+LLM_BACKENDS = ("openai", "stub", "record", "replay")
+
+
+def _create_openai_client(api_key: str) -> AsyncOpenAI:
+    """Create an async client on a pooled keep-alive HTTP connection pool"""
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "200")),
+            max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", "50")),
+            keepalive_expiry=60.0,
+        ),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        http2=HTTP2_AVAILABLE,
+    )
+    # Retries are handled by the upstream limiter, which also adapts concurrency
+    return AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+
+
+def _create_client():
+    """
+    Create the model client selected by LLM_BACKEND.
+    
+    Returns None when the backend needs an API key and none is configured.
+    """
+    backend = os.getenv("LLM_BACKEND", "openai")
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM_BACKEND: {backend}. Available: {', '.join(LLM_BACKENDS)}")
+    record_dir = os.getenv("LLM_RECORD_DIR", "llm-recordings")
+    if backend == "stub":
+        return StubChatClient.from_env()
+    if backend == "replay":
+        return RecordReplayClient(record_dir, "replay")
+    
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    client = _create_openai_client(api_key)
+    if backend == "record":
+        return RecordReplayClient(record_dir, "record", client)
+    return client
+
 
 def get_openai_client():
-    """Get or create OpenAI client"""
+    """Get or create the model client"""
     global openai_client
     if openai_client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
+        try:
+            openai_client = _create_client()
+        except ValueError as e:
+            raise HTTPException(
+                status_code=500,
+                detail=str(e)
+            )
+        if openai_client is None:
             raise HTTPException(
                 status_code=500,
                 detail="OPENAI_API_KEY not configured"
             )
-        openai_client = OpenAI(api_key=api_key)
     return openai_client
 
 
+async def startup_openai_client():
+    """Open the shared client at startup unless it still needs an API key"""
+    global openai_client
+    if openai_client is None:
+        openai_client = _create_client()
+
+
+async def shutdown_openai_client():
+    """Close the shared client and its connection pool"""
+    global openai_client
+    if openai_client is not None:
+        await openai_client.close()
+        openai_client = None
+
+
+StandardName = Literal["us_ats", "europass", "indian_corporate", "uk_professional"]
+
+
 class ConvertResumeRequest(BaseModel):
     resume_text: str = Field(..., description="The extracted resume text to convert")
-    standard: Literal["us_ats", "europass", "indian_corporate", "uk_professional"] = Field(
+    standard: StandardName = Field(
         ..., description="Resume standard to convert to"
     )
+    sections: Optional[Dict[str, str]] = Field(
+        None, description="Sections returned by /api/parse-resume; derived from resume_text when omitted"
+    )
+
+
+class ConvertIncrementalRequest(BaseModel):
+    standard: StandardName = Field(
+        ..., description="Resume standard of the previous conversion"
+    )
+    previous_resume: Dict[str, Any] = Field(
+        ..., description="Structured resume returned by the previous conversion"
+    )
+    previous_text: str = Field(..., description="Resume text the previous conversion was made from")
+    previous_sections: Optional[Dict[str, str]] = Field(
+        None, description="Sections of the previous text; derived from previous_text when omitted"
+    )
+    resume_text: str = Field(..., description="The edited resume text")
+    sections: Optional[Dict[str, str]] = Field(
+        None, description="Sections of the edited text; derived from resume_text when omitted"
+    )
+
+
+class ConvertMultiRequest(BaseModel):
+    resume_text: str = Field(..., description="The extracted resume text to convert")
+    standards: List[StandardName] = Field(
+        default_factory=lambda: list(RESUME_STANDARDS), description="Resume standards to convert to"
+    )
+    sections: Optional[Dict[str, str]] = Field(
+        None, description="Sections returned by /api/parse-resume; derived from resume_text when omitted"
+    )
+    rewrite_summaries: bool = Field(
+        True, description="Rewrite the summary in each standard's style with one extra model call"
+    )
 
 
 def parse_json_response(response_text: str) -> dict:
@@ -62,6 +189,500 @@ def parse_json_response(response_text: str) -> dict:
         )
 
 
+# Model used for conversions unless LLM_MODEL is set
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+def conversion_model() -> str:
+    """Model used for conversions (LLM_MODEL)"""
+    return os.getenv("LLM_MODEL") or DEFAULT_MODEL
+
+
+def conversion_model_key() -> str:
+    """
+    The models a conversion may be served by, for cache keys: LLM_MODEL and
+    the routing table version, since routes can override the model
+    """
+    return f"{conversion_model()}@routes-{routing_policy.version}"
+
+# Top-level fields every structured resume must contain
+REQUIRED_FIELDS = list(SECTION_SCHEMAS)
+
+# Pseudo-standard for the standard-neutral extraction used by multi-standard conversion
+CANONICAL_STANDARD = "canonical"
+
+
+def resume_sections(resume_text: str, sections: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Compacted sections of resume text, or of the given sections"""
+    return {
+        name: compact_text(body)
+        for name, body in (sections or segment_resume(resume_text)).items()
+    }
+
+
+def prepare_resume_text(
+    resume_text: str, standard: str, sections: Optional[Dict[str, str]] = None
+) -> Tuple[str, dict]:
+    """
+    Send cleaned, section-labelled text rather than the raw extraction.
+    
+    Sections are compacted and, when the prompt for ``standard`` would exceed
+    PROMPT_TOKEN_BUDGET, trimmed according to PROMPT_TRIM_POLICY. Returns the
+    text and the budget report included in responses.
+    """
+    # Text that cleans down to nothing is sent compacted but otherwise as is
+    sections = resume_sections(resume_text, sections) or {PREAMBLE_SECTION: compact_text(resume_text)}
+    budget = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+    policy = os.getenv("PROMPT_TRIM_POLICY", "sections")
+    model = conversion_model()
+    overhead = prompt_overhead(standard, model)
+    try:
+        text, trimmed = fit_to_budget(sections, budget - overhead, policy, model)
+    except PromptTooLargeError as e:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Resume is too long to convert ({e.tokens + overhead} prompt tokens, budget is {budget})"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=str(e)
+        )
+    return text, {
+        "prompt_version": prompt_for(standard).version,
+        "estimated_prompt_tokens": overhead + count_tokens(text, model),
+        "budget": budget,
+        "trimmed": trimmed
+    }
+
+
+@lru_cache(maxsize=None)
+def prompt_overhead(standard: str, model: str) -> int:
+    """Tokens used by the system prompt and a standard's template without resume text"""
+    template = prompt_for(standard).render(resume_text="")
+    return count_tokens(SYSTEM_PROMPT, model) + count_tokens(template, model)
+
+
+def _completion_kwargs(prompt: str, followup: Optional[str] = None, route: Optional[Route] = None) -> dict:
+    """
+    Chat completion arguments shared by buffered and streamed calls.
+    
+    A follow-up is sent as a second user message so the conversation still
+    starts with the original (cacheable) prompt. The route sets the model,
+    output token limit and timeout.
+    """
+    messages = [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+    if followup:
+        messages.append({
+            "role": "user",
+            "content": followup
+        })
+    kwargs = {
+        "model": (route and route.model) or conversion_model(),
+        "messages": messages,
+        "temperature": 0.3,
+        "response_format": {"type": "json_object"},
+        "timeout": route.timeout if route else 60.0
+    }
+    if route and route.max_tokens:
+        kwargs["max_tokens"] = route.max_tokens
+    return kwargs
+
+
+# Share of its route's timeout after which a successful call counts as slow
+SLOW_CALL_FRACTION = 0.8
+
+
+def select_route(prompt: str, followup: Optional[str] = None, standard: Optional[str] = None) -> Route:
+    """Route for a call, chosen by prompt size and standard"""
+    input_tokens = count_tokens(prompt + (followup or ""), conversion_model())
+    return routing_policy.select(input_tokens, standard)
+
+
+async def _open_routed(
+    create, prompt: str, followup: Optional[str], route: Route, stream: bool = False
+):
+    """
+    Start a call on its route, moving to the route's fallback on timeout or
+    overload. Returns the limiter's (result, lease), the route that served it
+    and when that attempt started.
+    
+    A buffered call only counts as slow for the limiter when it nears its
+    route's timeout, since long resumes legitimately take longer; a stream's
+    duration is its generation time, so it never does.
+    """
+    tried = [route.name]
+    deadline = upstream_limiter.deadline()
+    while True:
+        kwargs = _completion_kwargs(prompt, followup, route)
+        started = time.monotonic()
+        try:
+            # A timeout would likely recur with the same settings, so a route
+            # with a fallback moves on instead of retrying; rate limits and
+            # server errors are retried here first
+            opened = await upstream_limiter.open(
+                lambda: create(**kwargs),
+                deadline,
+                retryable=lambda e: not (route.fallback and isinstance(e, APITimeoutError)),
+                latency_target=0 if stream else route.timeout * SLOW_CALL_FRACTION
+            )
+        except Exception as e:
+            routing_policy.record(route, time.monotonic() - started, e)
+            fallback = routing_policy.fallback(route, e, tried)
+            if fallback is None:
+                raise
+            logger.info("route fallback from=%s to=%s error=%s", route.name, fallback.name, type(e).__name__)
+            route = fallback
+            tried.append(route.name)
+            continue
+        return opened, route, started
+
+
+def openai_error_to_http(error: Exception) -> HTTPException:
+    """Map an OpenAI client error to the HTTP error returned to the caller"""
+    if isinstance(error, HTTPException):
+        return error
+    if isinstance(error, UpstreamBusyError):
+        return HTTPException(
+            status_code=503,
+            detail="Conversion service is busy. Please try again shortly."
+        )
+    if isinstance(error, RateLimitError):
+        return HTTPException(
+            status_code=429,
+            detail="OpenAI API rate limit exceeded. Please try again later."
+        )
+    if isinstance(error, APITimeoutError):
+        return HTTPException(
+            status_code=504,
+            detail="Request to OpenAI API timed out. Please try again."
+        )
+    if isinstance(error, APIConnectionError):
+        return HTTPException(
+            status_code=503,
+            detail="Unable to connect to OpenAI API. Please check your connection and try again."
+        )
+    if isinstance(error, APIError):
+        error_message = str(error)
+        if "insufficient_quota" in error_message.lower():
+            return HTTPException(
+                status_code=402,
+                detail="OpenAI API quota exceeded. Please check your API key billing."
+            )
+        elif "invalid_api_key" in error_message.lower():
+            return HTTPException(
+                status_code=401,
+                detail="Invalid OpenAI API key. Please check your configuration."
+            )
+        else:
+            return HTTPException(
+                status_code=500,
+                detail=f"OpenAI API error: {error_message}"
+            )
+    return HTTPException(
+        status_code=500,
+        detail=f"Unexpected error calling OpenAI API: {str(error)}"
+    )
+
+
+def _record_usage(usage: Optional[dict], reported) -> None:
+    """Copy token counts reported by the API into ``usage``"""
+    if usage is not None and reported is not None:
+        usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + (reported.prompt_tokens or 0)
+        usage["completion_tokens"] = usage.get("completion_tokens", 0) + (reported.completion_tokens or 0)
+
+
+async def call_openai(
+    prompt: str,
+    usage: Optional[dict] = None,
+    followup: Optional[str] = None,
+    standard: Optional[str] = None
+) -> str:
+    """
+    Send a prompt (and optional follow-up message) to OpenAI and return the
+    response text.
+    
+    The model, output limit and timeout come from the routing policy, by
+    prompt size and ``standard``. Calls go through the adaptive upstream
+    limiter, which queues and retries them, and are hedged when enabled (see
+    Hedger). API errors are mapped to HTTP errors. Token counts are added to
+    ``usage`` when given.
+    """
+    client = get_openai_client()
+    route = select_route(prompt, followup, standard)
+    
+    async def attempt():
+        (response, lease), served_by, started = await _open_routed(
+            client.chat.completions.create, prompt, followup, route
+        )
+        lease.release()
+        routing_policy.record(served_by, time.monotonic() - started)
+        return response
+    
+    try:
+        response = await hedger.run(attempt, hedger.delay(route.latencies()))
+    except Exception as e:
+        raise openai_error_to_http(e)
+    
+    _record_usage(usage, getattr(response, "usage", None))
+    
+    # Extract response content
+    response_text = response.choices[0].message.content
+    
+    if not response_text:
+        raise HTTPException(
+            status_code=500,
+            detail="Empty response from OpenAI"
+        )
+    
+    return response_text
+
+
+async def stream_openai(
+    prompt: str, usage: Optional[dict] = None, standard: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Stream the response text for a prompt as it is generated.
+    
+    The call is routed like call_openai; a fallback is only possible before
+    the stream starts. API errors are mapped to HTTP errors; the upstream
+    stream is closed when the caller stops iterating. Token counts are added
+    to ``usage`` when given.
+    """
+    client = get_openai_client()
+    
+    def create(**kwargs):
+        return client.chat.completions.create(**kwargs, stream=True, stream_options={"include_usage": True})
+    
+    try:
+        (stream, lease), route, started = await _open_routed(
+            create, prompt, None, select_route(prompt, None, standard), stream=True
+        )
+    except Exception as e:
+        raise openai_error_to_http(e)
+    
+    # The upstream slot is held until the stream is finished or abandoned
+    error = None
+    try:
+        async for chunk in stream:
+            _record_usage(usage, getattr(chunk, "usage", None))
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    except BaseException as e:
+        error = e
+        if isinstance(e, Exception):
+            raise openai_error_to_http(e)
+        raise
+    finally:
+        lease.release(error)
+        if error is None or isinstance(error, Exception):
+            routing_policy.record(route, time.monotonic() - started, error)
+        await stream.close()
+
+
+def repair_rounds() -> int:
+    """Follow-up calls allowed to fill in missing or invalid sections (CONVERT_REPAIR_ROUNDS)"""
+    return max(0, int(os.getenv("CONVERT_REPAIR_ROUNDS", "1")))
+
+
+async def complete_resume(
+    prompt: str,
+    response_text: str,
+    usage: dict,
+    sections: Optional[List[str]] = None,
+    standard: Optional[str] = None
+) -> Tuple[dict, List[str]]:
+    """
+    Validate the model's response, repairing sections instead of failing.
+    
+    Every section that parses and matches its schema is kept. Missing or
+    invalid sections are requested again in a short follow-up to the original
+    prompt (null sections are valid and become empty), for up to CONVERT_REPAIR_ROUNDS rounds, and merged in. Only
+    ``sections`` are required when given. Returns the resume and the names of
+    the repaired sections.
+    """
+    resume = salvage_resume(response_text)
+    valid, problems = validate_resume(resume, sections)
+    resume.update(valid)
+    repaired: List[str] = []
+    
+    for _ in range(repair_rounds() if problems else 0):
+        followup = get_prompt("section_repair").render(
+            sections=", ".join(problems),
+            problems="\n".join(f"- {name}: {problem}" for name, problem in problems.items())
+        )
+        round_usage = no_usage()
+        try:
+            response_text = await call_openai(prompt, round_usage, followup, standard)
+        finally:
+            repair_stats.record_round(len(problems), round_usage)
+            for key, tokens in round_usage.items():
+                usage[key] = usage.get(key, 0) + tokens
+        
+        fixed, _ = validate_resume(salvage_resume(response_text), problems)
+        for name in list(problems):
+            if name in fixed:
+                resume[name] = fixed[name]
+                repaired.append(name)
+                del problems[name]
+        if not problems:
+            break
+    
+    if problems:
+        repair_stats.failed += 1
+        name, problem = next(iter(problems.items()))
+        if not resume:
+            detail = "Failed to parse AI response as JSON"
+        elif problem == "missing":
+            detail = f"AI response missing required field: {name}"
+        else:
+            detail = f"AI response has invalid field: {name} {problem}"
+        raise HTTPException(
+            status_code=500,
+            detail=detail
+        )
+    if repaired:
+        repair_stats.repaired += 1
+        logger.info("repaired sections=%s", ",".join(repaired))
+    return resume, repaired
+
+
+def prompt_for(standard: str) -> PromptTemplate:
+    """Get the registered prompt for a standard, rejecting unknown standards"""
+    try:
+        return get_prompt(standard)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+
+
+def no_usage() -> dict:
+    """Token counts for a request that made no model call"""
+    return {"prompt_tokens": 0, "completion_tokens": 0}
+
+
+def chunk_roles() -> int:
+    """Experience entries converted per chunk (CONVERT_CHUNK_ROLES)"""
+    return int(os.getenv("CONVERT_CHUNK_ROLES", "3"))
+
+
+def plan_chunks(resume_text: str, standard: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    Split prepared resume text for chunked conversion.
+    
+    Text over CONVERT_CHUNK_THRESHOLD tokens is split into everything but
+    experience (the profile) and groups of CONVERT_CHUNK_ROLES experience
+    entries. Returns None when the text is short or has too few roles to
+    split.
+    """
+    threshold = int(os.getenv("CONVERT_CHUNK_THRESHOLD", "2500"))
+    if threshold <= 0 or count_tokens(resume_text, conversion_model()) < threshold:
+        return None
+    sections = parse_sections(resume_text)
+    groups = group_roles(split_roles(sections.get("experience", "")), chunk_roles())
+    if len(groups) < 2:
+        return None
+    profile = format_sections({name: body for name, body in sections.items() if name != "experience"})
+    return profile, groups
+
+
+async def convert_part(standard: str, part: str, text: str, sections: List[str], usage: dict) -> dict:
+    """Convert one part of a resume with a standard's chunk prompt ("profile" or "experience")"""
+    prompt = get_prompt(f"{standard}:{part}").render(resume_text=text)
+    response_text = await call_openai(prompt, usage, standard=standard)
+    resume, _ = await complete_resume(prompt, response_text, usage, sections, standard)
+    return resume
+
+
+async def gather_parts(*calls):
+    """Run part conversions concurrently, cancelling the rest when one fails"""
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+# Structured sections converted by the "profile" chunk prompts
+PROFILE_FIELDS = [name for name in REQUIRED_FIELDS if name != "experience"]
+
+
+async def convert_chunked(standard: str, profile: str, groups: List[str], usage: dict) -> dict:
+    """
+    Convert the profile and each group of experience entries concurrently
+    with the standard's chunk prompts, and merge them into one resume with
+    experience in reverse-chronological order.
+    """
+    parts = await gather_parts(
+        convert_part(standard, "profile", profile, PROFILE_FIELDS, usage),
+        *[convert_part(standard, "experience", group, ["experience"], usage) for group in groups]
+    )
+    
+    experience = sort_reverse_chronological([
+        entry for part in parts[1:] for entry in part["experience"]
+    ])
+    resume = {name: experience if name == "experience" else parts[0][name] for name in REQUIRED_FIELDS}
+    resume.update({name: value for name, value in parts[0].items() if name not in resume})
+    logger.info("chunked conversion standard=%s chunks=%d roles=%d", standard, len(parts), len(experience))
+    return resume
+
+
+async def convert_text(resume_text: str, standard: str) -> Tuple[dict, str, dict]:
+    """
+    Convert prepared resume text to a standard.
+    
+    Returns the structured resume, the conversion cache status and the tokens
+    spent by this request. Identical conversions already in flight share one
+    model call ("coalesced"). Long resumes are converted in concurrent chunks
+    (see plan_chunks).
+    """
+    template = prompt_for(standard)
+    cache_key = conversion_cache.make_key(resume_text, standard, conversion_model_key(), template.version)
+    cached = conversion_cache.get(cache_key)
+    if cached is not None:
+        return cached, "hit", no_usage()
+    
+    async def convert():
+        usage = no_usage()
+        chunks = plan_chunks(resume_text, standard)
+        if chunks is not None:
+            structured_resume = await convert_chunked(standard, *chunks, usage)
+        else:
+            prompt = template.render(resume_text=resume_text)
+            response_text = await call_openai(prompt, usage, standard=standard)
+            structured_resume, _ = await complete_resume(prompt, response_text, usage, standard=standard)
+        conversion_cache.set(cache_key, structured_resume)
+        return structured_resume, usage
+    
+    (structured_resume, usage), shared = await conversion_flight.do(cache_key, convert)
+    if shared:
+        return structured_resume, "coalesced", no_usage()
+    return structured_resume, "miss" if conversion_cache.enabled else "disabled", usage
+
+
+def log_usage(standard: str, cache_status: str, usage: dict):
+    """Log the token usage and budget report of one conversion"""
+    logger.info(
+        "conversion standard=%s prompt_version=%s cache=%s prompt_tokens=%d completion_tokens=%d "
+        "estimated_prompt_tokens=%d budget=%d trimmed=%s",
+        standard, usage["prompt_version"], cache_status, usage["prompt_tokens"], usage["completion_tokens"],
+        usage["estimated_prompt_tokens"], usage["budget"], ",".join(usage["trimmed"]) or "-"
+    )
+
+
 @router.post("/convert-resume")
 @limiter.limit(RATE_LIMITS["convert"])
 async def convert_resume(request: Request, body: ConvertResumeRequest):
@@ -75,6 +696,7 @@ async def convert_resume(request: Request, body: ConvertResumeRequest):
     - uk_professional: UK Professional format
     
     Returns structured JSON with personal_info, summary, experience, education, and skills.
+    Repeat conversions of the same text are served from the conversion cache.
     """
     try:
         # Validate input
@@ -84,111 +706,316 @@ async def convert_resume(request: Request, body: ConvertResumeRequest):
                 detail="Resume text cannot be empty"
             )
         
-        # Get prompt template for the selected standard
-        try:
-            prompt_template = get_prompt_template(body.standard)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=400,
-                detail=str(e)
-            )
-        
-        # Format prompt with resume text
-        prompt = prompt_template.format(resume_text=body.resume_text.strip())
+        resume_text, budget = prepare_resume_text(body.resume_text, body.standard, body.sections)
+        structured_resume, cache_status, usage = await convert_text(resume_text, body.standard)
+        usage.update(budget)
+        log_usage(body.standard, cache_status, usage)
         
-        # Get OpenAI client
-        client = get_openai_client()
+        return {
+            "success": True,
+            "standard": body.standard,
+            "standard_name": RESUME_STANDARDS.get(body.standard, body.standard),
+            "resume": structured_resume,
+            "cache": cache_status,
+            "usage": usage
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred during resume conversion: {str(e)}"
+        )
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_conversion(resume_text: str, standard: str, budget: dict) -> AsyncIterator[str]:
+    """
+    Convert prepared resume text, yielding SSE events as parts complete.
+    
+    Events:
+    - item: {"section", "index", "value"} for each entry of a list section
+    - section: {"name", "value"} for each top-level section; a section that
+      had to be repaired is sent again with its final value
+    - done: the same payload as /api/convert-resume
+    - error: {"status_code", "detail"}
+    """
+    try:
+        template = prompt_for(standard)
+        cache_key = conversion_cache.make_key(resume_text, standard, conversion_model_key(), template.version)
+        structured_resume = conversion_cache.get(cache_key)
+        cache_status = "hit"
+        usage = no_usage()
         
-        # Call OpenAI API with improved error handling
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert resume conversion assistant. Always return valid JSON only, no markdown, no explanations."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                response_format={"type": "json_object"},
-                timeout=60.0  # 60 second timeout
-            )
-        except RateLimitError:
-            raise HTTPException(
-                status_code=429,
-                detail="OpenAI API rate limit exceeded. Please try again later."
-            )
-        except APITimeoutError:
-            raise HTTPException(
-                status_code=504,
-                detail="Request to OpenAI API timed out. Please try again."
-            )
-        except APIConnectionError:
-            raise HTTPException(
-                status_code=503,
-                detail="Unable to connect to OpenAI API. Please check your connection and try again."
-            )
-        except APIError as e:
-            error_message = str(e)
-            if "insufficient_quota" in error_message.lower():
-                raise HTTPException(
-                    status_code=402,
-                    detail="OpenAI API quota exceeded. Please check your API key billing."
-                )
-            elif "invalid_api_key" in error_message.lower():
-                raise HTTPException(
-                    status_code=401,
-                    detail="Invalid OpenAI API key. Please check your configuration."
-                )
-            else:
+        if structured_resume is None:
+            prompt = template.render(resume_text=resume_text)
+            parser = JSONObjectStream(strict=False)
+            async for chunk in stream_openai(prompt, usage, standard):
+                for event in parser.feed(chunk):
+                    if event[0] == "item":
+                        _, name, index, value = event
+                        yield _sse("item", {"section": name, "index": index, "value": value})
+                    else:
+                        _, name, value = event
+                        yield _sse("section", {"name": name, "value": value})
+            if not parser.text:
                 raise HTTPException(
                     status_code=500,
-                    detail=f"OpenAI API error: {error_message}"
+                    detail="Empty response from OpenAI"
                 )
-        except Exception as e:
+            structured_resume, repaired = await complete_resume(prompt, parser.text, usage, standard=standard)
+            for name in repaired:
+                yield _sse("section", {"name": name, "value": structured_resume[name]})
+            conversion_cache.set(cache_key, structured_resume)
+            cache_status = "miss" if conversion_cache.enabled else "disabled"
+        else:
+            for name, value in structured_resume.items():
+                yield _sse("section", {"name": name, "value": value})
+        
+        usage.update(budget)
+        log_usage(standard, cache_status, usage)
+        yield _sse("done", {
+            "success": True,
+            "standard": standard,
+            "standard_name": RESUME_STANDARDS.get(standard, standard),
+            "resume": structured_resume,
+            "cache": cache_status,
+            "usage": usage
+        })
+    
+    except HTTPException as e:
+        yield _sse("error", {"status_code": e.status_code, "detail": e.detail})
+    except Exception as e:
+        yield _sse("error", {
+            "status_code": 500,
+            "detail": f"An error occurred during resume conversion: {str(e)}"
+        })
+
+
+@router.post("/convert-resume/stream")
+@limiter.limit(RATE_LIMITS["convert"])
+async def convert_resume_stream(request: Request, body: ConvertResumeRequest):
+    """
+    Streaming variant of /api/convert-resume using Server-Sent Events.
+    
+    Each top-level section (and each experience, education or skills entry)
+    is sent as soon as the model finishes writing it, followed by a "done"
+    event carrying the full validated resume.
+    """
+    if not body.resume_text or not body.resume_text.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Resume text cannot be empty"
+        )
+    
+    resume_text, budget = prepare_resume_text(body.resume_text, body.standard, body.sections)
+    return StreamingResponse(
+        stream_conversion(resume_text, body.standard, budget),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _only(sections: Dict[str, str]) -> Optional[str]:
+    """The name of the single section, if there is exactly one"""
+    return next(iter(sections)) if len(sections) == 1 else None
+
+
+async def update_resume(
+    standard: str,
+    previous_resume: dict,
+    previous: Dict[str, str],
+    current: Dict[str, str],
+    usage: dict
+) -> Optional[Tuple[dict, List[str]]]:
+    """
+    Bring a converted resume up to date with edited source sections.
+    
+    Only structured sections fed by changed source sections are converted
+    again, with the standard's chunk prompts; within experience, only roles
+    whose text changed are converted and the others are reused. Returns the
+    resume and the regenerated sections, or None when the edit needs a full
+    conversion (an unmapped section changed, the text has no recognised
+    sections or the previous resume is incomplete).
+    """
+    _, problems = validate_resume(previous_resume)
+    outputs = affected_outputs(changed_sections(previous, current))
+    if problems or outputs is None or PREAMBLE_SECTION in (_only(previous), _only(current)):
+        return None
+    
+    resume = dict(previous_resume)
+    calls = []
+    profile_outputs = [name for name in PROFILE_FIELDS if name in outputs]
+    profile_text = format_sections(source_sections(set(profile_outputs), current))
+    if profile_outputs and profile_text:
+        calls.append(convert_part(standard, "profile", profile_text, profile_outputs, usage))
+    else:
+        resume.update({name: EMPTY_SECTIONS[name] for name in profile_outputs})
+    
+    kept_entries = []
+    if "experience" in outputs:
+        roles = split_roles(current.get("experience", ""))
+        reusable = match_roles(split_roles(previous.get("experience", "")), previous_resume["experience"])
+        kept_entries = [reusable[compact_text(role)] for role in roles if compact_text(role) in reusable]
+        edited_roles = [role for role in roles if compact_text(role) not in reusable]
+        calls.extend(
+            convert_part(standard, "experience", group, ["experience"], usage)
+            for group in group_roles(edited_roles, chunk_roles())
+        )
+        logger.info("incremental conversion standard=%s roles_reused=%d roles_converted=%d",
+                    standard, len(kept_entries), len(edited_roles))
+    
+    parts = list(await gather_parts(*calls))
+    if profile_outputs and profile_text:
+        profile = parts.pop(0)
+        resume.update({name: profile[name] for name in profile_outputs})
+    if "experience" in outputs:
+        resume["experience"] = sort_reverse_chronological(
+            kept_entries + [entry for part in parts for entry in part["experience"]]
+        )
+    return resume, [name for name in REQUIRED_FIELDS if name in outputs]
+
+
+@router.post("/convert-resume/incremental")
+@limiter.limit(RATE_LIMITS["convert"])
+async def convert_resume_incremental(request: Request, body: ConvertIncrementalRequest):
+    """
+    Refresh a converted resume after the user edits its text.
+    
+    Takes the previous structured resume with the text it was made from and
+    the edited text, and re-converts only the sections (and experience
+    roles) that changed; the rest is reused verbatim. Edits to sections with
+    no direct counterpart, such as projects or awards, fall back to a full
+    conversion. "regenerated" and "reused" list the structured sections.
+    """
+    try:
+        if not body.resume_text or not body.resume_text.strip():
             raise HTTPException(
-                status_code=500,
-                detail=f"Unexpected error calling OpenAI API: {str(e)}"
+                status_code=400,
+                detail="Resume text cannot be empty"
             )
         
-        # Extract response content
-        response_text = response.choices[0].message.content
+        usage = no_usage()
+        updated = await update_resume(
+            body.standard,
+            body.previous_resume,
+            resume_sections(body.previous_text, body.previous_sections),
+            resume_sections(body.resume_text, body.sections),
+            usage
+        )
+        if updated is not None:
+            structured_resume, regenerated = updated
+            mode = "incremental"
+        else:
+            resume_text, budget = prepare_resume_text(body.resume_text, body.standard, body.sections)
+            structured_resume, cache_status, usage = await convert_text(resume_text, body.standard)
+            usage.update(budget)
+            log_usage(body.standard, cache_status, usage)
+            regenerated = list(REQUIRED_FIELDS)
+            mode = "full"
         
-        if not response_text:
+        return {
+            "success": True,
+            "standard": body.standard,
+            "standard_name": RESUME_STANDARDS.get(body.standard, body.standard),
+            "resume": structured_resume,
+            "mode": mode,
+            "regenerated": regenerated,
+            "reused": [name for name in REQUIRED_FIELDS if name not in regenerated],
+            "usage": usage
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred during resume conversion: {str(e)}"
+        )
+
+
+async def rewrite_summaries(canonical: dict, standards: List[str], usage: dict) -> Dict[str, str]:
+    """Rewrite the canonical summary in each standard's style with a single model call"""
+    facts = json.dumps({
+        "summary": canonical.get("summary") or "",
+        "recent_roles": [
+            f"{entry.get('title', '')} at {entry.get('company', '')}"
+            for entry in (canonical.get("experience") or [])[:3]
+        ],
+    })
+    style_key = "summaries:" + ",".join(sorted(standards))
+    template = get_prompt("summary_style")
+    cache_key = conversion_cache.make_key(facts, style_key, conversion_model_key(), template.version)
+    summaries = conversion_cache.get(cache_key)
+    if summaries is None:
+        prompt = template.render(standards=", ".join(standards), resume_facts=facts)
+        response = parse_json_response(await call_openai(prompt, usage))
+        summaries = {
+            standard: summary.strip()
+            for standard, summary in (response.get("summaries") or {}).items()
+            if standard in standards and isinstance(summary, str) and summary.strip()
+        }
+        conversion_cache.set(cache_key, summaries)
+    return summaries
+
+
+@router.post("/convert-resume/multi")
+@limiter.limit(RATE_LIMITS["convert"])
+async def convert_resume_multi(request: Request, body: ConvertMultiRequest):
+    """
+    Convert resume text to several standards at once.
+    
+    Makes one model call for a standard-neutral extraction, shapes it into each
+    standard deterministically, and optionally rewrites the summaries for all
+    standards in one follow-up call.
+    """
+    try:
+        if not body.resume_text or not body.resume_text.strip():
             raise HTTPException(
-                status_code=500,
-                detail="Empty response from OpenAI"
+                status_code=400,
+                detail="Resume text cannot be empty"
             )
-        
-        # Parse JSON response
-        try:
-            structured_resume = parse_json_response(response_text)
-        except HTTPException:
-            raise
-        except Exception as e:
+        standards = list(dict.fromkeys(body.standards))
+        if not standards:
             raise HTTPException(
-                status_code=500,
-                detail=f"Failed to parse AI response: {str(e)}"
+                status_code=400,
+                detail="At least one standard must be requested"
             )
         
-        # Validate response structure
-        required_fields = ["personal_info", "summary", "experience", "education", "skills"]
-        for field in required_fields:
-            if field not in structured_resume:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"AI response missing required field: {field}"
-                )
+        resume_text, budget = prepare_resume_text(body.resume_text, CANONICAL_STANDARD, body.sections)
+        canonical, cache_status, usage = await convert_text(resume_text, CANONICAL_STANDARD)
+        
+        warnings = []
+        summaries = {}
+        if body.rewrite_summaries:
+            try:
+                summaries = await rewrite_summaries(canonical, standards, usage)
+            except HTTPException as e:
+                warnings.append(f"Summaries were not restyled: {e.detail}")
+        
+        resumes = {}
+        for standard in standards:
+            resume = to_standard(canonical, standard)
+            if standard in summaries:
+                resume["summary"] = summaries[standard]
+            resumes[standard] = {
+                "standard_name": RESUME_STANDARDS.get(standard, standard),
+                "resume": resume
+            }
+        usage.update(budget)
+        log_usage(CANONICAL_STANDARD, cache_status, usage)
         
         return {
             "success": True,
-            "standard": body.standard,
-            "standard_name": RESUME_STANDARDS.get(body.standard, body.standard),
-            "resume": structured_resume
+            "resumes": resumes,
+            "cache": cache_status,
+            "usage": usage,
+            "warnings": warnings
         }
     
     except HTTPException:
@@ -0,0 +1,168 @@
+"""
+Batch conversion jobs router - queue many conversions and collect results
+"""
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+import asyncio
+import json
+import os
+from routers.convert import StandardName, prepare_resume_text, convert_text
+from services.jobs import job_queue, JobBackend, StubJobBackend
+from middleware.rate_limit import limiter, RATE_LIMITS
+
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+# Seconds between result polls while streaming a job
+STREAM_POLL_INTERVAL = 0.5
+
+
+class ConversionJobBackend(JobBackend):
+    """Converts items through the same pipeline as /api/convert-resume"""
+
+    name = "openai"
+
+    async def convert(self, resume_text: str, standard: str, sections: Optional[Dict[str, str]]) -> dict:
+        text, budget = prepare_resume_text(resume_text, standard, sections)
+        resume, cache_status, usage = await convert_text(text, standard)
+        usage.update(budget)
+        return {"resume": resume, "cache": cache_status, "usage": usage}
+
+
+# Available job backends (JOB_BACKEND)
+JOB_BACKENDS = {
+    "openai": ConversionJobBackend,
+    "stub": StubJobBackend,
+}
+
+
+async def startup_job_queue():
+    """Start the job queue with the configured backend"""
+    name = os.getenv("JOB_BACKEND", "openai")
+    if name not in JOB_BACKENDS:
+        raise ValueError(f"Unknown JOB_BACKEND: {name}. Available: {', '.join(JOB_BACKENDS)}")
+    await job_queue.start(JOB_BACKENDS[name]())
+
+
+async def shutdown_job_queue():
+    await job_queue.shutdown()
+
+
+class JobItem(BaseModel):
+    resume_text: str = Field(..., description="The extracted resume text to convert")
+    standard: StandardName = Field(..., description="Resume standard to convert to")
+    sections: Optional[Dict[str, str]] = Field(
+        None, description="Sections returned by /api/parse-resume; derived from resume_text when omitted"
+    )
+
+
+class CreateJobRequest(BaseModel):
+    items: List[JobItem] = Field(..., description="Conversions to run")
+
+
+def _require_queue():
+    if not job_queue.started:
+        raise HTTPException(
+            status_code=503,
+            detail="Job queue is not running"
+        )
+
+
+def _require_job(job_id: str) -> dict:
+    _require_queue()
+    job = job_queue.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.post("/convert-jobs", status_code=202)
+@limiter.limit(RATE_LIMITS["jobs"])
+async def create_conversion_job(request: Request, body: CreateJobRequest):
+    """
+    Queue a batch of conversions.
+
+    Items are persisted and converted by a pool of background workers
+    (JOB_WORKERS). Poll GET /api/convert-jobs/{job_id} for progress and
+    /results for finished items, or stream them from /stream.
+    """
+    _require_queue()
+    if not body.items:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one item is required"
+        )
+    if len(body.items) > job_queue.max_items:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many items ({len(body.items)}). Maximum per job is {job_queue.max_items}."
+        )
+    for index, item in enumerate(body.items):
+        if not item.resume_text.strip():
+            raise HTTPException(
+                status_code=400,
+                detail=f"Resume text cannot be empty (item {index})"
+            )
+
+    job_id = job_queue.create_job([item.model_dump() for item in body.items])
+    return job_queue.get_job(job_id)
+
+
+@router.get("/convert-jobs/{job_id}")
+async def get_conversion_job(job_id: str):
+    """Progress of a job: item counts per state"""
+    return _require_job(job_id)
+
+
+@router.get("/convert-jobs/{job_id}/results")
+async def get_conversion_job_results(job_id: str, after: int = 0, limit: int = 100):
+    """
+    Finished items in completion order.
+
+    Pass the last item's cursor as ``after`` to fetch the next page.
+    """
+    job = _require_job(job_id)
+    items = job_queue.get_results(job_id, after=after, limit=min(max(limit, 1), 1000))
+    return {
+        "job": job,
+        "items": items,
+        "next": items[-1]["cursor"] if items else after,
+    }
+
+
+@router.get("/convert-jobs/{job_id}/stream")
+async def stream_conversion_job(job_id: str, after: int = 0):
+    """
+    Stream finished items as NDJSON until the job completes, followed by the
+    final job summary.
+    """
+    _require_job(job_id)
+
+    async def stream():
+        cursor = after
+        while True:
+            job = job_queue.get_job(job_id)
+            items = job_queue.get_results(job_id, after=cursor, limit=1000)
+            for item in items:
+                yield json.dumps(item) + "\n"
+            if items:
+                cursor = items[-1]["cursor"]
+                continue
+            if job is None or job["status"] == "completed":
+                yield json.dumps({"done": True, **(job or {})}) + "\n"
+                return
+            await asyncio.sleep(STREAM_POLL_INTERVAL)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.delete("/convert-jobs/{job_id}")
+async def cancel_conversion_job(job_id: str):
+    """Cancel the job's queued items; items already running finish"""
+    _require_job(job_id)
+    cancelled = job_queue.cancel_job(job_id)
+    return {"cancelled": cancelled, "job": job_queue.get_job(job_id)}
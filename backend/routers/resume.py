@@ -3,45 +3,324 @@ Resume parsing router
 """
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import JSONResponse
-import pdfplumber
-import docx
-from io import BytesIO
-from typing import Optional
+import asyncio
+import os
+import re
+import string
+import time
+from typing import Optional, Tuple
+from services.extraction import extraction_engine, ExtractionError, EngineOverloadedError
+from services.uploads import spool_upload, SpooledUpload, UploadTooLargeError
+from services.cache import parse_cache
+from services.filetype import sniff_file_type
+from services.parsers import (
+    PDF_ENGINES, DOCX_PARSERS, PdfiumEngine, PdfplumberEngine, parse_pdf_pages
+)
+from services.sections import segment_resume
 
 router = APIRouter(prefix="/api", tags=["resume"])
 
 # Maximum file size: 2MB
 MAX_FILE_SIZE = 2 * 1024 * 1024
 
+# Bump whenever extraction output changes so cached results are invalidated
+PARSER_VERSION = "5"
 
-def parse_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file"""
+
+_GARBLED_MARKERS = re.compile(r"\(cid:\d+\)|\ufffd|[\ue000-\uf8ff]")
+_READABLE_PUNCTUATION = set(string.punctuation) | set("•·–—‘’“”●▪◦…|")
+
+
+def looks_garbled(text: str) -> bool:
+    """
+    Heuristic check of a fast-engine text layer.
+    
+    Flags missing text, unmapped glyphs, a low share of readable characters or
+    runs of words without spaces, any of which pdfplumber usually recovers.
+    """
+    stripped = text.strip()
+    if not stripped:
+        return True
+    if len(_GARBLED_MARKERS.findall(stripped)) * 50 > len(stripped):
+        return True
+    readable = sum(
+        1 for ch in stripped
+        if ch.isalnum() or ch.isspace() or ch in _READABLE_PUNCTUATION
+    )
+    if readable < 0.9 * len(stripped):
+        return True
+    return len(stripped) > 200 and stripped.count(" ") < 0.05 * len(stripped)
+
+
+async def run_parser(parser, *args, timeout: Optional[float] = None):
+    """
+    Run a parser on the extraction engine, mapping worker errors to HTTP
+    errors. asyncio.TimeoutError is raised when ``timeout`` seconds pass first.
+    """
     try:
-        with pdfplumber.open(BytesIO(file_content)) as pdf:
-            text_parts = []
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-            return "\n\n".join(text_parts)
-    except Exception as e:
+        return await extraction_engine.run(parser, *args, timeout=timeout)
+    except ExtractionError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except EngineOverloadedError:
         raise HTTPException(
-            status_code=400,
-            detail=f"Failed to parse PDF: {str(e)}"
+            status_code=503,
+            detail="The parser is busy. Please try again shortly."
         )
 
 
-def parse_docx(file_content: bytes) -> str:
-    """Extract text from DOCX file"""
+def _pdf_budgets() -> Tuple[int, float, float]:
+    """Page cap, per-page and per-document time budgets (seconds) for PDF extraction"""
+    return (
+        int(os.getenv("PDF_MAX_PAGES", "10")),
+        float(os.getenv("PDF_PAGE_TIMEOUT", "5")),
+        float(os.getenv("PDF_DOCUMENT_TIMEOUT", "15")),
+    )
+
+
+def _pdf_engine_choice() -> str:
+    """PDF_ENGINE: auto (fast engine with pdfplumber fallback), pdfium or pdfplumber"""
+    choice = os.getenv("PDF_ENGINE", "auto").lower()
+    if choice not in ("auto", "pdfium", "pdfplumber"):
+        choice = "auto"
+    if choice != "pdfplumber" and PdfiumEngine.name not in PDF_ENGINES:
+        choice = "pdfplumber"
+    return choice
+
+
+def _docx_engine() -> str:
+    """DOCX_ENGINE, falling back to the streaming extractor"""
+    engine = os.getenv("DOCX_ENGINE", "docx-stream").lower()
+    return engine if engine in DOCX_PARSERS else "docx-stream"
+
+
+def _engine_settings(file_type: str) -> str:
+    """Extraction settings that change the text of a file type, for cache keys"""
+    if file_type == "pdf":
+        max_pages, _, _ = _pdf_budgets()
+        return f"{_pdf_engine_choice()}-p{max_pages}"
+    return _docx_engine()
+
+
+async def extract_pdf(path: str) -> dict:
+    """
+    Extract PDF text with the configured engine.
+    
+    In auto mode the fast PDFium text layer is tried first and pdfplumber is
+    used only when that output looks garbled.
+    """
+    choice = _pdf_engine_choice()
+    if choice != "pdfplumber":
+        started = time.perf_counter()
+        try:
+            result = await _extract_pdf_fast(path)
+        except HTTPException as e:
+            if choice == "pdfium" or e.status_code != 400:
+                raise
+        else:
+            if choice == "pdfium" or not looks_garbled(result["text"]):
+                extraction_engine.record_document(
+                    PdfiumEngine.name, len(result["pages"]), time.perf_counter() - started
+                )
+                del result["pages"]
+                return result
+        extraction_engine.record_fallback()
+    
+    started = time.perf_counter()
+    result = await _extract_pdf_paged(path)
+    extraction_engine.record_document(
+        PdfplumberEngine.name, len(result["pages"]), time.perf_counter() - started
+    )
+    del result["pages"]
+    return result
+
+
+async def _extract_pdf_fast(path: str) -> dict:
+    """Read all pages (up to PDF_MAX_PAGES) with PDFium in a single job"""
+    max_pages, _, document_timeout = _pdf_budgets()
     try:
-        doc = docx.Document(BytesIO(file_content))
-        paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
-        return "\n".join(paragraphs)
-    except Exception as e:
+        page_count, page_texts = await run_parser(
+            parse_pdf_pages, path, list(range(max_pages)), PdfiumEngine.name, timeout=document_timeout
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="Timed out while parsing the PDF"
+        )
+    
+    warnings = []
+    if page_count > max_pages:
+        warnings.append(f"Only the first {max_pages} of {page_count} pages were parsed")
+    
+    return {
+        "text": "\n\n".join(text for text in page_texts if text),
+        "pages": page_texts,
+        "warnings": warnings,
+        "page_count": page_count,
+        "engine": PdfiumEngine.name,
+        "complete": True,
+    }
+
+
+async def _extract_pdf_paged(path: str) -> dict:
+    """
+    Extract PDF text with pdfplumber, fanning pages out across the workers.
+    
+    The first page is read together with the page count, then the remaining
+    pages (up to PDF_MAX_PAGES) are extracted concurrently and stitched back in
+    order. Pages that exceed PDF_PAGE_TIMEOUT or are unfinished when
+    PDF_DOCUMENT_TIMEOUT runs out are skipped with a warning, and their jobs
+    are stopped. When the parser is too busy to take a page the whole
+    document fails with 503, which the caller can retry, rather than coming
+    back partial.
+    """
+    max_pages, page_timeout, document_timeout = _pdf_budgets()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + document_timeout
+    
+    try:
+        page_count, head = await run_parser(
+            parse_pdf_pages, path, [0], PdfplumberEngine.name, timeout=min(page_timeout, document_timeout)
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="Timed out while parsing the PDF"
+        )
+    
+    pages_to_read = min(page_count, max_pages)
+    page_texts = head + [""] * max(0, pages_to_read - 1)
+    page_warnings = {}
+    incomplete = set()
+    
+    async def read_page(index: int):
+        budget = min(page_timeout, deadline - loop.time())
+        try:
+            _, texts = await run_parser(
+                parse_pdf_pages, path, [index], PdfplumberEngine.name, timeout=max(0.0, budget)
+            )
+        except asyncio.TimeoutError:
+            limit = "page" if budget >= page_timeout else "document"
+            page_warnings[index] = f"Page {index + 1} skipped: {limit} time budget exceeded"
+            incomplete.add(index)
+            return
+        except HTTPException as e:
+            if e.status_code == 503:
+                raise
+            page_warnings[index] = f"Page {index + 1} skipped: {e.detail}"
+            if e.status_code >= 500:
+                incomplete.add(index)
+            return
+        page_texts[index] = texts[0] if texts else ""
+    
+    tasks = [asyncio.ensure_future(read_page(i)) for i in range(1, pages_to_read)]
+    if tasks:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        errors = [task.exception() for task in done if task.exception() is not None]
+        if errors:
+            raise errors[0]
+    complete = not incomplete
+    
+    warnings = [page_warnings[i] for i in sorted(page_warnings)]
+    if page_count > max_pages:
+        warnings.append(f"Only the first {max_pages} of {page_count} pages were parsed")
+    
+    return {
+        "text": "\n\n".join(text for text in page_texts if text),
+        "pages": page_texts,
+        "warnings": warnings,
+        "page_count": page_count,
+        "engine": PdfplumberEngine.name,
+        "complete": complete,
+    }
+
+
+async def extract_docx(path: str) -> dict:
+    """
+    Extract DOCX text on the extraction engine.
+    
+    DOCX_ENGINE selects the streaming XML extractor (default), which also reads
+    tables, text boxes, headers and footers, or python-docx body paragraphs.
+    """
+    engine = _docx_engine()
+    started = time.perf_counter()
+    text = await run_parser(DOCX_PARSERS[engine], path)
+    extraction_engine.record_document(engine, 1, time.perf_counter() - started)
+    return {
+        "text": text,
+        "warnings": [],
+        "page_count": None,
+        "engine": engine,
+        "complete": True,
+    }
+
+
+async def parse_upload(upload: SpooledUpload, filename: Optional[str]) -> dict:
+    """
+    Sniff, extract (or fetch from cache) and validate one spooled upload.
+    
+    Raises HTTPException for uploads that cannot be parsed.
+    """
+    if upload.size == 0:
         raise HTTPException(
             status_code=400,
-            detail=f"Failed to parse DOCX: {str(e)}"
+            detail="Uploaded file is empty"
         )
+    
+    # Validate file type from the content before any heavy parser runs
+    file_extension = filename.split('.')[-1].lower() if filename else ""
+    file_type = sniff_file_type(upload.path)
+    
+    if file_extension == "doc" or file_type == "doc":
+        raise HTTPException(
+            status_code=400,
+            detail="DOC format is not supported. Please convert to DOCX or PDF."
+        )
+    if file_type == "pdf":
+        extractor = extract_pdf
+    elif file_type == "docx":
+        extractor = extract_docx
+    elif file_extension in ["pdf", "docx"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. The file content is not a valid {file_extension.upper()}."
+        )
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Supported formats: PDF, DOCX"
+        )
+    
+    # Identical uploads are served from the content-addressed cache
+    cache_key = parse_cache.make_key(upload.sha256, PARSER_VERSION, file_type, _engine_settings(file_type))
+    result = parse_cache.get(cache_key)
+    cached = result is not None
+    if not cached:
+        # Workers read the spooled file directly
+        result = await extractor(upload.path)
+        # Partial results depend on load, so only complete ones are cached
+        if result["complete"] and result["text"].strip():
+            parse_cache.set(cache_key, result)
+    
+    if not result["text"].strip():
+        raise HTTPException(
+            status_code=400,
+            detail="No text could be extracted from the file. The file may be empty or corrupted."
+        )
+    
+    return {
+        "text": result["text"].strip(),
+        "sections": segment_resume(result["text"]),
+        "file_name": filename,
+        "file_type": file_type,
+        "file_size": upload.size,
+        "page_count": result["page_count"],
+        "warnings": result["warnings"],
+        "engine": result["engine"],
+        "cached": cached
+    }
 
 
 @router.post("/parse-resume")
@@ -57,7 +336,8 @@ async def parse_resume(
     - DOCX files (.docx)
     - Plain text input
     
-    Returns extracted text.
+    Returns extracted text and its sections (contact, summary, experience,
+    education, skills, ...).
     """
     try:
         # Validate input: either file or text must be provided
@@ -77,6 +357,7 @@ async def parse_resume(
             return {
                 "success": True,
                 "text": text.strip(),
+                "sections": segment_resume(text),
                 "source": "text_input",
                 "file_name": None,
                 "file_type": None
@@ -84,57 +365,23 @@ async def parse_resume(
         
         # Handle file upload
         if file:
-            # Validate file size
-            file_content = await file.read()
-            file_size = len(file_content)
-            
-            if file_size > MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"File size ({file_size / 1024 / 1024:.2f}MB) exceeds maximum allowed size (2MB)"
-                )
-            
-            if file_size == 0:
+            # Stream the upload to a temp file, aborting as soon as it exceeds the cap
+            try:
+                upload = await spool_upload(file, MAX_FILE_SIZE)
+            except UploadTooLargeError as e:
+                size = f" ({e.size / 1024 / 1024:.2f}MB)" if e.size else ""
                 raise HTTPException(
                     status_code=400,
-                    detail="Uploaded file is empty"
+                    detail=f"File size{size} exceeds maximum allowed size (2MB)"
                 )
             
-            # Validate file type
-            file_extension = file.filename.split('.')[-1].lower() if file.filename else ""
-            content_type = file.content_type or ""
-            
-            extracted_text = None
-            
-            # Parse based on file type
-            if file_extension == "pdf" or "pdf" in content_type:
-                extracted_text = parse_pdf(file_content)
-            elif file_extension in ["docx", "doc"] or "wordprocessingml" in content_type or "msword" in content_type:
-                if file_extension == "doc":
-                    raise HTTPException(
-                        status_code=400,
-                        detail="DOC format is not supported. Please convert to DOCX or PDF."
-                    )
-                extracted_text = parse_docx(file_content)
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Unsupported file type. Supported formats: PDF, DOCX"
-                )
-            
-            if not extracted_text or not extracted_text.strip():
-                raise HTTPException(
-                    status_code=400,
-                    detail="No text could be extracted from the file. The file may be empty or corrupted."
-                )
+            with upload:
+                result = await parse_upload(upload, file.filename)
             
             return {
                 "success": True,
-                "text": extracted_text.strip(),
                 "source": "file_upload",
-                "file_name": file.filename,
-                "file_type": file_extension,
-                "file_size": file_size
+                **result
             }
     
     except HTTPException:
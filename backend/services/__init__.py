@@ -0,0 +1,3 @@
+"""
+Services package for Resumate backend
+"""
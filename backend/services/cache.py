@@ -0,0 +1,310 @@
+"""
+Result caches for resume parsing and conversion
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class LRUCache:
+    """
+    In-memory LRU cache bounded by the total size of its values.
+
+    Entries optionally expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, size, expires_at = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, size: int):
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._entries[key] = (value, size, expires_at)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+class ParseResultCache:
+    """
+    Content-addressed cache of parse results.
+
+    Keys combine the SHA-256 of the uploaded bytes with the parser version
+    and the engine settings that shape the text, so bumping the version or
+    switching engines invalidates old entries. Results live in a memory LRU
+    and, when ``PARSE_CACHE_DIR`` is set, in JSON files on disk, capped at
+    PARSE_CACHE_DISK_MAX_MB with the least recently used files removed first.
+    """
+
+    def __init__(self):
+        self.configure()
+
+    def configure(self):
+        """(Re)read settings from the environment and empty the memory tier"""
+        max_mb = float(os.getenv("PARSE_CACHE_MAX_MB", "64"))
+        self.enabled = max_mb > 0
+        self.memory = LRUCache(max_bytes=int(max_mb * 1024 * 1024))
+        self.disk_dir = os.getenv("PARSE_CACHE_DIR") or None
+        self.disk_max_bytes = int(float(os.getenv("PARSE_CACHE_DISK_MAX_MB", "256")) * 1024 * 1024)
+        self._disk_bytes = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+
+    @staticmethod
+    def make_key(content_hash: str, parser_version: str, file_type: str, engine: str = "") -> str:
+        key = f"{content_hash}-{file_type}-v{parser_version}"
+        return f"{key}-{engine}" if engine else key
+
+    def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        result = self.memory.get(key)
+        if result is not None:
+            self.memory_hits += 1
+            return result
+        result = self._read_disk(key)
+        if result is not None:
+            self.disk_hits += 1
+            self.memory.set(key, result, _size_of(result))
+            return result
+        self.misses += 1
+        return None
+
+    def set(self, key: str, result: dict):
+        if not self.enabled:
+            return
+        self.memory.set(key, result, _size_of(result))
+        self._write_disk(key, result)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[dict]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            # Mark as recently used for pruning
+            os.utime(path)
+            return result
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, result: dict):
+        if not self.disk_dir:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            path = self._disk_path(key)
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._disk_bytes += os.path.getsize(path) - replaced
+        except OSError:
+            return
+        if self._disk_bytes > self.disk_max_bytes:
+            self._prune_disk()
+
+    def _disk_entries(self) -> list:
+        """(last used, path, size) of each cached file"""
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def _prune_disk(self):
+        """Remove least recently used files until the tier is back under 90% of its cap"""
+        entries = sorted(self._disk_entries())
+        self._disk_bytes = sum(size for _, _, size in entries)
+        target = self.disk_max_bytes * 0.9
+        for _, path, size in entries:
+            if self._disk_bytes <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            self._disk_bytes -= size
+            self.disk_evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.memory),
+            "bytes": self.memory.size_bytes,
+            "evictions": self.memory.evictions,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else None,
+            "disk_tier": self.disk_dir is not None,
+            "disk_bytes": self._disk_bytes,
+            "disk_evictions": self.disk_evictions,
+        }
+
+
+class ConversionCache:
+    """
+    Cache of structured resumes produced by the model.
+
+    Keys hash the whitespace-normalised resume text with the standard, model
+    and prompt version. Entries live in a memory LRU with a TTL and, when
+    ``CONVERT_CACHE_DB`` is set, in a SQLite table that survives restarts.
+    """
+
+    def __init__(self):
+        self._db: Optional[sqlite3.Connection] = None
+        self.configure()
+
+    def configure(self):
+        """(Re)read settings from the environment and empty the memory tier"""
+        max_mb = float(os.getenv("CONVERT_CACHE_MAX_MB", "32"))
+        self.ttl = float(os.getenv("CONVERT_CACHE_TTL", "86400"))
+        self.enabled = max_mb > 0
+        self.memory = LRUCache(max_bytes=int(max_mb * 1024 * 1024), ttl=self.ttl or None)
+        self.close()
+        db_path = os.getenv("CONVERT_CACHE_DB") or None
+        if db_path and self.enabled:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS conversions "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    @staticmethod
+    def make_key(resume_text: str, standard: str, model: str, prompt_version: str) -> str:
+        normalized = normalize_text(resume_text)
+        payload = "\x1f".join([standard, model, prompt_version, normalized])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        result = self.memory.get(key)
+        if result is not None:
+            self.memory_hits += 1
+            return result
+        result = self._read_db(key)
+        if result is not None:
+            self.disk_hits += 1
+            self.memory.set(key, result, _size_of(result))
+            return result
+        self.misses += 1
+        return None
+
+    def set(self, key: str, result: dict):
+        if not self.enabled:
+            return
+        self.memory.set(key, result, _size_of(result))
+        if self._db is not None:
+            expires_at = time.time() + self.ttl if self.ttl else None
+            self._db.execute(
+                "INSERT OR REPLACE INTO conversions (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result), expires_at),
+            )
+
+    def _read_db(self, key: str) -> Optional[dict]:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT value, expires_at FROM conversions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            self._db.execute("DELETE FROM conversions WHERE key = ?", (key,))
+            return None
+        return json.loads(value)
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.memory),
+            "bytes": self.memory.size_bytes,
+            "evictions": self.memory.evictions,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else None,
+            "disk_tier": self._db is not None,
+        }
+
+
+def normalize_text(text: str) -> str:
+    """Collapse all whitespace runs so formatting-only edits share a cache key"""
+    return " ".join(text.split())
+
+
+def _size_of(value: Any) -> int:
+    """Approximate memory footprint of a JSON-serialisable value"""
+    return len(json.dumps(value))
+
+
+# Shared caches, reconfigured by the application lifespan
+parse_cache = ParseResultCache()
+conversion_cache = ConversionCache()
@@ -0,0 +1,80 @@
+"""
+Splitting long resumes into parts that are converted concurrently
+"""
+import re
+from typing import Any, Dict, List, Tuple
+
+_LIST_MARKER = re.compile(r"^\s*([-*•▪◦●]|\d+[.)])\s")
+
+# Words used for an ongoing role's end date
+_CURRENT = re.compile(r"\b(present|current|now|ongoing|till date|to date)\b", re.IGNORECASE)
+_YEAR = re.compile(r"\b(19|20)\d{2}\b")
+# MM/YYYY or DD/MM/YYYY: the month is the number before the year
+_MONTH_NUMBER = re.compile(r"\b(?:\d{1,2}[/.-])?(\d{1,2})[/.-]((?:19|20)\d{2})\b")
+_MONTH_NAME = re.compile(r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+((?:19|20)\d{2})\b", re.IGNORECASE)
+_MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+
+
+def split_roles(experience: str) -> List[str]:
+    """
+    Split an experience section into one block per role.
+
+    A role starts at a line that is not a bullet and follows a bullet, so
+    header lines (title, company, dates) stay with the bullets below them.
+    Text without bullets is returned as a single block.
+    """
+    roles: List[List[str]] = []
+    previous_bullet = False
+    for line in experience.split("\n"):
+        if not line.strip():
+            continue
+        bullet = bool(_LIST_MARKER.match(line))
+        if not roles or (previous_bullet and not bullet):
+            roles.append([])
+        roles[-1].append(line)
+        previous_bullet = bullet
+    return ["\n".join(lines) for lines in roles]
+
+
+def group_roles(roles: List[str], per_chunk: int) -> List[str]:
+    """Consecutive roles in groups of ``per_chunk``"""
+    per_chunk = max(1, per_chunk)
+    return [
+        "\n".join(roles[i:i + per_chunk])
+        for i in range(0, len(roles), per_chunk)
+    ]
+
+
+def date_key(value: Any) -> Tuple[int, int]:
+    """
+    Sortable (year, month) for a resume date such as "03/2021", "15/03/2021",
+    "Mar 2021", "2021" or "Present"; (0, 0) when no date can be read.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return (0, 0)
+    if _CURRENT.search(value):
+        return (9999, 12)
+    match = _MONTH_NUMBER.search(value)
+    if match and 1 <= int(match.group(1)) <= 12:
+        return (int(match.group(2)), int(match.group(1)))
+    match = _MONTH_NAME.search(value)
+    if match:
+        return (int(match.group(2)), _MONTHS.index(match.group(1).lower()[:3]) + 1)
+    match = _YEAR.search(value)
+    if match:
+        return (int(match.group(0)), 0)
+    return (0, 0)
+
+
+def sort_reverse_chronological(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Order experience entries newest first by end date, then start date.
+
+    The sort is stable, so entries with equal or unreadable dates keep their
+    order; entries without any readable date go last.
+    """
+    return sorted(
+        entries,
+        key=lambda entry: (date_key(entry.get("end_date")), date_key(entry.get("start_date"))),
+        reverse=True,
+    )
@@ -0,0 +1,97 @@
+"""
+Streaming DOCX text extraction straight from the OOXML parts
+"""
+import re
+import zipfile
+from typing import IO, Iterator, List, Union
+from xml.etree.ElementTree import iterparse
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_NS = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+W_P = W_NS + "p"
+W_T = W_NS + "t"
+W_TAB = W_NS + "tab"
+W_BREAKS = (W_NS + "br", W_NS + "cr")
+W_CELL = W_NS + "tc"
+# Paragraph properties; their w:tabs/w:tab elements define tab stops, not tabs
+W_PPR = W_NS + "pPr"
+MC_FALLBACK = MC_NS + "Fallback"
+
+# Refuse parts that inflate beyond this size (zip bombs)
+MAX_PART_SIZE = 50 * 1024 * 1024
+
+_HEADER_PART = re.compile(r"^word/header\d*\.xml$")
+_FOOTER_PART = re.compile(r"^word/footer\d*\.xml$")
+
+
+def extract_docx_text(source: Union[str, IO[bytes]]) -> str:
+    """
+    Extract paragraph text from a DOCX without building a document tree.
+
+    Reads headers, the main body (including tables and text boxes) and footers
+    with an incremental XML parser, so memory stays bounded by the largest
+    paragraph rather than the whole document.
+    """
+    with zipfile.ZipFile(source) as archive:
+        names = archive.namelist()
+        headers = sorted(name for name in names if _HEADER_PART.match(name))
+        footers = sorted(name for name in names if _FOOTER_PART.match(name))
+
+        lines: List[str] = []
+        seen_furniture = set()
+        for part in headers + ["word/document.xml"] + footers:
+            furniture = part != "word/document.xml"
+            for line in _iter_part_paragraphs(archive, part):
+                # First-page and default headers often repeat the same text
+                if furniture:
+                    if line in seen_furniture:
+                        continue
+                    seen_furniture.add(line)
+                lines.append(line)
+    return "\n".join(lines)
+
+
+def _iter_part_paragraphs(archive: zipfile.ZipFile, part: str) -> Iterator[str]:
+    """Yield non-empty paragraph texts of one XML part in document order"""
+    info = archive.getinfo(part)
+    if info.file_size > MAX_PART_SIZE:
+        raise ValueError(f"{part} is too large to extract")
+
+    paragraphs: List[List[str]] = []
+    fallback_depth = 0
+    properties_depth = 0
+    with archive.open(info) as stream:
+        for event, elem in iterparse(stream, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == MC_FALLBACK:
+                    # Alternate content repeats the text box of its Choice branch
+                    fallback_depth += 1
+                elif tag == W_PPR:
+                    properties_depth += 1
+                elif tag == W_P and not fallback_depth:
+                    paragraphs.append([])
+                continue
+
+            if tag == MC_FALLBACK:
+                fallback_depth -= 1
+                elem.clear()
+            elif tag == W_PPR:
+                properties_depth -= 1
+            elif fallback_depth or properties_depth or not paragraphs:
+                continue
+            elif tag == W_T:
+                if elem.text:
+                    paragraphs[-1].append(elem.text)
+            elif tag == W_TAB:
+                paragraphs[-1].append("\t")
+            elif tag in W_BREAKS:
+                paragraphs[-1].append("\n")
+            elif tag == W_P:
+                text = "".join(paragraphs.pop())
+                elem.clear()
+                if text.strip():
+                    yield text
+            elif tag == W_CELL:
+                elem.clear()
@@ -0,0 +1,345 @@
+"""
+Process-pool extraction engine for CPU-bound resume parsing
+"""
+import asyncio
+import importlib
+import math
+import multiprocessing
+import os
+import signal
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+# Resource limits are POSIX-only; workers run unrestricted elsewhere
+try:
+    import resource
+    RESOURCE_LIMITS_AVAILABLE = True
+except ImportError:
+    RESOURCE_LIMITS_AVAILABLE = False
+
+
+class ExtractionError(Exception):
+    """Raised when a document cannot be parsed (safe to pickle across processes)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message, status_code)
+        self.message = message
+        self.status_code = status_code
+
+
+class EngineOverloadedError(Exception):
+    """Raised when the extraction queue is full"""
+
+
+class _CPULimitExceeded(Exception):
+    """Raised in a worker by the SIGXCPU handler"""
+
+
+def _on_cpu_limit(signum, frame):
+    raise _CPULimitExceeded()
+
+
+# Modules imported by each worker before it takes jobs, so the first job on a
+# fresh or recycled worker does not pay for them
+WORKER_PRELOAD = ("services.parsers",)
+
+
+def _init_worker(memory_mb: int, preload: tuple = ()):
+    """
+    Worker initializer: import the parsers, cap the address space and trap
+    CPU-limit signals
+    """
+    for module in preload:
+        importlib.import_module(module)
+    if not RESOURCE_LIMITS_AVAILABLE:
+        return
+    if memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+
+def _warm_up():
+    """No-op job submitted at start so every worker is spawned ahead of traffic"""
+
+
+def _timed_call(fn: Callable, args: tuple, cpu_seconds: float = 0) -> tuple:
+    """
+    Run fn in the worker and return its result with the execution time.
+
+    In pool workers the soft RLIMIT_CPU is moved to ``cpu_seconds`` past the
+    CPU time already used, so each job gets its own budget; overruns and
+    allocation failures come back as ExtractionError.
+    """
+    limit_cpu = cpu_seconds > 0 and RESOURCE_LIMITS_AVAILABLE
+    if limit_cpu:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = math.ceil(usage.ru_utime + usage.ru_stime + cpu_seconds)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    started = time.perf_counter()
+    try:
+        result = fn(*args)
+    except _CPULimitExceeded:
+        raise ExtractionError("Parsing the document took too long", status_code=504)
+    except MemoryError:
+        raise ExtractionError("The document is too complex to parse", status_code=422)
+    finally:
+        if limit_cpu:
+            resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+    return result, time.perf_counter() - started
+
+
+def _percentile(values, fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a sequence, or None when empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class ExtractionEngine:
+    """
+    Bounded process pool for PDF/DOCX text extraction.
+
+    Jobs are submitted from the event loop and awaited asynchronously, so a slow
+    document never blocks other requests on the same worker. At most
+    ``max_workers + max_queue`` jobs are admitted; further jobs are rejected.
+    When the pool is not started (e.g. tests without lifespan) jobs run in a
+    thread instead.
+
+    Workers are sandboxed: each has an address-space ceiling, each job a CPU
+    time budget, and a job that outlives its wall-clock deadline gets the pool
+    killed and respawned. Jobs lost to a dead worker are retried once on the
+    fresh pool; jobs lost to a pool stopped for someone else's overrun are
+    retried without using up that retry.
+    """
+
+    def __init__(self):
+        self.max_workers = 0
+        self.max_queue = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._latencies = deque(maxlen=1000)
+        self._run_times = deque(maxlen=1000)
+        self._documents = {}  # text engine -> [documents, pages, seconds]
+        self._fallbacks = 0
+        self._restarts = 0
+        self._stopped_pools = weakref.WeakSet()  # pools killed for an overrunning job
+        self._watchdogs = set()
+        self.memory_mb = 0
+        self.cpu_seconds = 0.0
+        self.job_timeout = 0.0
+        self.max_tasks_per_worker = 0
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self):
+        """Create the process pool (called from the app lifespan)"""
+        if self._executor is not None:
+            return
+        self.max_workers = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 2)))
+        self.max_queue = int(os.getenv("PARSE_QUEUE_SIZE", "64"))
+        self.memory_mb = int(os.getenv("PARSE_WORKER_MEMORY_MB", "1024"))
+        self.cpu_seconds = float(os.getenv("PARSE_JOB_CPU_SECONDS", "10"))
+        self.job_timeout = float(os.getenv("PARSE_JOB_TIMEOUT", "30"))
+        self.max_tasks_per_worker = int(os.getenv("PARSE_WORKER_MAX_TASKS", "200"))
+        if self.max_workers <= 0:
+            return
+        self._executor = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        """
+        Create a pool and spawn its workers now; spawned workers otherwise
+        start on demand, so the first jobs would wait for interpreter start-up
+        """
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.memory_mb, WORKER_PRELOAD),
+            max_tasks_per_child=self.max_tasks_per_worker or None,
+        )
+        for _ in range(self.max_workers):
+            pool.submit(_warm_up)
+        return pool
+
+    def shutdown(self):
+        """Stop the process pool, cancelling queued jobs"""
+        for watchdog in list(self._watchdogs):
+            watchdog.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _restart(self, broken: ProcessPoolExecutor, overrun: bool = False):
+        """
+        Kill the workers of a stuck or broken pool and start a fresh one.
+        ``overrun`` marks a pool stopped for a job past its deadline, whose
+        other jobs were lost through no fault of their own.
+        """
+        if self._executor is not broken:
+            return  # another job already replaced it
+        if overrun:
+            self._stopped_pools.add(broken)
+        self._restarts += 1
+        self._executor = self._new_pool()
+        # ProcessPoolExecutor has no public way to stop a running job
+        for process in list((getattr(broken, "_processes", None) or {}).values()):
+            process.kill()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable, *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(*args) in the pool and return its result.
+
+        ``timeout`` is the caller's own deadline in seconds; when it passes
+        first, asyncio.TimeoutError is raised. A job that already started is
+        left to its CPU budget and the pool's job timeout, since stopping it
+        means restarting the pool under every other job.
+        """
+        capacity = (self.max_workers or 1) + self.max_queue
+        if self._executor is not None and self._pending >= capacity:
+            self._rejected += 1
+            raise EngineOverloadedError("Parser queue is full")
+
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            if self._executor is not None:
+                result, run_time = await self._run_in_pool(fn, args, timeout)
+            else:
+                result, run_time = await asyncio.wait_for(asyncio.to_thread(_timed_call, fn, args), timeout)
+        except BaseException:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+            self._latencies.append(time.perf_counter() - started)
+
+        self._completed += 1
+        self._run_times.append(run_time)
+        return result
+
+    async def _run_in_pool(
+        self, fn: Callable, args: tuple, timeout: Optional[float] = None, retry: bool = True
+    ) -> tuple:
+        executor = self._executor
+        loop = asyncio.get_running_loop()
+        submitted = loop.time()
+        caller_deadline = timeout is not None and (not self.job_timeout or timeout < self.job_timeout)
+        try:
+            # Submitting to a pool whose worker just died raises BrokenProcessPool too
+            job = executor.submit(_timed_call, fn, args, self.cpu_seconds)
+            return await asyncio.wait_for(
+                asyncio.wrap_future(job), timeout if caller_deadline else (self.job_timeout or None)
+            )
+        except asyncio.TimeoutError:
+            # A queued job is cancelled with the await. A started one is
+            # either past the job timeout (blocked or stuck in native code,
+            # out of reach of the CPU budget) or abandoned by its caller, and
+            # is then only stopped if it goes on to overrun the job timeout
+            if not job.cancel() and not job.done():
+                if not caller_deadline:
+                    self._restart(executor, overrun=True)
+                elif self.job_timeout:
+                    self._watch(executor, job, self.job_timeout - (loop.time() - submitted))
+            if caller_deadline:
+                raise
+            raise ExtractionError("Parsing the document took too long", status_code=504)
+        except BrokenProcessPool:
+            collateral = executor in self._stopped_pools
+            self._restart(executor)
+            if (retry or collateral) and self._executor is not None:
+                remaining = None if timeout is None else max(0.0, timeout - (loop.time() - submitted))
+                return await self._run_in_pool(fn, args, remaining, retry=retry if collateral else False)
+            raise ExtractionError("The document could not be parsed safely", status_code=422)
+
+    def _watch(self, executor: ProcessPoolExecutor, job, delay: float):
+        """Restart the pool if an abandoned job is still running after ``delay`` seconds"""
+        async def stop_when_overdue():
+            try:
+                await asyncio.wait_for(asyncio.wrap_future(job), max(0.0, delay))
+            except asyncio.TimeoutError:
+                self._restart(executor, overrun=True)
+            except Exception:
+                pass  # finished with an error nobody is waiting for
+
+        watchdog = asyncio.ensure_future(stop_when_overdue())
+        self._watchdogs.add(watchdog)
+        watchdog.add_done_callback(self._watchdogs.discard)
+
+    def record_document(self, engine: str, pages: int, seconds: float):
+        """Record a finished document for per-engine throughput figures"""
+        totals = self._documents.setdefault(engine, [0, 0, 0.0])
+        totals[0] += 1
+        totals[1] += pages
+        totals[2] += seconds
+
+    def record_fallback(self):
+        """Record a fast-engine result that was discarded for the full parser"""
+        self._fallbacks += 1
+
+    def stats(self) -> dict:
+        """Queue depth and latency figures for the metrics endpoint"""
+        workers = self.max_workers if self._executor is not None else 0
+        in_flight = min(self._pending, workers) if workers else self._pending
+        latencies = list(self._latencies)
+        run_times = list(self._run_times)
+        return {
+            "mode": "process_pool" if self._executor is not None else "inline",
+            "workers": workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "queue_depth": self._pending - in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "latency_ms": {
+                "p50": _ms(_percentile(latencies, 0.50)),
+                "p99": _ms(_percentile(latencies, 0.99)),
+            },
+            "run_time_ms": {
+                "p50": _ms(_percentile(run_times, 0.50)),
+                "p99": _ms(_percentile(run_times, 0.99)),
+            },
+            "engines": {
+                engine: {
+                    "documents": documents,
+                    "pages": pages,
+                    "avg_ms": _ms(seconds / documents),
+                    "pages_per_second": round(pages / seconds, 2) if seconds else None,
+                }
+                for engine, (documents, pages, seconds) in self._documents.items()
+            },
+            "fallbacks": self._fallbacks,
+            "worker_restarts": self._restarts,
+            "limits": {
+                "memory_mb": self.memory_mb if RESOURCE_LIMITS_AVAILABLE else None,
+                "cpu_seconds_per_job": self.cpu_seconds if RESOURCE_LIMITS_AVAILABLE else None,
+                "job_timeout_seconds": self.job_timeout,
+            },
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+# Shared engine, started and stopped by the application lifespan
+extraction_engine = ExtractionEngine()
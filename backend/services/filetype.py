@@ -0,0 +1,60 @@
+"""
+Magic-byte file type sniffing for uploaded resumes
+"""
+import zipfile
+
+# Bytes inspected for signatures
+SNIFF_LENGTH = 1024
+
+PDF_SIGNATURE = b"%PDF-"
+ZIP_SIGNATURE = b"PK\x03\x04"
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+def sniff_file_type(path: str) -> str:
+    """
+    Identify an upload from its content rather than its name.
+
+    Returns one of:
+    - "docx": ZIP with [Content_Types].xml and word/document.xml
+    - "zip": any other ZIP archive (including other OOXML documents)
+    - "doc": legacy OLE compound file (.doc)
+    - "pdf": PDF header within the first 1KB
+    - "text": NUL-free UTF-8 text
+    - "unknown": anything else
+    """
+    with open(path, "rb") as f:
+        head = f.read(SNIFF_LENGTH)
+
+    # Container signatures sit at offset 0 and win over a PDF header that
+    # appears inside a stored archive member
+    if head.startswith(ZIP_SIGNATURE):
+        return _sniff_zip(path)
+    if head.startswith(OLE_SIGNATURE):
+        return "doc"
+    if PDF_SIGNATURE in head:
+        return "pdf"
+    if head and b"\x00" not in head and _is_utf8(head):
+        return "text"
+    return "unknown"
+
+
+def _sniff_zip(path: str) -> str:
+    """Tell a Word document apart from other ZIP archives via its central directory"""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+    except (zipfile.BadZipFile, OSError):
+        return "unknown"
+    if "[Content_Types].xml" in names and "word/document.xml" in names:
+        return "docx"
+    return "zip"
+
+
+def _is_utf8(head: bytes) -> bool:
+    """UTF-8 check that tolerates a multi-byte character cut off at the end"""
+    try:
+        head.decode("utf-8")
+        return True
+    except UnicodeDecodeError as e:
+        return e.start >= len(head) - 3 and e.reason == "unexpected end of data"
@@ -0,0 +1,103 @@
+"""
+Hedged upstream calls to cut tail latency
+"""
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class Hedger:
+    """
+    Sends a second, identical call when the first is slower than a
+    percentile of recent latency. The first call to succeed wins and the
+    other is cancelled.
+
+    Hedges are paid from a budget: every call earns HEDGE_BUDGET of a hedge
+    (up to MAX_SAVED), so over time at most that share of calls is
+    duplicated.
+    """
+
+    # Hedges that can be saved up for a burst of slow calls
+    MAX_SAVED = 10.0
+
+    def __init__(self):
+        self.configure()
+
+    def configure(self):
+        """(Re)read settings from the environment and reset counters"""
+        self.percentile = float(os.getenv("HEDGE_PERCENTILE", "0"))
+        self.budget = float(os.getenv("HEDGE_BUDGET", "0.05"))
+        self.min_samples = max(1, int(os.getenv("HEDGE_MIN_SAMPLES", "20")))
+        self.min_delay = float(os.getenv("HEDGE_MIN_DELAY", "1"))
+        self._saved = 0.0
+        self.calls = 0
+        self.hedged = 0
+        self.wins = 0
+        self.over_budget = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.percentile > 0
+
+    def delay(self, latencies: List[float]) -> Optional[float]:
+        """
+        Seconds to wait before hedging, given recent latencies of the same
+        kind of call; None when hedging is off or there is too little data.
+        """
+        if not self.enabled or len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(self.percentile / 100 * len(ordered)))
+        return max(self.min_delay, ordered[index])
+
+    async def run(self, fn: Callable[[], Awaitable[Any]], delay: Optional[float]) -> Any:
+        """Run ``fn``, hedging it with a second call after ``delay`` seconds"""
+        self.calls += 1
+        self._saved = min(self.MAX_SAVED, self._saved + self.budget)
+        if delay is None:
+            return await fn()
+
+        tasks = [asyncio.ensure_future(fn())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                if self._saved >= 1:
+                    self._saved -= 1
+                    self.hedged += 1
+                    tasks.append(asyncio.ensure_future(fn()))
+                else:
+                    self.over_budget += 1
+
+            error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (task for task in tasks if task in done):
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            # Cancel the loser (or both, if the caller was cancelled) and wait
+            # for it so its upstream slot is free before returning
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            await asyncio.gather(*losers, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+            "wins": self.wins,
+            "win_rate": round(self.wins / self.hedged, 4) if self.hedged else 0.0,
+            "over_budget": self.over_budget,
+        }
+
+
+# Shared hedger for conversion calls, reconfigured by the application lifespan
+hedger = Hedger()
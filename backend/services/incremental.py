@@ -0,0 +1,68 @@
+"""
+Diffing resume sections to re-convert only what a user edited
+"""
+from typing import Any, Dict, List, Optional, Set
+from services.tokens import compact_text
+
+# Structured resume sections each source section feeds. Edits to a source
+# section missing here (such as projects or awards) need a full conversion.
+SECTION_OUTPUTS: Dict[str, List[str]] = {
+    "contact": ["personal_info"],
+    "summary": ["summary"],
+    "experience": ["experience"],
+    "education": ["education"],
+    "skills": ["skills"],
+    "certifications": ["skills"],
+    "languages": ["skills"],
+}
+
+
+def changed_sections(previous: Dict[str, str], current: Dict[str, str]) -> List[str]:
+    """Source sections added, removed or edited, ignoring whitespace-only changes"""
+    names = list(dict.fromkeys([*current, *previous]))
+    return [
+        name for name in names
+        if compact_text(previous.get(name, "")) != compact_text(current.get(name, ""))
+    ]
+
+
+def affected_outputs(changed: List[str]) -> Optional[Set[str]]:
+    """Structured sections to regenerate, or None when a full conversion is needed"""
+    outputs: Set[str] = set()
+    for name in changed:
+        if name not in SECTION_OUTPUTS:
+            return None
+        outputs.update(SECTION_OUTPUTS[name])
+    return outputs
+
+
+def source_sections(outputs: Set[str], sections: Dict[str, str]) -> Dict[str, str]:
+    """The current source sections that feed ``outputs``, in document order"""
+    return {
+        name: body for name, body in sections.items()
+        if set(SECTION_OUTPUTS.get(name, [])) & outputs
+    }
+
+
+def match_roles(roles: List[str], entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Pair each role's text with its converted experience entry.
+
+    Entries are paired in order and only when every entry's title or company
+    appears in its role text; otherwise no pairs are returned and every role
+    is converted again.
+    """
+    if len(roles) != len(entries):
+        return {}
+    pairs = {}
+    for role, entry in zip(roles, entries):
+        text = role.lower()
+        names = [
+            value.strip().lower()
+            for value in (entry.get("company"), entry.get("title"))
+            if isinstance(value, str) and value.strip()
+        ]
+        if not any(name in text for name in names):
+            return {}
+        pairs[compact_text(role)] = entry
+    return pairs
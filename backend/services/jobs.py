@@ -0,0 +1,335 @@
+"""
+Persistent queue and worker pool for batch conversion jobs
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import uuid
+from typing import Dict, List, Optional
+
+# Item states; the last three are final
+ITEM_STATES = ("queued", "running", "succeeded", "failed", "cancelled")
+FINAL_STATES = ("succeeded", "failed", "cancelled")
+
+# Default queue database, in the app's data directory so it persists with the app
+DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "jobs.sqlite3"
+)
+
+# Seconds an idle worker sleeps before polling the queue again
+IDLE_POLL_INTERVAL = 1.0
+
+# Columns added after the first release, with their types, for older queue files
+_ADDED_COLUMNS = {"owner": "TEXT", "lease_until": "REAL"}
+
+
+class JobBackend:
+    """
+    Converts the items of a batch job.
+
+    The default backend converts items one at a time; a backend for a
+    provider's bulk or offline completion mode can override ``convert`` and
+    group requests upstream.
+    """
+
+    name = "base"
+
+    async def convert(self, resume_text: str, standard: str, sections: Optional[Dict[str, str]]) -> dict:
+        raise NotImplementedError
+
+
+class StubJobBackend(JobBackend):
+    """Deterministic local backend for tests and dry runs; makes no model calls"""
+
+    name = "stub"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    async def convert(self, resume_text: str, standard: str, sections: Optional[Dict[str, str]]) -> dict:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        lines = [line.strip() for line in resume_text.splitlines() if line.strip()]
+        return {
+            "resume": {
+                "personal_info": {"full_name": lines[0] if lines else "", "email": "", "phone": ""},
+                "summary": "",
+                "experience": [],
+                "education": [],
+                "skills": [],
+            },
+            "standard": standard,
+        }
+
+
+class JobQueue:
+    """
+    SQLite-backed queue of conversion items processed by async workers.
+
+    Items survive restarts: a running item is leased to the queue that
+    claimed it, and the lease is renewed while that queue is alive. Items
+    whose lease ran out (their process died) are queued again, as are a
+    queue's own items when it shuts down; items held by live peers are left
+    alone. Finished items get an increasing sequence number so clients can
+    page through or stream results as they complete. Claims and sequence
+    numbers are assigned in the database, so processes sharing the file never
+    run an item twice.
+    """
+
+    def __init__(self):
+        self._db: Optional[sqlite3.Connection] = None
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.owner = uuid.uuid4().hex
+        self.backend: Optional[JobBackend] = None
+        self.configure()
+
+    def configure(self):
+        """(Re)read settings from the environment"""
+        self.db_path = os.getenv("JOBS_DB") or DEFAULT_DB_PATH
+        self.worker_count = max(1, int(os.getenv("JOB_WORKERS", "4")))
+        self.max_items = int(os.getenv("JOB_MAX_ITEMS", "5000"))
+        self.lease_seconds = max(1.0, float(os.getenv("JOB_LEASE_SECONDS", "60")))
+
+    @property
+    def started(self) -> bool:
+        return self._db is not None
+
+    async def start(self, backend: JobBackend):
+        """Open the queue and start the workers"""
+        await self.shutdown()
+        self.configure()
+        self.backend = backend
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, created_at REAL NOT NULL, total INTEGER NOT NULL, backend TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS job_items ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL, idx INTEGER NOT NULL,"
+            " standard TEXT NOT NULL, resume_text TEXT NOT NULL, sections TEXT,"
+            " status TEXT NOT NULL, result TEXT, error TEXT, finished_seq INTEGER, finished_at REAL);"
+            "CREATE INDEX IF NOT EXISTS job_items_status ON job_items (status, seq);"
+            "CREATE INDEX IF NOT EXISTS job_items_finished ON job_items (job_id, finished_seq);"
+            "CREATE INDEX IF NOT EXISTS job_items_finished_seq ON job_items (finished_seq);"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(job_items)")}
+        for column, kind in _ADDED_COLUMNS.items():
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE job_items ADD COLUMN {column} {kind}")
+        # Items interrupted by a process that is gone run again
+        self._requeue_expired()
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.worker_count)]
+        self._heartbeat = asyncio.ensure_future(self._renew_leases())
+
+    async def shutdown(self):
+        """Stop the workers and close the queue; running items resume on next start"""
+        tasks = self._workers + ([self._heartbeat] if self._heartbeat else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._heartbeat = None
+        if self._db is not None:
+            self._db.execute(
+                "UPDATE job_items SET status = 'queued', owner = NULL, lease_until = NULL "
+                "WHERE status = 'running' AND owner = ?",
+                (self.owner,),
+            )
+            self._db.close()
+            self._db = None
+
+    def create_job(self, items: List[dict]) -> str:
+        """Persist a batch of {resume_text, standard, sections} items and return its id"""
+        job_id = uuid.uuid4().hex
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.execute(
+                "INSERT INTO jobs (id, created_at, total, backend) VALUES (?, ?, ?, ?)",
+                (job_id, time.time(), len(items), self.backend.name),
+            )
+            self._db.executemany(
+                "INSERT INTO job_items (job_id, idx, standard, resume_text, sections, status) "
+                "VALUES (?, ?, ?, ?, ?, 'queued')",
+                [
+                    (
+                        job_id,
+                        index,
+                        item["standard"],
+                        item["resume_text"],
+                        json.dumps(item["sections"]) if item.get("sections") else None,
+                    )
+                    for index, item in enumerate(items)
+                ],
+            )
+        self._wakeup.set()
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """Job summary with per-state item counts, or None if unknown"""
+        row = self._db.execute(
+            "SELECT created_at, total, backend FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        created_at, total, backend = row
+        counts = dict.fromkeys(ITEM_STATES, 0)
+        counts.update(self._db.execute(
+            "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall())
+        pending = counts["queued"] + counts["running"]
+        if not pending:
+            status = "completed"
+        elif pending == total:
+            status = "queued" if not counts["running"] else "running"
+        else:
+            status = "running"
+        return {
+            "job_id": job_id,
+            "status": status,
+            "backend": backend,
+            "created_at": created_at,
+            "total": total,
+            **counts,
+        }
+
+    def get_results(self, job_id: str, after: int = 0, limit: int = 100) -> List[dict]:
+        """Finished items of a job in completion order, after the ``after`` cursor"""
+        rows = self._db.execute(
+            "SELECT idx, standard, status, result, error, finished_seq FROM job_items "
+            "WHERE job_id = ? AND finished_seq > ? ORDER BY finished_seq LIMIT ?",
+            (job_id, after, limit),
+        ).fetchall()
+        return [
+            {
+                "index": index,
+                "standard": standard,
+                "status": status,
+                "result": json.loads(result) if result else None,
+                "error": json.loads(error) if error else None,
+                "cursor": finished_seq,
+            }
+            for index, standard, status, result, error, finished_seq in rows
+        ]
+
+    def cancel_job(self, job_id: str) -> int:
+        """Cancel a job's queued items; running items finish. Returns the number cancelled"""
+        queued = [
+            seq for (seq,) in self._db.execute(
+                "SELECT seq FROM job_items WHERE job_id = ? AND status = 'queued'", (job_id,)
+            ).fetchall()
+        ]
+        cancelled = 0
+        for seq in queued:
+            # Another process may have claimed it since the select
+            claimed = self._db.execute(
+                "UPDATE job_items SET status = 'cancelled' WHERE seq = ? AND status = 'queued'", (seq,)
+            )
+            if claimed.rowcount == 1:
+                self._finish(seq, "cancelled", None, None)
+                cancelled += 1
+        return cancelled
+
+    def _claim(self) -> Optional[tuple]:
+        """Take the oldest queued item; the status guard makes the claim atomic across processes"""
+        while True:
+            row = self._db.execute(
+                "SELECT seq, resume_text, standard, sections FROM job_items "
+                "WHERE status = 'queued' ORDER BY seq LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            claimed = self._db.execute(
+                "UPDATE job_items SET status = 'running', owner = ?, lease_until = ? "
+                "WHERE seq = ? AND status = 'queued'",
+                (self.owner, time.time() + self.lease_seconds, row[0]),
+            )
+            if claimed.rowcount == 1:
+                return row
+
+    def _requeue_expired(self) -> int:
+        """Queue again running items whose owner stopped renewing the lease"""
+        requeued = self._db.execute(
+            "UPDATE job_items SET status = 'queued', owner = NULL, lease_until = NULL "
+            "WHERE status = 'running' AND (lease_until IS NULL OR lease_until < ?)",
+            (time.time(),),
+        ).rowcount
+        if requeued and self._wakeup is not None:
+            self._wakeup.set()
+        return requeued
+
+    async def _renew_leases(self):
+        """Extend the leases of this queue's running items and reclaim expired ones"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            self._db.execute(
+                "UPDATE job_items SET lease_until = ? WHERE status = 'running' AND owner = ?",
+                (time.time() + self.lease_seconds, self.owner),
+            )
+            self._requeue_expired()
+
+    def _finish(self, seq: int, status: str, result: Optional[dict], error: Optional[dict]):
+        self._db.execute(
+            "UPDATE job_items SET status = ?, result = ?, error = ?, finished_at = ?, "
+            "finished_seq = (SELECT COALESCE(MAX(finished_seq), 0) + 1 FROM job_items) "
+            "WHERE seq = ?",
+            (
+                status,
+                json.dumps(result) if result is not None else None,
+                json.dumps(error) if error is not None else None,
+                time.time(),
+                seq,
+            ),
+        )
+
+    async def _worker(self):
+        while True:
+            item = self._claim()
+            if item is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), IDLE_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            seq, resume_text, standard, sections = item
+            try:
+                result = await self.backend.convert(
+                    resume_text, standard, json.loads(sections) if sections else None
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._finish(seq, "failed", None, {
+                    "status_code": getattr(e, "status_code", 500),
+                    "detail": getattr(e, "detail", None) or str(e),
+                })
+            else:
+                self._finish(seq, "succeeded", result, None)
+
+    def stats(self) -> dict:
+        if self._db is None:
+            return {"started": False}
+        counts = dict.fromkeys(ITEM_STATES, 0)
+        counts.update(self._db.execute(
+            "SELECT status, COUNT(*) FROM job_items WHERE status IN ('queued', 'running') GROUP BY status"
+        ).fetchall())
+        finished = self._db.execute("SELECT COALESCE(MAX(finished_seq), 0) FROM job_items").fetchone()[0]
+        return {
+            "started": True,
+            "backend": self.backend.name,
+            "workers": len(self._workers),
+            "queued": counts["queued"],
+            "running": counts["running"],
+            "finished": finished,
+        }
+
+
+# Shared job queue, started by the application lifespan
+job_queue = JobQueue()
@@ -0,0 +1,120 @@
+"""
+Incremental parsing of a JSON object that arrives in chunks
+"""
+import json
+from typing import Any, List, Optional, Tuple
+
+# Marker for a value that failed to parse in lenient mode
+_INVALID = object()
+
+
+class JSONObjectStream:
+    """
+    Scan a streamed JSON object and report its parts as soon as they close.
+
+    ``feed`` returns a list of events:
+    - ("item", key, index, value) for each element of a top-level array
+    - ("member", key, value) for each top-level member
+
+    Text before the opening brace (such as a markdown fence) and after the
+    closing brace is ignored. With ``strict=False`` a value that is not valid
+    JSON is skipped instead of raising, and its key is added to ``invalid``.
+    """
+
+    def __init__(self, strict: bool = True):
+        self.strict = strict
+        self.invalid: List[str] = []
+        self.text = ""
+        self.finished = False
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._in_array = False
+        self._item_start = 0
+        self._item_index = 0
+
+    def feed(self, chunk: str) -> List[Tuple[Any, ...]]:
+        self.text += chunk
+        events: List[Tuple[Any, ...]] = []
+        text = self.text
+        while self._pos < len(text) and not self.finished:
+            i = self._pos
+            ch = text[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._value_start is None:
+                        self._key = self._decode(text[self._string_start:i + 1], None)
+                continue
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if ch == "[" and self._depth == 1 and not text[self._value_start:i].strip():
+                    self._in_array = True
+                    self._item_start = i + 1
+                    self._item_index = 0
+                self._depth += 1
+            elif ch in "}]":
+                if ch == "]" and self._depth == 2 and self._in_array:
+                    self._emit_item(text[self._item_start:i], events)
+                    self._in_array = False
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit_member(text[self._value_start or i:i], events)
+                    self.finished = True
+            elif ch == ":" and self._depth == 1 and self._value_start is None:
+                self._value_start = i + 1
+            elif ch == ",":
+                if self._depth == 1:
+                    self._emit_member(text[self._value_start or i:i], events)
+                elif self._depth == 2 and self._in_array:
+                    self._emit_item(text[self._item_start:i], events)
+                    self._item_start = i + 1
+        return events
+
+    def _decode(self, raw: str, key: Optional[str]) -> Any:
+        """Parse one value; in lenient mode return _INVALID and note the key instead of raising"""
+        try:
+            return json.loads(raw)
+        except ValueError:
+            if self.strict:
+                raise
+            if key is not None and key not in self.invalid:
+                self.invalid.append(key)
+            return _INVALID
+
+    def _emit_item(self, raw: str, events: list):
+        raw = raw.strip()
+        if raw:
+            value = self._decode(raw, self._key)
+            if value is not _INVALID:
+                events.append(("item", self._key, self._item_index, value))
+                self._item_index += 1
+
+    def _emit_member(self, raw: str, events: list):
+        raw = raw.strip()
+        if isinstance(self._key, str) and raw and self._key not in self.invalid:
+            value = self._decode(raw, self._key)
+            if value is not _INVALID:
+                events.append(("member", self._key, value))
+        self._key = None
+        self._value_start = None
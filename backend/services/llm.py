@@ -0,0 +1,338 @@
+"""
+Offline LLM backends: a local stub and record/replay of real responses
+
+Both expose the subset of the AsyncOpenAI interface used by the conversion
+router (``chat.completions.create``, with and without ``stream=True``, and
+``close``), so they slot in behind the upstream limiter and error mapping
+unchanged.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+import httpx
+from openai import InternalServerError, RateLimitError
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from services.sections import segment_resume
+from services.tokens import count_tokens
+
+# Markers the prompt templates put before the per-request values
+_RESUME_MARKER = "Resume text to convert:\n"
+_STANDARDS_MARKER = "Requested standards: "
+# Wording of the chunk prompts that carry only experience entries
+_EXPERIENCE_CHUNK_MARKER = "group of work experience entries"
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_BULLET = re.compile(r"^\s*([-*•▪◦●]|\d+[.)])\s+")
+# Section labels added by the conversion router, e.g. "CONTACT:"
+_LABEL = re.compile(r"^[A-Z][A-Z ]*:$")
+
+# Characters per streamed chunk
+STREAM_CHUNK_SIZE = 16
+
+
+class ReplayMissError(Exception):
+    """No recorded response exists for a prompt in replay mode"""
+
+
+def _completion(model: str, content: str, prompt_tokens: int, completion_tokens: int) -> ChatCompletion:
+    return ChatCompletion.model_validate({
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content},
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    })
+
+
+def _chunk(model: str, completion_id: str, content: Optional[str], usage: Optional[dict] = None) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate({
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [] if content is None else [{"index": 0, "delta": {"content": content}}],
+        "usage": usage,
+    })
+
+
+class _ChunkStream:
+    """Async stream of chunks for a finished completion, paced over ``duration``"""
+
+    def __init__(self, completion: ChatCompletion, duration: float = 0.0, include_usage: bool = False):
+        content = completion.choices[0].message.content
+        pieces = [content[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(content), STREAM_CHUNK_SIZE)]
+        self._chunks = [_chunk(completion.model, completion.id, piece) for piece in pieces]
+        if include_usage:
+            self._chunks.append(_chunk(completion.model, completion.id, None, completion.usage.model_dump()))
+        self._delay = duration / max(len(self._chunks), 1)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ChatCompletionChunk:
+        if not self._chunks:
+            raise StopAsyncIteration
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        return self._chunks.pop(0)
+
+    async def close(self):
+        self._chunks = []
+
+
+def _http_response(status_code: int, headers: Optional[dict] = None) -> httpx.Response:
+    request = httpx.Request("POST", "http://llm-stub/v1/chat/completions")
+    return httpx.Response(status_code, headers=headers or {}, request=request)
+
+
+def _prompt_text(kwargs: dict) -> str:
+    return "\n".join(message.get("content") or "" for message in kwargs.get("messages", []))
+
+
+class StubChatClient:
+    """
+    Local stand-in for the model that needs no network or API key.
+
+    It answers conversion prompts with plausible structured resumes built from
+    the resume text in the prompt. Latency follows a log-normal distribution
+    around a median, and a configurable share of calls fails with a 429
+    (with retry-after-ms) or a 500. Streamed responses are paced across the
+    sampled latency.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 800.0,
+        latency_sigma: float = 0.4,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_ms: float = 1000.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_ms = retry_after_ms
+        self._random = random.Random(seed)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    @classmethod
+    def from_env(cls) -> "StubChatClient":
+        seed = os.getenv("LLM_STUB_SEED")
+        return cls(
+            latency_ms=float(os.getenv("LLM_STUB_LATENCY_MS", "800")),
+            latency_sigma=float(os.getenv("LLM_STUB_LATENCY_SIGMA", "0.4")),
+            error_rate=float(os.getenv("LLM_STUB_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.getenv("LLM_STUB_RATE_LIMIT_RATE", "0")),
+            retry_after_ms=float(os.getenv("LLM_STUB_RETRY_AFTER_MS", "1000")),
+            seed=int(seed) if seed else None,
+        )
+
+    def sample_latency(self) -> float:
+        """Seconds for one call"""
+        if self.latency_ms <= 0:
+            return 0.0
+        return self.latency_ms / 1000 * math.exp(self._random.gauss(0, self.latency_sigma))
+
+    async def _create(self, **kwargs) -> Any:
+        self.calls += 1
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            await asyncio.sleep(min(self.sample_latency(), 0.05))
+            raise RateLimitError(
+                "Rate limit reached (stub)",
+                response=_http_response(429, {"retry-after-ms": str(int(self.retry_after_ms))}),
+                body=None,
+            )
+        if roll < self.rate_limit_rate + self.error_rate:
+            await asyncio.sleep(self.sample_latency())
+            raise InternalServerError("Internal server error (stub)", response=_http_response(500), body=None)
+
+        prompt = _prompt_text(kwargs)
+        content = json.dumps(stub_response(prompt))
+        model = kwargs.get("model", "stub")
+        completion = _completion(model, content, count_tokens(prompt, model), count_tokens(content, model))
+        latency = self.sample_latency()
+        if kwargs.get("stream"):
+            include_usage = bool((kwargs.get("stream_options") or {}).get("include_usage"))
+            return _ChunkStream(completion, latency, include_usage)
+        await asyncio.sleep(latency)
+        return completion
+
+    async def close(self):
+        pass
+
+
+def stub_response(prompt: str) -> dict:
+    """Plausible model output for a conversion, canonical, chunk or summary style prompt"""
+    if _STANDARDS_MARKER in prompt:
+        standards = prompt.split(_STANDARDS_MARKER, 1)[1].split("\n", 1)[0]
+        return {"summaries": {
+            standard.strip(): f"Professional profile written for {standard.strip()}."
+            for standard in standards.split(",") if standard.strip()
+        }}
+
+    resume_text = prompt.split(_RESUME_MARKER, 1)[-1]
+    if _EXPERIENCE_CHUNK_MARKER in prompt:
+        return {"experience": stub_response("EXPERIENCE\n" + resume_text)["experience"]}
+    sections = segment_resume(resume_text)
+    contact = sections.get("contact", "")
+    contact_lines = [
+        line.strip() for line in contact.splitlines()
+        if line.strip() and not _LABEL.match(line.strip())
+    ]
+    email = _EMAIL.search(contact)
+    phone = _PHONE.search(contact)
+
+    experience: List[Dict[str, Any]] = []
+    for line in sections.get("experience", "").splitlines():
+        if not line.strip():
+            continue
+        if _BULLET.match(line) and experience:
+            experience[-1]["achievements"].append(_BULLET.sub("", line).strip())
+        else:
+            experience.append({
+                "title": line.strip(),
+                "company": "",
+                "location": "",
+                "start_date": "",
+                "end_date": "",
+                "achievements": [],
+            })
+
+    skills = [
+        skill.strip()
+        for skill in re.split(r"[,\n|•]", sections.get("skills", ""))
+        if skill.strip()
+    ]
+    categorised = '"category"' in prompt
+
+    return {
+        "personal_info": {
+            "full_name": contact_lines[0] if contact_lines else "",
+            "email": email.group(0) if email else "",
+            "phone": phone.group(0).strip() if phone else "",
+            "location": "",
+        },
+        "summary": " ".join(sections.get("summary", "").split())[:400],
+        "experience": experience,
+        "education": [
+            {"degree": line.strip(), "institution": "", "location": "", "graduation_date": ""}
+            for line in sections.get("education", "").splitlines() if line.strip()
+        ],
+        "skills": [{"category": "Technical Skills", "items": skills}] if categorised else skills,
+    }
+
+
+class RecordReplayClient:
+    """
+    Records real model responses keyed by a hash of the request, or serves
+    them back.
+
+    In "record" mode every call goes to ``inner`` and the response is written
+    to ``directory/<hash>.json``. In "replay" mode responses come only from
+    the recordings, so runs are deterministic and offline; an unrecorded
+    request raises ReplayMissError.
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(self, directory: str, mode: str, inner: Any = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown record/replay mode: {mode}")
+        if mode == "record" and inner is None:
+            raise ValueError("Record mode needs a client to record from")
+        self.directory = directory
+        self.mode = mode
+        self.inner = inner
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    @staticmethod
+    def request_key(kwargs: dict) -> str:
+        """Hash of everything that determines the model's answer"""
+        payload = {
+            field: kwargs.get(field)
+            for field in ("model", "messages", "temperature", "response_format")
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    async def _create(self, **kwargs) -> Any:
+        key = self.request_key(kwargs)
+        if self.mode == "replay":
+            return self._replay(key, kwargs)
+
+        if kwargs.get("stream"):
+            # Record from a buffered call and stream the recording back
+            buffered = {k: v for k, v in kwargs.items() if k not in ("stream", "stream_options")}
+            completion = await self.inner.chat.completions.create(**buffered)
+            self._save(key, completion)
+            include_usage = bool((kwargs.get("stream_options") or {}).get("include_usage"))
+            return _ChunkStream(_as_completion(completion), 0.0, include_usage)
+
+        completion = await self.inner.chat.completions.create(**kwargs)
+        self._save(key, completion)
+        return completion
+
+    def _replay(self, key: str, kwargs: dict) -> Any:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                recording = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            raise ReplayMissError(f"No recorded response for request {key[:12]}")
+        self.hits += 1
+        completion = ChatCompletion.model_validate(recording)
+        if kwargs.get("stream"):
+            include_usage = bool((kwargs.get("stream_options") or {}).get("include_usage"))
+            return _ChunkStream(completion, 0.0, include_usage)
+        return completion
+
+    def _save(self, key: str, completion: Any):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(_as_completion(completion).model_dump(), f)
+        os.replace(tmp_path, self._path(key))
+
+    async def close(self):
+        if self.inner is not None:
+            await self.inner.close()
+
+
+def _as_completion(completion: Any) -> ChatCompletion:
+    """Normalise a response object into a ChatCompletion"""
+    if isinstance(completion, ChatCompletion):
+        return completion
+    usage = getattr(completion, "usage", None)
+    return _completion(
+        getattr(completion, "model", "unknown"),
+        completion.choices[0].message.content,
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+    )
@@ -0,0 +1,114 @@
+"""
+Document text extractors run inside extraction workers
+
+Kept apart from the routers so a worker process only imports what parsing
+needs; workers preload this module when they start.
+"""
+import re
+from io import BytesIO
+from typing import List, Tuple, Union
+import pdfplumber
+import docx
+from services.extraction import ExtractionError
+from services.docx_text import extract_docx_text
+
+# PDFium is installed with pdfplumber, but keep the fast engine optional
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+
+def _open_source(source: Union[bytes, str]):
+    """Parsers accept raw bytes or the path of a spooled upload"""
+    return BytesIO(source) if isinstance(source, bytes) else source
+
+
+class PDFTextEngine:
+    """Interface for PDF text engines; implementations run inside extraction workers"""
+    
+    name = ""
+    
+    def extract_pages(self, source: Union[bytes, str], page_indexes: List[int]) -> Tuple[int, List[str]]:
+        """Return the document page count and the text of the requested pages"""
+        raise NotImplementedError
+
+
+class PdfplumberEngine(PDFTextEngine):
+    """Character-level layout analysis; slow but handles complex layouts"""
+    
+    name = "pdfplumber"
+    
+    def extract_pages(self, source, page_indexes):
+        with pdfplumber.open(_open_source(source)) as pdf:
+            pages = pdf.pages
+            return len(pages), [pages[i].extract_text() or "" for i in page_indexes if i < len(pages)]
+
+
+class PdfiumEngine(PDFTextEngine):
+    """Raw text layer read through PDFium; fast, suited to simple text PDFs"""
+    
+    name = "pdfium"
+    
+    def extract_pages(self, source, page_indexes):
+        pdf = pdfium.PdfDocument(source)
+        try:
+            texts = []
+            for i in page_indexes:
+                if i >= len(pdf):
+                    break
+                page = pdf[i]
+                textpage = page.get_textpage()
+                texts.append(_clean_pdfium_text(textpage.get_text_range()))
+                textpage.close()
+                page.close()
+            return len(pdf), texts
+        finally:
+            pdf.close()
+
+
+def _clean_pdfium_text(text: str) -> str:
+    """Normalise PDFium line endings and drop control characters"""
+    return _CONTROL_CHARS.sub("", text.replace("\r\n", "\n")).strip()
+
+
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b-\x1f\ufffe]")
+
+# Available PDF engines, by name
+PDF_ENGINES = {PdfplumberEngine.name: PdfplumberEngine()}
+if PDFIUM_AVAILABLE:
+    PDF_ENGINES[PdfiumEngine.name] = PdfiumEngine()
+
+
+def parse_pdf_pages(source: Union[bytes, str], page_indexes: List[int], engine: str) -> Tuple[int, List[str]]:
+    """Extract text from selected PDF pages (runs in an extraction worker)"""
+    try:
+        return PDF_ENGINES[engine].extract_pages(source, page_indexes)
+    except Exception as e:
+        raise ExtractionError(f"Failed to parse PDF: {str(e)}")
+
+
+def parse_docx(source: Union[bytes, str]) -> str:
+    """Extract text from DOCX file (runs in an extraction worker)"""
+    try:
+        doc = docx.Document(_open_source(source))
+        paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
+        return "\n".join(paragraphs)
+    except Exception as e:
+        raise ExtractionError(f"Failed to parse DOCX: {str(e)}")
+
+
+def parse_docx_stream(source: Union[bytes, str]) -> str:
+    """Extract DOCX text by streaming the XML parts (runs in an extraction worker)"""
+    try:
+        return extract_docx_text(_open_source(source))
+    except Exception as e:
+        raise ExtractionError(f"Failed to parse DOCX: {str(e)}")
+
+
+# Available DOCX parsers, by engine name
+DOCX_PARSERS = {
+    "docx-stream": parse_docx_stream,
+    "python-docx": parse_docx,
+}
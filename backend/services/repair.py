@@ -0,0 +1,111 @@
+"""
+Validation, salvage and repair accounting for structured resumes
+"""
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from pydantic import TypeAdapter, ValidationError
+from services.json_stream import JSONObjectStream
+
+# Schema of each required top-level section, compiled once at import. Values
+# must have the exact JSON type (no coercion); field-level detail differs per
+# standard and is left to the prompt.
+SECTION_SCHEMAS: Dict[str, TypeAdapter] = {
+    "personal_info": TypeAdapter(Dict[str, Any]),
+    "summary": TypeAdapter(str),
+    "experience": TypeAdapter(List[Dict[str, Any]]),
+    "education": TypeAdapter(List[Dict[str, Any]]),
+    "skills": TypeAdapter(Union[List[Any], Dict[str, Any]]),
+}
+
+# Value used for a section the model returned as null, which the prompts
+# allow for anything not present in the resume
+EMPTY_SECTIONS: Dict[str, Any] = {
+    "personal_info": {},
+    "summary": "",
+    "experience": [],
+    "education": [],
+    "skills": [],
+}
+
+
+def salvage_resume(response_text: str) -> Dict[str, Any]:
+    """
+    Top-level sections that can be read from a model response.
+
+    A well-formed response is parsed whole (ignoring a markdown fence);
+    otherwise every member that parses on its own is kept and the rest is
+    dropped, so one broken section does not lose the others.
+    """
+    start = response_text.find("{")
+    end = response_text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            resume = json.loads(response_text[start:end + 1])
+        except ValueError:
+            pass
+        else:
+            return resume if isinstance(resume, dict) else {}
+
+    parser = JSONObjectStream(strict=False)
+    return {event[1]: event[2] for event in parser.feed(response_text) if event[0] == "member"}
+
+
+def validate_resume(
+    resume: Dict[str, Any], sections: Optional[Iterable[str]] = None
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Split a resume into its valid required sections (or just ``sections``)
+    and the problems with the others ("missing" or a short description of
+    why it is invalid). A null section is valid and becomes its empty value.
+    """
+    valid: Dict[str, Any] = {}
+    problems: Dict[str, str] = {}
+    for name in sections or SECTION_SCHEMAS:
+        schema = SECTION_SCHEMAS[name]
+        if name not in resume:
+            problems[name] = "missing"
+            continue
+        if resume[name] is None:
+            valid[name] = EMPTY_SECTIONS[name]
+            continue
+        try:
+            valid[name] = schema.validate_python(resume[name], strict=True)
+        except ValidationError as e:
+            error = e.errors()[0]
+            problems[name] = f"invalid ({error['msg']})"
+    return valid, problems
+
+
+class RepairStats:
+    """Counters for responses that needed follow-up calls to fill in sections"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.repaired = 0
+        self.failed = 0
+        self.rounds = 0
+        self.sections_requested = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def record_round(self, sections: int, usage: dict):
+        self.rounds += 1
+        self.sections_requested += sections
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.completion_tokens += usage.get("completion_tokens", 0)
+
+    def stats(self) -> dict:
+        return {
+            "repaired": self.repaired,
+            "failed": self.failed,
+            "rounds": self.rounds,
+            "sections_requested": self.sections_requested,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+# Shared repair counters reported at /metrics
+repair_stats = RepairStats()
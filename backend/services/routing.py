@@ -0,0 +1,157 @@
+"""
+Model routing by input size and standard, with fallback and per-route stats
+"""
+import hashlib
+import json
+import os
+from collections import deque
+from typing import Any, Dict, List, Optional
+from openai import APITimeoutError, InternalServerError, RateLimitError
+
+# Latencies kept per route for percentiles
+LATENCY_WINDOW = 500
+
+# Default policy: bigger inputs get more output tokens and a longer timeout,
+# and calls that time out or hit overload retry once on the "long" route.
+# A null model means LLM_MODEL.
+DEFAULT_ROUTES: List[Dict[str, Any]] = [
+    {"name": "short", "max_input_tokens": 1500, "model": None, "max_tokens": 4000, "timeout": 30, "fallback": "long"},
+    {"name": "medium", "max_input_tokens": 4000, "model": None, "max_tokens": 8000, "timeout": 60, "fallback": "long"},
+    {"name": "long", "max_input_tokens": None, "model": None, "max_tokens": 16000, "timeout": 120, "fallback": None},
+]
+
+
+class Route:
+    """One row of the policy table and the outcomes of the calls it served"""
+
+    FIELDS = ("name", "max_input_tokens", "standards", "model", "max_tokens", "timeout", "fallback")
+
+    def __init__(
+        self,
+        name: str,
+        max_input_tokens: Optional[int] = None,
+        standards: Optional[List[str]] = None,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        timeout: float = 60.0,
+        fallback: Optional[str] = None,
+    ):
+        self.name = name
+        self.max_input_tokens = max_input_tokens
+        self.standards = standards
+        self.model = model
+        self.max_tokens = max_tokens
+        self.timeout = float(timeout)
+        self.fallback = fallback
+        self.calls = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.fell_back = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def matches(self, input_tokens: int, standard: Optional[str]) -> bool:
+        if self.max_input_tokens is not None and input_tokens > self.max_input_tokens:
+            return False
+        return not self.standards or standard in self.standards
+
+    def latencies(self) -> List[float]:
+        """Recent latencies of successful calls, in seconds"""
+        return list(self._latencies)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+        return {
+            "model": self.model,
+            "calls": self.calls,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "fell_back": self.fell_back,
+            "success_rate": round(self.succeeded / self.calls, 4) if self.calls else None,
+            "latency_p50": _percentile(latencies, 0.5),
+            "latency_p95": _percentile(latencies, 0.95),
+        }
+
+
+class RoutingPolicy:
+    """
+    Picks the model, output token limit and timeout for a call.
+
+    Routes are checked in table order; the first whose input token limit and
+    standards (if any) match is used, and the last route should have no
+    limit. The table is DEFAULT_ROUTES or a JSON list of routes in the file
+    named by LLM_ROUTES.
+    """
+
+    def __init__(self):
+        self.configure()
+
+    def configure(self):
+        """(Re)load the policy table from the environment and reset stats"""
+        path = os.getenv("LLM_ROUTES")
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                table = json.load(f)
+        else:
+            table = DEFAULT_ROUTES
+        self.routes = [_route_from_dict(row) for row in table]
+        # Identifies the table, so results cached under one policy are not
+        # served after the models or limits change
+        self.version = hashlib.sha256(json.dumps(table, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        if not self.routes:
+            raise ValueError("LLM_ROUTES must define at least one route")
+        self._by_name = {route.name: route for route in self.routes}
+        if len(self._by_name) != len(self.routes):
+            raise ValueError("Route names in LLM_ROUTES must be unique")
+        for route in self.routes:
+            if route.fallback is not None and route.fallback not in self._by_name:
+                raise ValueError(f"Route {route.name} falls back to unknown route: {route.fallback}")
+
+    def select(self, input_tokens: int, standard: Optional[str] = None) -> Route:
+        """First route matching the input; the last route when none does"""
+        for route in self.routes:
+            if route.matches(input_tokens, standard):
+                return route
+        return self.routes[-1]
+
+    def fallback(self, route: Route, error: BaseException, tried: List[str]) -> Optional[Route]:
+        """Route to try after ``route`` failed with ``error``, if any"""
+        if route.fallback is None or route.fallback in tried or not is_fallback_error(error):
+            return None
+        route.fell_back += 1
+        return self._by_name[route.fallback]
+
+    def record(self, route: Route, latency: float, error: Optional[BaseException] = None):
+        """Count one call served by ``route``"""
+        route.calls += 1
+        if error is None:
+            route.succeeded += 1
+            route._latencies.append(latency)
+        else:
+            route.failed += 1
+
+    def stats(self) -> dict:
+        return {route.name: route.stats() for route in self.routes}
+
+
+def is_fallback_error(error: BaseException) -> bool:
+    """Timeouts and overload, which another model or configuration may avoid"""
+    if isinstance(error, RateLimitError):
+        return "insufficient_quota" not in str(error).lower()
+    return isinstance(error, (APITimeoutError, InternalServerError))
+
+
+def _route_from_dict(row: Dict[str, Any]) -> Route:
+    unknown = set(row) - set(Route.FIELDS)
+    if unknown or "name" not in row:
+        raise ValueError(f"Invalid route {row!r}: needs a name and only {', '.join(Route.FIELDS)}")
+    return Route(**row)
+
+
+def _percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+
+# Shared policy, reloaded by the application lifespan
+routing_policy = RoutingPolicy()
@@ -0,0 +1,178 @@
+"""
+Rule-based resume section segmentation
+"""
+import bisect
+import re
+from collections import Counter
+from typing import Dict, List
+
+# Canonical sections and the headings that introduce them
+SECTION_HEADINGS = {
+    "summary": r"(professional |career |executive )?(summary|profile|objective)|about( me)?",
+    "experience": r"((work|professional|employment|relevant) )?(experience|history)|employment|work|career history",
+    "education": r"education( (and|&) (training|qualifications))?|academic (background|qualifications)|qualifications",
+    "skills": r"((technical|core|key|professional) )?(skills|competencies)( (and|&) (tools|technologies))?|technologies|tech stack",
+    "certifications": r"certifications?|licen[cs]es( (and|&) certifications)?|courses",
+    "projects": r"(personal |key )?projects",
+    "languages": r"languages",
+    "awards": r"awards|honou?rs|achievements",
+}
+
+# Section that holds everything before the first recognised heading
+PREAMBLE_SECTION = "contact"
+
+_HEADING_PATTERNS = [
+    (name, re.compile(rf"^(?:{pattern})$", re.IGNORECASE))
+    for name, pattern in SECTION_HEADINGS.items()
+]
+_HEADING_DECORATION = re.compile(r"^[\s#*=_\-•|]+|[\s:#*=_\-•|]+$")
+_PAGE_NUMBER = re.compile(r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$", re.IGNORECASE)
+_BOILERPLATE = re.compile(
+    r"^(curriculum vitae|resume|résumé|cv|references( are)? available\s+(up)?on\s+request\.?)$",
+    re.IGNORECASE,
+)
+_LIST_MARKER = re.compile(r"^\s*([-*•▪◦●]|\d+[.)])\s")
+
+# Longest line still treated as a heading
+MAX_HEADING_LENGTH = 40
+
+# Lines either side of a page break that can hold a running header or footer
+PAGE_EDGE_LINES = 2
+
+# Page breaks a line must sit next to before it is treated as a header/footer
+REPEATED_LINE_THRESHOLD = 2
+
+
+def match_heading(line: str) -> str:
+    """Return the canonical section a heading line introduces, or an empty string"""
+    candidate = _HEADING_DECORATION.sub("", line).strip()
+    if not candidate or len(candidate) > MAX_HEADING_LENGTH:
+        return ""
+    for name, pattern in _HEADING_PATTERNS:
+        if pattern.match(candidate):
+            return name
+    return ""
+
+
+def clean_resume_text(text: str) -> str:
+    """
+    Drop page numbers, boilerplate and repeated header/footer lines, and
+    collapse runs of blank lines.
+
+    Page breaks are form feeds and page number lines, plus the start and end
+    of the text. A line is a running header or footer when it sits within
+    PAGE_EDGE_LINES of REPEATED_LINE_THRESHOLD or more page breaks; its later
+    copies next to page breaks are dropped. Lines inside a page are kept even
+    when they repeat, such as the same title or employer in several roles.
+    """
+    lines: List[str] = []
+    breaks = [-1]
+    for page in text.replace("\r\n", "\n").split("\f"):
+        if lines:
+            breaks.append(len(lines))
+            lines.append("")
+        lines.extend(line.rstrip() for line in page.split("\n"))
+    breaks.append(len(lines))
+    breaks.extend(i for i, line in enumerate(lines) if _PAGE_NUMBER.match(line.strip()))
+    breaks.sort()
+    content = [
+        i for i, line in enumerate(lines)
+        if line.strip() and not _PAGE_NUMBER.match(line.strip()) and not _BOILERPLATE.match(line.strip())
+    ]
+
+    # Content lines next to each page break, and how many breaks each line sits next to
+    edges = set()
+    breaks_by_line = Counter()
+    for page_break in breaks:
+        position = bisect.bisect_left(content, page_break)
+        near = content[max(0, position - PAGE_EDGE_LINES):position + PAGE_EDGE_LINES]
+        edges.update(near)
+        breaks_by_line.update({lines[i].strip().lower() for i in near})
+
+    kept = set(content)
+    cleaned: List[str] = []
+    seen = set()
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            if cleaned and cleaned[-1]:
+                cleaned.append("")
+            continue
+        if i not in kept:
+            continue
+        key = stripped.lower()
+        if (
+            i in edges
+            and key in seen
+            and breaks_by_line[key] >= REPEATED_LINE_THRESHOLD
+            and not _LIST_MARKER.match(line)
+            and not match_heading(stripped)
+        ):
+            continue
+        seen.add(key)
+        cleaned.append(line)
+
+    return "\n".join(cleaned).strip()
+
+
+def segment_resume(text: str) -> Dict[str, str]:
+    """
+    Split cleaned resume text into canonical sections.
+
+    Text before the first recognised heading goes to "contact". Repeated
+    headings for the same section are merged in document order.
+    """
+    sections: Dict[str, List[str]] = {}
+    current = PREAMBLE_SECTION
+    for line in clean_resume_text(text).split("\n"):
+        heading = match_heading(line)
+        if heading:
+            current = heading
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(line)
+
+    return {
+        name: "\n".join(body).strip()
+        for name, body in sections.items()
+        if "\n".join(body).strip()
+    }
+
+
+def format_sections(sections: Dict[str, str]) -> str:
+    """
+    Render sections as labelled blocks for the conversion prompt.
+
+    A single unlabelled block is returned when no headings were recognised.
+    """
+    if list(sections) == [PREAMBLE_SECTION]:
+        return sections[PREAMBLE_SECTION]
+    return "\n\n".join(
+        f"{name.upper()}:\n{body}"
+        for name, body in sections.items()
+        if body.strip()
+    )
+
+
+# Labels written by format_sections, e.g. "EXPERIENCE:"
+_SECTION_LABEL = re.compile(
+    "^({}):$".format("|".join(name.upper() for name in [PREAMBLE_SECTION, *SECTION_HEADINGS]))
+)
+
+
+def parse_sections(text: str) -> Dict[str, str]:
+    """Inverse of format_sections: split labelled prompt text back into sections"""
+    sections: Dict[str, List[str]] = {}
+    current = PREAMBLE_SECTION
+    for line in text.split("\n"):
+        label = _SECTION_LABEL.match(line.strip())
+        if label:
+            current = label.group(1).lower()
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(line)
+    return {
+        name: "\n".join(body).strip()
+        for name, body in sections.items()
+        if "\n".join(body).strip()
+    }
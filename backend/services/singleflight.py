@@ -0,0 +1,68 @@
+"""
+Coalescing of identical in-flight calls
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time.
+
+    Callers that arrive while a call for their key is running await the same
+    task instead of starting their own. A caller that is cancelled (e.g. its
+    client disconnected) stops waiting without affecting the others; the
+    shared call itself is cancelled only when its last waiter goes away.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Return the result of ``fn()`` for ``key`` and whether it was shared
+        with an earlier caller.
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+                self.abandoned += 1
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+        }
+
+
+# Shared coalescer for model conversions
+conversion_flight = SingleFlight()
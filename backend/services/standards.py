@@ -0,0 +1,111 @@
+"""
+Deterministic shaping of a canonical resume into each resume standard
+"""
+import copy
+from typing import Any, Dict, List
+
+# Personal info fields per standard; full_name, email and phone are always kept
+PERSONAL_INFO_FIELDS = {
+    "us_ats": ["full_name", "email", "phone", "location", "linkedin", "website"],
+    "europass": ["full_name", "email", "phone", "address", "nationality", "date_of_birth", "linkedin"],
+    "indian_corporate": ["full_name", "email", "phone", "location", "linkedin", "current_ctc", "expected_ctc", "notice_period"],
+    "uk_professional": ["full_name", "email", "phone", "address", "location", "linkedin", "professional_qualifications"],
+}
+
+EXPERIENCE_FIELDS = {
+    "us_ats": ["title", "company", "location", "start_date", "end_date", "achievements"],
+    "europass": ["title", "company", "location", "start_date", "end_date", "description", "achievements"],
+    "indian_corporate": ["title", "company", "location", "start_date", "end_date", "achievements"],
+    "uk_professional": ["title", "company", "location", "start_date", "end_date", "achievements"],
+}
+
+EDUCATION_FIELDS = {
+    "us_ats": ["degree", "institution", "location", "graduation_date", "gpa", "honors"],
+    "europass": ["degree", "field_of_study", "institution", "location", "graduation_date", "grade"],
+    "indian_corporate": ["degree", "institution", "location", "graduation_date", "percentage", "university"],
+    "uk_professional": ["degree", "institution", "location", "graduation_date", "grade", "qualifications"],
+}
+
+REQUIRED_PERSONAL_INFO = ("full_name", "email", "phone")
+
+# Where to look when a standard's field is missing from the canonical record
+FIELD_FALLBACKS = {
+    "address": ["location"],
+    "grade": ["honors", "gpa", "percentage"],
+    "percentage": ["grade", "gpa"],
+    "gpa": ["grade"],
+}
+
+# Skill categories that Indian Corporate lists as soft skills
+SOFT_SKILL_CATEGORIES = ("soft", "interpersonal", "personal")
+
+
+def to_standard(canonical: Dict[str, Any], standard: str) -> Dict[str, Any]:
+    """Shape a canonical resume into the JSON layout of one standard"""
+    if standard not in PERSONAL_INFO_FIELDS:
+        raise ValueError(f"Unknown standard: {standard}")
+
+    personal_info = _pick(canonical.get("personal_info") or {}, PERSONAL_INFO_FIELDS[standard])
+    for field in REQUIRED_PERSONAL_INFO:
+        personal_info.setdefault(field, "")
+
+    return {
+        "personal_info": personal_info,
+        "summary": canonical.get("summary") or "",
+        "experience": [
+            _pick(entry, EXPERIENCE_FIELDS[standard])
+            for entry in canonical.get("experience") or []
+        ],
+        "education": [
+            _pick(entry, EDUCATION_FIELDS[standard])
+            for entry in canonical.get("education") or []
+        ],
+        "skills": _shape_skills(canonical.get("skills") or [], standard),
+    }
+
+
+def _pick(record: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Copy the listed fields, applying fallbacks and dropping empty values"""
+    picked = {}
+    for field in fields:
+        value = record.get(field)
+        if _is_empty(value):
+            for fallback in FIELD_FALLBACKS.get(field, []):
+                if not _is_empty(record.get(fallback)):
+                    value = record[fallback]
+                    break
+        if not _is_empty(value):
+            picked[field] = copy.deepcopy(value)
+    return picked
+
+
+def _shape_skills(categories: Any, standard: str) -> Any:
+    """Flat list for US/UK, categories for EUROPASS, technical/soft split for India"""
+    if isinstance(categories, dict):
+        categories = [{"category": key, "items": value} for key, value in categories.items()]
+    elif categories and not isinstance(categories[0], dict):
+        categories = [{"category": "Skills", "items": list(categories)}]
+
+    categories = [
+        {"category": group.get("category") or "Skills", "items": [item for item in group.get("items") or [] if item]}
+        for group in categories
+    ]
+
+    if standard == "europass":
+        return [group for group in categories if group["items"]]
+
+    if standard == "indian_corporate":
+        technical, soft = [], []
+        for group in categories:
+            name = group["category"].lower()
+            if "language" in name:
+                continue
+            target = soft if any(word in name for word in SOFT_SKILL_CATEGORIES) else technical
+            target.extend(group["items"])
+        return {"technical": technical, "soft_skills": soft}
+
+    return [item for group in categories for item in group["items"]]
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, (str, list, dict)) and not value)
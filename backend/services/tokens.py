@@ -0,0 +1,148 @@
+"""
+Prompt token counting and budget enforcement
+"""
+import logging
+import math
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from services.sections import format_sections
+
+# Exact counts need tiktoken (in requirements.txt); without it counts are estimated
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Characters per token assumed when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Trimming policies applied when a prompt exceeds its budget:
+# - sections: drop optional sections in TRIM_ORDER, then truncate
+# - truncate: keep whole lines from the top until the budget is reached
+# - reject: refuse the conversion
+TRIM_POLICIES = ("sections", "truncate", "reject")
+
+# Sections dropped first, least useful to a structured resume first
+TRIM_ORDER = ["awards", "languages", "projects", "certifications", "summary"]
+
+
+class PromptTooLargeError(Exception):
+    """The resume does not fit the prompt token budget"""
+
+    def __init__(self, tokens: int, budget: int):
+        super().__init__(f"Prompt needs {tokens} tokens, budget is {budget}")
+        self.tokens = tokens
+        self.budget = budget
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """Tokenizer for ``model``, or None (logged once per model) when counts must be estimated"""
+    if not TIKTOKEN_AVAILABLE:
+        logger.warning("tiktoken is not installed; estimating prompt tokens as %d characters each", CHARS_PER_TOKEN)
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encoding files could not be loaded (e.g. offline); estimate instead
+        logger.warning("tiktoken encoding for %s unavailable (%s); estimating prompt tokens", model, e)
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Token count for ``text`` under ``model``'s tokenizer, or an estimate"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def compact_text(text: str) -> str:
+    """
+    Lossless compaction: collapse whitespace runs and blank-line runs.
+    Running headers and footers are already removed by clean_resume_text.
+    """
+    lines: List[str] = []
+    for line in text.split("\n"):
+        line = " ".join(line.split())
+        if not line:
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def fit_to_budget(
+    sections: Dict[str, str], budget: int, policy: str, model: str
+) -> Tuple[str, List[str]]:
+    """
+    Render sections for the prompt within ``budget`` tokens.
+
+    Returns the text and the names of the sections that were dropped, plus
+    "truncated" when text had to be cut.
+    """
+    if policy not in TRIM_POLICIES:
+        raise ValueError(f"Unknown trim policy: {policy}. Available: {', '.join(TRIM_POLICIES)}")
+
+    text = format_sections(sections)
+    tokens = count_tokens(text, model)
+    if tokens <= budget:
+        return text, []
+    if policy == "reject":
+        raise PromptTooLargeError(tokens, budget)
+
+    trimmed: List[str] = []
+    if policy == "sections":
+        sections = dict(sections)
+        for name in TRIM_ORDER:
+            if name not in sections or len(sections) == 1:
+                continue
+            del sections[name]
+            trimmed.append(name)
+            text = format_sections(sections)
+            if count_tokens(text, model) <= budget:
+                return text, trimmed
+
+    return _truncate(text, budget, model), trimmed + ["truncated"]
+
+
+def _truncate(text: str, budget: int, model: str) -> str:
+    """
+    Longest prefix that fits the budget: whole lines, then as many words of
+    the next line as fit, cutting inside a word only when no whole word does
+    (so a resume pasted as one line is shortened rather than dropped)
+    """
+    def fits(candidate: str) -> bool:
+        return count_tokens(candidate, model) <= budget
+
+    lines = text.split("\n")
+    count = _longest_prefix(lines, "\n", fits)
+    kept = "\n".join(lines[:count])
+    if count == len(lines):
+        return kept.strip()
+
+    head = kept + "\n" if kept else ""
+    words = lines[count].split(" ")
+    count = _longest_prefix(words, " ", lambda prefix: fits(head + prefix))
+    if count:
+        return (head + " ".join(words[:count])).strip()
+    count = _longest_prefix(list(words[0]), "", lambda prefix: fits(head + prefix))
+    return (head + words[0][:count]).strip()
+
+
+def _longest_prefix(parts: List[str], separator: str, fits) -> int:
+    """Number of leading parts whose join still fits (binary search)"""
+    low, high = 0, len(parts)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(separator.join(parts[:middle])):
+            low = middle
+        else:
+            high = middle - 1
+    return low
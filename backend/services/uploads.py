@@ -0,0 +1,124 @@
+"""
+Streaming, size-capped upload ingestion
+"""
+import hashlib
+import os
+import tempfile
+import zipfile
+from typing import Optional
+from fastapi import UploadFile
+
+# Read uploads in 64KB chunks
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised as soon as an upload exceeds the size cap"""
+
+    def __init__(self, size: Optional[int] = None):
+        super().__init__(size)
+        self.size = size
+
+
+class SpooledUpload:
+    """
+    An upload written to a private temp file.
+
+    Parsers receive ``path`` and read the file directly, so the bytes are never
+    held in the API process or pickled across to the extraction workers.
+    ``sha256`` is the hex digest of the content, computed while spooling.
+    """
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def close(self):
+        """Delete the temp file"""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _SpoolWriter:
+    """Writes chunks to a temp file, hashing them and enforcing the size cap"""
+
+    def __init__(self, max_size: int, declared_size: Optional[int] = None):
+        self.max_size = max_size
+        self.declared_size = declared_size
+        fd, self.path = tempfile.mkstemp(prefix="resumate-", dir=os.getenv("UPLOAD_SPOOL_DIR") or None)
+        self._out = os.fdopen(fd, "wb")
+        self._digest = hashlib.sha256()
+        self._size = 0
+
+    def write(self, chunk: bytes):
+        self._size += len(chunk)
+        if self._size > self.max_size:
+            raise UploadTooLargeError(self.declared_size)
+        self._digest.update(chunk)
+        self._out.write(chunk)
+
+    def finish(self) -> SpooledUpload:
+        self._out.close()
+        return SpooledUpload(self.path, self._size, self._digest.hexdigest())
+
+    def abort(self):
+        self._out.close()
+        os.unlink(self.path)
+
+
+async def spool_upload(file: UploadFile, max_size: int) -> SpooledUpload:
+    """
+    Copy an upload to a temp file chunk by chunk.
+
+    Rejects immediately when the declared size is over the cap and aborts as
+    soon as the running total exceeds it, so at most ``max_size`` bytes are
+    ever written per upload. The request body has already been received by
+    then; BodySizeLimitMiddleware bounds it before form parsing.
+    """
+    if file.size is not None and file.size > max_size:
+        raise UploadTooLargeError(file.size)
+
+    writer = _SpoolWriter(max_size, file.size)
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.finish()
+
+
+def spool_zip_member(archive_path: str, member: zipfile.ZipInfo, max_size: int) -> SpooledUpload:
+    """
+    Inflate one archive member to a temp file (blocking; run in a thread).
+
+    The declared size is checked first, and the cap is enforced again on the
+    inflated bytes because ZIP headers can lie.
+    """
+    if member.file_size > max_size:
+        raise UploadTooLargeError(member.file_size)
+
+    writer = _SpoolWriter(max_size, member.file_size)
+    try:
+        with zipfile.ZipFile(archive_path) as archive, archive.open(member) as source:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.finish()
@@ -0,0 +1,249 @@
+"""
+Adaptive concurrency limiting and retries for upstream model calls
+"""
+import asyncio
+import email.utils
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional, Tuple
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+
+class UpstreamBusyError(Exception):
+    """A call waited in the queue past its deadline"""
+
+
+class _Lease:
+    """One in-flight slot; release it exactly once with the call's outcome"""
+
+    def __init__(self, limiter: "UpstreamLimiter", latency_target: float):
+        self._limiter = limiter
+        self._latency_target = latency_target
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self, error: Optional[BaseException] = None):
+        if self._released:
+            return
+        self._released = True
+        self._limiter._on_release(time.monotonic() - self._started, error, self._latency_target)
+
+
+class UpstreamLimiter:
+    """
+    AIMD concurrency limit in front of the model API.
+
+    The limit grows by roughly one per window of successful calls and is
+    halved on a 429 or timeout (at most once per cooldown), and trimmed when
+    a call is slower than its latency target. Callers whose calls vary in
+    length pass their own target (e.g. the call's timeout), or 0 to skip the
+    check. Calls over the limit wait in a FIFO queue
+    until their deadline. Rate limits and transient errors are retried with
+    full-jitter exponential backoff, waiting at least as long as Retry-After.
+    """
+
+    # Multiplicative decrease on overload and on slow responses
+    OVERLOAD_FACTOR = 0.5
+    SLOW_FACTOR = 0.9
+    # Minimum seconds between two decreases, so one burst of 429s counts once
+    DECREASE_COOLDOWN = 1.0
+
+    def __init__(self):
+        self.configure()
+
+    def configure(self):
+        """(Re)read settings from the environment and reset state"""
+        self.min_limit = max(1, int(os.getenv("UPSTREAM_MIN_CONCURRENCY", "2")))
+        self.max_limit = max(self.min_limit, int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "64")))
+        initial = float(os.getenv("UPSTREAM_INITIAL_CONCURRENCY", "16"))
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.latency_target = float(os.getenv("UPSTREAM_LATENCY_TARGET", "30"))
+        self.deadline_seconds = float(os.getenv("UPSTREAM_DEADLINE", "90"))
+        self.max_retries = int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))
+        self.backoff_base = float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.5"))
+        self.backoff_max = float(os.getenv("UPSTREAM_BACKOFF_MAX", "20"))
+        self.in_flight = 0
+        self._waiters = deque()
+        self._last_decrease = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.decreases = 0
+
+    def deadline(self) -> float:
+        """Absolute monotonic deadline for a call starting now"""
+        return time.monotonic() + self.deadline_seconds
+
+    async def acquire(self, deadline: float, latency_target: Optional[float] = None) -> _Lease:
+        """Wait for an in-flight slot, failing with UpstreamBusyError at the deadline"""
+        if latency_target is None:
+            latency_target = self.latency_target
+        if self.in_flight < self._capacity() and not self._waiters:
+            self.in_flight += 1
+            return _Lease(self, latency_target)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.rejected += 1
+            raise UpstreamBusyError("Timed out waiting for an upstream slot")
+        except asyncio.CancelledError:
+            # A slot granted just before cancellation must be handed back
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self._wake()
+            self._discard(waiter)
+            raise
+        return _Lease(self, latency_target)
+
+    async def open(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        deadline: Optional[float] = None,
+        retryable: Optional[Callable[[BaseException], bool]] = None,
+        latency_target: Optional[float] = None,
+    ) -> Tuple[Any, _Lease]:
+        """
+        Run ``fn`` in a slot, retrying retryable errors, and return its result
+        with the lease still held (for streams that outlive the call).
+        
+        ``retryable`` can narrow which errors are retried, e.g. when the
+        caller has a fallback for them. ``latency_target`` overrides
+        UPSTREAM_LATENCY_TARGET for this call; 0 never counts it as slow.
+        """
+        deadline = deadline or self.deadline()
+        attempt = 0
+        while True:
+            lease = await self.acquire(deadline, latency_target)
+            self.calls += 1
+            try:
+                return await fn(), lease
+            except Exception as e:
+                lease.release(e)
+                delay = None if retryable and not retryable(e) else self.retry_delay(e, attempt, deadline)
+                if delay is None:
+                    raise
+            except BaseException as e:
+                # Cancelled: free the slot without counting it as a success
+                lease.release(e)
+                raise
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        deadline: Optional[float] = None,
+        retryable: Optional[Callable[[BaseException], bool]] = None,
+        latency_target: Optional[float] = None,
+    ) -> Any:
+        """Run ``fn`` in a slot with retries and release the slot afterwards"""
+        result, lease = await self.open(fn, deadline, retryable, latency_target)
+        lease.release()
+        return result
+
+    def retry_delay(self, error: BaseException, attempt: int, deadline: float) -> Optional[float]:
+        """Seconds to wait before retrying, or None when the error is final"""
+        if attempt >= self.max_retries or not _is_retryable(error):
+            return None
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.backoff_base)
+        if time.monotonic() + delay > deadline:
+            return None
+        return delay
+
+    def _capacity(self) -> int:
+        return max(1, int(self.limit))
+
+    def _on_release(self, latency: float, error: Optional[BaseException], latency_target: float):
+        self.in_flight -= 1
+        if isinstance(error, RateLimitError):
+            self.throttled += 1
+            self._decrease(self.OVERLOAD_FACTOR)
+        elif isinstance(error, APITimeoutError):
+            self._decrease(self.OVERLOAD_FACTOR)
+        elif error is None:
+            if latency_target and latency > latency_target:
+                self._decrease(self.SLOW_FACTOR)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def _decrease(self, factor: float):
+        now = time.monotonic()
+        if now - self._last_decrease < self.DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * factor)
+        self.decreases += 1
+
+    def _wake(self):
+        while self._waiters and self.in_flight < self._capacity():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _discard(self, waiter):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "decreases": self.decreases,
+        }
+
+
+def _is_retryable(error: BaseException) -> bool:
+    if isinstance(error, RateLimitError):
+        # Quota exhaustion is also a 429 but will not clear by waiting
+        return "insufficient_quota" not in str(error).lower()
+    return isinstance(error, (APITimeoutError, APIConnectionError, InternalServerError))
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Seconds requested by Retry-After / retry-after-ms response headers"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, parsed.timestamp() - time.time())
+
+
+# Shared limiter for model calls, reconfigured by the application lifespan
+upstream_limiter = UpstreamLimiter()
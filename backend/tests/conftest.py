@@ -0,0 +1,65 @@
+"""
+Shared fixtures for backend tests
+"""
+import httpx
+import pytest
+from openai import RateLimitError
+
+
+def build_pdf(pages):
+    """Build a PDF with one Helvetica text line per page"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for text in pages:
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        stream = f"BT /F1 12 Tf 72 720 Td ({escaped}) Tj ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+@pytest.fixture
+def make_pdf():
+    """Factory fixture returning PDF bytes for a list of page texts"""
+    return build_pdf
+
+
+def build_rate_limit_error(headers=None, message="Rate limit reached"):
+    """Build the RateLimitError the OpenAI client raises for a 429 response"""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return RateLimitError(message, response=response, body=None)
+
+
+@pytest.fixture
+def rate_limit_error():
+    """Factory for OpenAI 429 errors"""
+    return build_rate_limit_error
+
+
+@pytest.fixture(autouse=True)
+def jobs_db(tmp_path, monkeypatch):
+    """Keep the job queue the app lifespan opens out of the source tree"""
+    monkeypatch.setenv("JOBS_DB", str(tmp_path / "jobs.sqlite3"))
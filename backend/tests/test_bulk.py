@@ -0,0 +1,78 @@
+"""
+Tests for bulk resume ingestion
+"""
+import json
+import zipfile
+from fastapi.testclient import TestClient
+from io import BytesIO
+from main import app
+
+client = TestClient(app)
+
+
+def read_lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestBulkParse:
+    """Test cases for /api/parse-resumes/bulk"""
+
+    def test_zip_archive_streams_one_line_per_file(self, make_pdf):
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("alice.pdf", make_pdf(["Alice Resume"]))
+            archive.writestr("bob.pdf", make_pdf(["Bob Resume"]))
+            archive.writestr("notes.txt", "not a resume")
+            archive.writestr("__MACOSX/._alice.pdf", "resource fork")
+        response = client.post(
+            "/api/parse-resumes/bulk",
+            files={"archive": ("batch.zip", BytesIO(buffer.getvalue()), "application/zip")}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = read_lines(response)
+        summary = lines.pop()
+        assert summary == {"done": True, "total": 3, "succeeded": 2, "failed": 1}
+
+        by_name = {line["file_name"]: line for line in lines}
+        assert by_name["alice.pdf"]["text"] == "Alice Resume"
+        assert by_name["bob.pdf"]["success"] is True
+        assert by_name["notes.txt"]["success"] is False
+        assert by_name["notes.txt"]["status_code"] == 400
+
+    def test_multipart_batch_reports_errors_inline(self, make_pdf):
+        response = client.post(
+            "/api/parse-resumes/bulk",
+            files=[
+                ("files", ("good.pdf", BytesIO(make_pdf(["Good Resume"])), "application/pdf")),
+                ("files", ("huge.pdf", BytesIO(b"x" * (2 * 1024 * 1024 + 1)), "application/pdf")),
+            ]
+        )
+        assert response.status_code == 200
+        lines = read_lines(response)
+        assert lines[-1]["succeeded"] == 1
+        huge = next(line for line in lines[:-1] if line["file_name"] == "huge.pdf")
+        assert "exceeds maximum" in huge["detail"]
+
+    def test_oversized_archive_member_is_rejected(self):
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("bomb.pdf", b"%PDF-" + b"0" * (3 * 1024 * 1024))
+        response = client.post(
+            "/api/parse-resumes/bulk",
+            files={"archive": ("batch.zip", BytesIO(buffer.getvalue()), "application/zip")}
+        )
+        lines = read_lines(response)
+        assert lines[0]["success"] is False
+        assert "exceeds maximum" in lines[0]["detail"]
+
+    def test_archive_must_be_zip(self):
+        response = client.post(
+            "/api/parse-resumes/bulk",
+            files={"archive": ("batch.zip", BytesIO(b"plain text"), "application/zip")}
+        )
+        assert response.status_code == 400
+
+    def test_requires_input(self):
+        response = client.post("/api/parse-resumes/bulk")
+        assert response.status_code == 400
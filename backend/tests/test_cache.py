@@ -0,0 +1,113 @@
+"""
+Tests for result caches
+"""
+import os
+import pytest
+from fastapi.testclient import TestClient
+from io import BytesIO
+from main import app
+from services.cache import LRUCache, ParseResultCache, parse_cache
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def docx_bytes():
+    from docx import Document
+    doc = Document()
+    doc.add_paragraph("Cached Resume Content")
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+class TestLRUCache:
+    """Test cases for LRUCache"""
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = LRUCache(max_bytes=10)
+        cache.set("a", "aaaa", 4)
+        cache.set("b", "bbbb", 4)
+        assert cache.get("a") == "aaaa"
+        cache.set("c", "cccc", 4)
+        assert cache.get("b") is None
+        assert cache.get("a") == "aaaa"
+        assert cache.evictions == 1
+        assert cache.size_bytes == 8
+
+    def test_skips_values_larger_than_cache(self):
+        cache = LRUCache(max_bytes=10)
+        cache.set("big", "x" * 20, 20)
+        assert len(cache) == 0
+
+    def test_expires_entries_after_ttl(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("services.cache.time.monotonic", lambda: now[0])
+        cache = LRUCache(max_bytes=100, ttl=5)
+        cache.set("a", 1, 1)
+        now[0] += 6
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestParseResultCache:
+    """Test cases for ParseResultCache"""
+
+    def test_disk_tier_survives_memory_reset(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PARSE_CACHE_DIR", str(tmp_path))
+        cache = ParseResultCache()
+        key = cache.make_key("abc", "1", "pdf")
+        cache.set(key, {"text": "hello"})
+
+        cache.configure()
+        assert cache.get(key) == {"text": "hello"}
+        assert cache.get(key) == {"text": "hello"}
+        stats = cache.stats()
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+
+    def test_disabled_when_size_is_zero(self, monkeypatch):
+        monkeypatch.setenv("PARSE_CACHE_MAX_MB", "0")
+        cache = ParseResultCache()
+        cache.set("k", {"text": "hello"})
+        assert cache.get("k") is None
+
+    def test_parser_version_changes_key(self):
+        assert ParseResultCache.make_key("abc", "1", "pdf") != ParseResultCache.make_key("abc", "2", "pdf")
+
+    def test_engine_settings_change_key(self):
+        key = ParseResultCache.make_key("abc", "1", "pdf", "auto-p10")
+        assert key != ParseResultCache.make_key("abc", "1", "pdf", "pdfplumber-p10")
+        assert key != ParseResultCache.make_key("abc", "1", "pdf", "auto-p5")
+
+    def test_disk_tier_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PARSE_CACHE_DIR", str(tmp_path))
+        monkeypatch.setenv("PARSE_CACHE_DISK_MAX_MB", "0.025")
+        cache = ParseResultCache()
+        for i in range(3):
+            cache.set(f"k{i}", {"text": "x" * 10000})
+            os.utime(tmp_path / f"k{i}.json", (i, i))
+        cache.memory.clear()
+        assert cache.get("k0") is None
+        assert cache.get("k2") == {"text": "x" * 10000}
+        assert cache.stats()["disk_evictions"] == 1
+        assert cache.stats()["disk_bytes"] <= cache.disk_max_bytes
+
+
+def test_repeat_upload_is_served_from_cache(docx_bytes):
+    """Uploading the same file twice hits the parse cache"""
+    parse_cache.configure()
+
+    def upload():
+        return client.post(
+            "/api/parse-resume",
+            files={"file": ("resume.docx", BytesIO(docx_bytes), "application/vnd.openxmlformats-officedocument.wordprocessingml.document")}
+        )
+
+    first = upload()
+    second = upload()
+    assert first.status_code == second.status_code == 200
+    assert first.json()["cached"] is False
+    assert second.json()["cached"] is True
+    assert second.json()["text"] == first.json()["text"]
+    assert parse_cache.stats()["memory_hits"] == 1
@@ -0,0 +1,60 @@
+"""
+Tests for splitting long resumes into chunks and merging the results
+"""
+from services.chunking import date_key, group_roles, sort_reverse_chronological, split_roles
+
+EXPERIENCE = """Senior Engineer, Acme
+01/2020 - Present
+- Led the platform team
+- Cut costs by 30%
+Engineer, Globex
+03/2016 - 12/2019
+- Built the billing service
+Intern, Initech
+- Wrote tests"""
+
+
+class TestSplitRoles:
+    """Test cases for split_roles and group_roles"""
+
+    def test_header_lines_stay_with_their_bullets(self):
+        roles = split_roles(EXPERIENCE)
+        assert len(roles) == 3
+        assert roles[0].startswith("Senior Engineer, Acme\n01/2020 - Present")
+        assert roles[2] == "Intern, Initech\n- Wrote tests"
+
+    def test_text_without_bullets_is_one_role(self):
+        assert split_roles("Engineer at Acme since 2020.\nBuilt things.") == [
+            "Engineer at Acme since 2020.\nBuilt things."
+        ]
+
+    def test_roles_are_grouped_in_order(self):
+        groups = group_roles(split_roles(EXPERIENCE), 2)
+        assert len(groups) == 2
+        assert groups[0].startswith("Senior Engineer") and "Globex" in groups[0]
+        assert groups[1].startswith("Intern")
+
+
+class TestReverseChronological:
+    """Test cases for date_key and sort_reverse_chronological"""
+
+    def test_date_formats(self):
+        assert date_key("03/2021") == date_key("15/03/2021") == date_key("Mar 2021") == (2021, 3)
+        assert date_key("2021") == (2021, 0)
+        assert date_key("Present") > date_key("12/2024")
+        assert date_key("") == date_key(None) == date_key("n/a") == (0, 0)
+
+    def test_entries_are_sorted_newest_first(self):
+        entries = [
+            {"title": "Intern", "start_date": "06/2014", "end_date": "09/2014"},
+            {"title": "Engineer", "start_date": "03/2016", "end_date": "12/2019"},
+            {"title": "Advisor", "start_date": "2021", "end_date": "Present"},
+            {"title": "Lead", "start_date": "01/2020", "end_date": "Present"},
+            {"title": "Volunteer"},
+        ]
+        titles = [entry["title"] for entry in sort_reverse_chronological(entries)]
+        assert titles == ["Advisor", "Lead", "Engineer", "Intern", "Volunteer"]
+
+    def test_equal_dates_keep_their_order(self):
+        entries = [{"title": str(i), "end_date": "2020"} for i in range(4)]
+        assert sort_reverse_chronological(entries) == entries
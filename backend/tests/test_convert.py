@@ -0,0 +1,792 @@
+"""
+Tests for resume conversion endpoint
+"""
+import asyncio
+import json
+import time
+import httpx
+import pytest
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from main import app
+from middleware.rate_limit import limiter
+from routers import convert
+from openai import AsyncOpenAI, APITimeoutError
+from services.cache import ConversionCache, conversion_cache
+from services.repair import repair_stats
+from services.upstream import upstream_limiter
+from services.routing import routing_policy
+from services.hedging import hedger
+
+client = TestClient(app)
+
+STRUCTURED_RESUME = {
+    "personal_info": {"full_name": "Jane Smith", "email": "jane@example.com"},
+    "summary": "Backend engineer.",
+    "experience": [],
+    "education": [],
+    "skills": ["Python"],
+}
+
+
+class FakeCompletions:
+    """Records prompts and returns a canned completion"""
+
+    def __init__(self, content):
+        self.content = content
+        self.responses = []
+        self.errors = []
+        self.calls = []
+        self.delay = 0
+        self.delays = []
+        self.usage = None
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        delay = self.delays.pop(0) if self.delays else self.delay
+        if delay:
+            await asyncio.sleep(delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        content = self.responses.pop(0) if self.responses else self.content
+        if kwargs.get("stream"):
+            return FakeStream(content)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=self.usage)
+
+
+class FakeStream:
+    """Async iterator of completion chunks a few characters long"""
+
+    def __init__(self, content, chunk_size=7):
+        self.chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        delta = SimpleNamespace(content=self.chunks.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self):
+        self.closed = True
+
+
+def read_events(response) -> list:
+    """Parse an SSE body into (event, data) pairs"""
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Replace the OpenAI client and lift the per-IP rate limit"""
+    completions = FakeCompletions(json.dumps(STRUCTURED_RESUME))
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(convert, "get_openai_client", lambda: fake_client)
+    monkeypatch.setattr(limiter, "enabled", False)
+    conversion_cache.configure()
+    upstream_limiter.configure()
+    routing_policy.configure()
+    hedger.configure()
+    return completions
+
+
+class TestConvertResume:
+    """Test cases for /api/convert-resume"""
+
+    def test_returns_structured_resume(self, fake_openai):
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith\nSKILLS\nPython", "standard": "us_ats"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["resume"] == STRUCTURED_RESUME
+        assert data["standard_name"] == "US ATS"
+
+    def test_prompt_uses_segmented_text(self, fake_openai):
+        client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith\nPage 1 of 1\n\n\n\nSKILLS\nPython", "standard": "us_ats"}
+        )
+        prompt = fake_openai.calls[0]["messages"][1]["content"]
+        assert "CONTACT:\nJane Smith\n\nSKILLS:\nPython" in prompt
+        assert "Page 1 of 1" not in prompt
+        assert "{resume_text}" not in prompt
+
+    def test_prompt_ends_with_resume_text(self, fake_openai):
+        for name in ("Jane Smith", "John Doe"):
+            client.post("/api/convert-resume", json={"resume_text": name, "standard": "us_ats"})
+        first, second = [call["messages"] for call in fake_openai.calls]
+        assert first[0] == second[0]
+        assert first[1]["content"].endswith("Jane Smith")
+        assert first[1]["content"][:-len("Jane Smith")] == second[1]["content"][:-len("John Doe")]
+
+    def test_client_sections_are_used(self, fake_openai):
+        client.post(
+            "/api/convert-resume",
+            json={"resume_text": "ignored", "standard": "europass", "sections": {"experience": "Acme, 2020"}}
+        )
+        prompt = fake_openai.calls[0]["messages"][1]["content"]
+        assert "EXPERIENCE:\nAcme, 2020" in prompt
+
+    def test_missing_field_is_an_error(self, fake_openai):
+        fake_openai.content = json.dumps({"summary": "x"})
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane", "standard": "us_ats"}
+        )
+        assert response.status_code == 500
+        assert "missing required field" in response.json()["detail"]
+
+    def test_empty_text_is_rejected(self, fake_openai):
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "   ", "standard": "us_ats"}
+        )
+        assert response.status_code == 400
+
+    async def test_conversions_do_not_block_each_other(self, fake_openai):
+        """Slow completions overlap instead of queueing on the event loop"""
+        fake_openai.delay = 0.3
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*[
+                async_client.post(
+                    "/api/convert-resume",
+                    json={"resume_text": f"Candidate {i}", "standard": "us_ats"}
+                )
+                for i in range(20)
+            ])
+            elapsed = time.perf_counter() - started
+        assert all(r.status_code == 200 for r in responses)
+        assert elapsed < 0.3 * 5
+
+    async def test_identical_requests_share_one_call(self, fake_openai):
+        fake_openai.delay = 0.2
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            responses = await asyncio.gather(*[
+                async_client.post(
+                    "/api/convert-resume",
+                    json={"resume_text": "Jane  Smith\nSKILLS\nPython", "standard": "us_ats"}
+                )
+                for _ in range(4)
+            ])
+        assert len(fake_openai.calls) == 1
+        assert all(r.json()["resume"] == STRUCTURED_RESUME for r in responses)
+        assert sorted(r.json()["cache"] for r in responses) == ["coalesced"] * 3 + ["miss"]
+
+
+class TestUpstreamLimiting:
+    """Test cases for upstream retries and queueing in /api/convert-resume"""
+
+    def test_rate_limit_is_retried_transparently(self, fake_openai, rate_limit_error):
+        fake_openai.errors = [rate_limit_error({"retry-after-ms": "50"})]
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        assert response.status_code == 200
+        assert len(fake_openai.calls) == 2
+        assert upstream_limiter.stats()["retries"] == 1
+
+    def test_persistent_rate_limit_is_still_a_429(self, fake_openai, monkeypatch, rate_limit_error):
+        monkeypatch.setenv("UPSTREAM_MAX_RETRIES", "1")
+        upstream_limiter.configure()
+        # One attempt and one retry on the selected route, then on its fallback
+        fake_openai.errors = [rate_limit_error({"retry-after-ms": "10"}) for _ in range(4)]
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        assert response.status_code == 429
+        assert len(fake_openai.calls) == 4
+
+    def test_queue_deadline_is_a_503(self, fake_openai, monkeypatch):
+        monkeypatch.setattr(upstream_limiter, "in_flight", upstream_limiter._capacity())
+        monkeypatch.setattr(upstream_limiter, "deadline_seconds", 0.05)
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        assert response.status_code == 503
+        assert not fake_openai.calls
+
+
+class TestModelRouting:
+    """Test cases for routing calls by input size with fallback"""
+
+    def test_short_input_uses_the_short_route(self, fake_openai):
+        client.post("/api/convert-resume", json={"resume_text": "Jane Smith", "standard": "us_ats"})
+        call = fake_openai.calls[0]
+        assert (call["model"], call["timeout"], call["max_tokens"]) == ("gpt-4o-mini", 30.0, 4000)
+        assert routing_policy.stats()["short"]["succeeded"] == 1
+
+    def test_timeout_falls_back_without_retrying(self, fake_openai):
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        fake_openai.errors = [APITimeoutError(request=request)]
+        response = client.post("/api/convert-resume", json={"resume_text": "Jane Smith", "standard": "us_ats"})
+        assert response.status_code == 200
+        assert [call["timeout"] for call in fake_openai.calls] == [30.0, 120.0]
+        assert upstream_limiter.stats()["retries"] == 0
+        stats = routing_policy.stats()
+        assert (stats["short"]["failed"], stats["short"]["fell_back"]) == (1, 1)
+        assert stats["long"]["succeeded"] == 1
+
+    def test_policy_table_selects_the_model(self, fake_openai, tmp_path, monkeypatch):
+        path = tmp_path / "routes.json"
+        path.write_text(json.dumps([
+            {"name": "europass", "standards": ["europass"], "model": "gpt-4o", "timeout": 90},
+            {"name": "default"},
+        ]))
+        monkeypatch.setenv("LLM_ROUTES", str(path))
+        routing_policy.configure()
+        client.post("/api/convert-resume", json={"resume_text": "Jane Smith", "standard": "europass"})
+        client.post("/api/convert-resume", json={"resume_text": "Jane Smith", "standard": "us_ats"})
+        assert [call["model"] for call in fake_openai.calls] == ["gpt-4o", "gpt-4o-mini"]
+        assert "max_tokens" not in fake_openai.calls[1]
+
+    def test_stream_is_routed(self, fake_openai):
+        client.post("/api/convert-resume/stream", json={"resume_text": "Jane Smith", "standard": "us_ats"})
+        assert fake_openai.calls[0]["timeout"] == 30.0
+        assert routing_policy.stats()["short"]["succeeded"] == 1
+
+
+class TestHedging:
+    """Test cases for hedged calls in /api/convert-resume"""
+
+    @pytest.fixture
+    def hedging(self, fake_openai, monkeypatch):
+        monkeypatch.setenv("HEDGE_PERCENTILE", "95")
+        monkeypatch.setenv("HEDGE_BUDGET", "1")
+        monkeypatch.setenv("HEDGE_MIN_SAMPLES", "1")
+        monkeypatch.setenv("HEDGE_MIN_DELAY", "0.05")
+        hedger.configure()
+        routing_policy.record(routing_policy.select(0), 0.01)
+        return fake_openai
+
+    def test_slow_call_is_hedged(self, hedging):
+        hedging.delays = [5.0, 0]
+        started = time.monotonic()
+        response = client.post("/api/convert-resume", json={"resume_text": "Jane Smith", "standard": "us_ats"})
+        assert response.status_code == 200
+        assert time.monotonic() - started < 2.0
+        assert len(hedging.calls) == 2
+        assert hedging.calls[0]["messages"] == hedging.calls[1]["messages"]
+        assert (hedger.stats()["hedged"], hedger.stats()["wins"]) == (1, 1)
+        assert upstream_limiter.stats()["in_flight"] == 0
+
+    def test_fast_call_is_not_hedged(self, hedging):
+        response = client.post("/api/convert-resume", json={"resume_text": "Jane Smith", "standard": "us_ats"})
+        assert response.status_code == 200
+        assert len(hedging.calls) == 1
+        assert hedger.stats()["hedge_rate"] == 0.0
+
+
+class TestTokenBudget:
+    """Test cases for prompt budgeting in /api/convert-resume"""
+
+    def test_usage_is_reported(self, fake_openai):
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith\nSKILLS\nPython", "standard": "us_ats"}
+        )
+        usage = response.json()["usage"]
+        assert usage["estimated_prompt_tokens"] > 0
+        assert usage["budget"] == 6000
+        assert usage["trimmed"] == []
+
+    def test_completion_tokens_come_from_the_api(self, fake_openai):
+        fake_openai.usage = SimpleNamespace(prompt_tokens=900, completion_tokens=250)
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        usage = response.json()["usage"]
+        assert (usage["prompt_tokens"], usage["completion_tokens"]) == (900, 250)
+
+    def test_long_resume_is_trimmed_to_budget(self, fake_openai, monkeypatch):
+        overhead = convert.prompt_overhead("us_ats", convert.DEFAULT_MODEL)
+        monkeypatch.setenv("PROMPT_TOKEN_BUDGET", str(overhead + 200))
+        resume_text = "Jane Smith\nEXPERIENCE\n" + "\n".join(
+            f"Engineer at Company {i}, shipped feature number {i}" for i in range(200)
+        ) + "\nAWARDS\nEmployee of the year"
+        response = client.post("/api/convert-resume", json={"resume_text": resume_text, "standard": "us_ats"})
+        usage = response.json()["usage"]
+        assert usage["trimmed"] == ["awards", "truncated"]
+        assert usage["estimated_prompt_tokens"] <= overhead + 200
+        assert "Company 199" not in fake_openai.calls[0]["messages"][1]["content"]
+
+    def test_reject_policy_returns_413(self, fake_openai, monkeypatch):
+        monkeypatch.setenv("PROMPT_TOKEN_BUDGET", "100")
+        monkeypatch.setenv("PROMPT_TRIM_POLICY", "reject")
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        assert response.status_code == 413
+        assert not fake_openai.calls
+
+
+class TestConversionCache:
+    """Test cases for conversion caching"""
+
+    def test_repeat_conversion_is_served_from_cache(self, fake_openai):
+        payload = {"resume_text": "Jane Smith\nEngineer", "standard": "us_ats"}
+        first = client.post("/api/convert-resume", json=payload)
+        second = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "  Jane   Smith\n\nEngineer  ", "standard": "us_ats"}
+        )
+        assert first.json()["cache"] == "miss"
+        assert second.json()["cache"] == "hit"
+        assert second.json()["resume"] == first.json()["resume"]
+        assert len(fake_openai.calls) == 1
+
+    def test_standard_is_part_of_key(self, fake_openai):
+        client.post("/api/convert-resume", json={"resume_text": "Jane", "standard": "us_ats"})
+        response = client.post("/api/convert-resume", json={"resume_text": "Jane", "standard": "europass"})
+        assert response.json()["cache"] == "miss"
+        assert len(fake_openai.calls) == 2
+
+    def test_routing_change_invalidates_cached_results(self, fake_openai, tmp_path, monkeypatch):
+        payload = {"resume_text": "Jane Smith", "standard": "us_ats"}
+        client.post("/api/convert-resume", json=payload)
+        path = tmp_path / "routes.json"
+        path.write_text(json.dumps([{"name": "default", "model": "gpt-4o"}]))
+        monkeypatch.setenv("LLM_ROUTES", str(path))
+        routing_policy.configure()
+        response = client.post("/api/convert-resume", json=payload)
+        assert response.json()["cache"] == "miss"
+        assert [call["model"] for call in fake_openai.calls] == ["gpt-4o-mini", "gpt-4o"]
+
+    def test_key_covers_model_and_prompt_version(self):
+        base = ConversionCache.make_key("Jane", "us_ats", "gpt-4o-mini", "1")
+        assert base == ConversionCache.make_key(" Jane ", "us_ats", "gpt-4o-mini", "1")
+        assert base != ConversionCache.make_key("Jane", "us_ats", "gpt-4o", "1")
+        assert base != ConversionCache.make_key("Jane", "us_ats", "gpt-4o-mini", "2")
+
+    def test_sqlite_tier_survives_memory_reset(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CONVERT_CACHE_DB", str(tmp_path / "cache.db"))
+        cache = ConversionCache()
+        cache.set("k", STRUCTURED_RESUME)
+        cache.configure()
+        assert cache.get("k") == STRUCTURED_RESUME
+        assert cache.stats()["disk_hits"] == 1
+        cache.close()
+
+    def test_sqlite_entries_expire(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CONVERT_CACHE_DB", str(tmp_path / "cache.db"))
+        monkeypatch.setenv("CONVERT_CACHE_TTL", "60")
+        cache = ConversionCache()
+        cache.set("k", STRUCTURED_RESUME)
+        cache.configure()
+        monkeypatch.setattr("services.cache.time.time", lambda: 10 ** 12)
+        assert cache.get("k") is None
+        cache.close()
+
+
+class TestSectionRepair:
+    """Test cases for repairing missing or invalid sections"""
+
+    def test_only_broken_sections_are_requested_again(self, fake_openai):
+        repair_stats.reset()
+        broken = dict(STRUCTURED_RESUME, summary=["Not a string."])
+        del broken["skills"]
+        fake_openai.responses = [json.dumps(broken), json.dumps({"summary": "Fixed.", "skills": ["Go"]})]
+        fake_openai.usage = SimpleNamespace(prompt_tokens=100, completion_tokens=10)
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["resume"] == dict(STRUCTURED_RESUME, summary="Fixed.", skills=["Go"])
+        assert (data["usage"]["prompt_tokens"], data["usage"]["completion_tokens"]) == (200, 20)
+
+        first, repair = fake_openai.calls
+        assert repair["messages"][:2] == first["messages"]
+        followup = repair["messages"][2]["content"]
+        assert "Sections to return: summary, skills" in followup
+        assert "- skills: missing" in followup
+        assert repair_stats.stats() == {
+            "repaired": 1,
+            "failed": 0,
+            "rounds": 1,
+            "sections_requested": 2,
+            "prompt_tokens": 100,
+            "completion_tokens": 10,
+        }
+
+    def test_null_sections_are_accepted_as_empty(self, fake_openai):
+        fake_openai.responses = [json.dumps(dict(STRUCTURED_RESUME, summary=None, education=None))]
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        assert response.status_code == 200
+        assert response.json()["resume"] == dict(STRUCTURED_RESUME, summary="", education=[])
+        assert len(fake_openai.calls) == 1
+
+    def test_malformed_json_keeps_valid_sections(self, fake_openai):
+        valid = json.dumps(STRUCTURED_RESUME)
+        fake_openai.responses = [
+            valid.replace('"skills": ["Python"]', '"skills": [Python]'),
+            json.dumps({"skills": ["Python"]}),
+        ]
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        assert response.status_code == 200
+        assert response.json()["resume"] == STRUCTURED_RESUME
+        assert "Sections to return: skills" in fake_openai.calls[1]["messages"][2]["content"]
+
+    def test_unrepaired_section_is_an_error(self, fake_openai):
+        repair_stats.reset()
+        fake_openai.content = json.dumps(dict(STRUCTURED_RESUME, experience="none"))
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        assert response.status_code == 500
+        assert "invalid field: experience" in response.json()["detail"]
+        assert len(fake_openai.calls) == 2
+        assert repair_stats.failed == 1
+
+    def test_repair_can_be_disabled(self, fake_openai, monkeypatch):
+        monkeypatch.setenv("CONVERT_REPAIR_ROUNDS", "0")
+        fake_openai.content = "not json"
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        assert response.status_code == 500
+        assert "Failed to parse AI response" in response.json()["detail"]
+        assert len(fake_openai.calls) == 1
+
+    def test_stream_resends_repaired_sections(self, fake_openai):
+        broken = dict(STRUCTURED_RESUME)
+        del broken["education"]
+        fake_openai.responses = [json.dumps(broken), json.dumps({"education": [{"degree": "BSc"}]})]
+        response = client.post(
+            "/api/convert-resume/stream",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        events = read_events(response)
+        assert ("section", {"name": "education", "value": [{"degree": "BSc"}]}) in events
+        assert events[-1][0] == "done"
+        assert events[-1][1]["resume"]["education"] == [{"degree": "BSc"}]
+
+
+class TestChunkedConversion:
+    """Test cases for converting long resumes in concurrent chunks"""
+
+    RESUME_TEXT = "Jane Smith\nSUMMARY\nBackend engineer.\nEXPERIENCE\n" + "\n".join(
+        f"Engineer {year}\n- Shipped release {year}" for year in (2016, 2022, 2019, 2020, 2018)
+    ) + "\nSKILLS\nPython"
+
+    @pytest.fixture
+    def chunked(self, fake_openai, monkeypatch):
+        monkeypatch.setenv("CONVERT_CHUNK_THRESHOLD", "10")
+        monkeypatch.setenv("CONVERT_CHUNK_ROLES", "2")
+        create = fake_openai.create
+
+        async def routed(**kwargs):
+            prompt = kwargs["messages"][1]["content"]
+            if "converted separately" in prompt:
+                profile = dict(STRUCTURED_RESUME)
+                del profile["experience"]
+                fake_openai.content = json.dumps(profile)
+            elif "group of work experience entries" in prompt:
+                text = prompt.split("Resume text to convert:\n")[1]
+                years = [line.split()[1] for line in text.split("\n") if line.startswith("Engineer ")]
+                fake_openai.content = json.dumps({"experience": [
+                    {"title": f"Engineer {year}", "start_date": f"01/{year}", "end_date": f"12/{year}"}
+                    for year in years
+                ]})
+            else:
+                fake_openai.content = json.dumps(STRUCTURED_RESUME)
+            return await create(**kwargs)
+
+        fake_openai.create = routed
+        return fake_openai
+
+    def test_long_resume_is_converted_in_chunks(self, chunked):
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": self.RESUME_TEXT, "standard": "us_ats"}
+        )
+        assert response.status_code == 200
+        resume = response.json()["resume"]
+        assert list(resume) == ["personal_info", "summary", "experience", "education", "skills"]
+        assert [entry["title"] for entry in resume["experience"]] == [
+            f"Engineer {year}" for year in (2022, 2020, 2019, 2018, 2016)
+        ]
+        assert resume["skills"] == STRUCTURED_RESUME["skills"]
+
+        prompts = [call["messages"][1]["content"] for call in chunked.calls]
+        assert len(prompts) == 4
+        assert sum("group of work experience entries" in prompt for prompt in prompts) == 3
+        profile = next(prompt for prompt in prompts if "converted separately" in prompt)
+        assert "Shipped release" not in profile and "SKILLS:\nPython" in profile
+
+    def test_short_resume_is_converted_in_one_call(self, chunked, monkeypatch):
+        monkeypatch.setenv("CONVERT_CHUNK_THRESHOLD", "100000")
+        client.post(
+            "/api/convert-resume",
+            json={"resume_text": self.RESUME_TEXT, "standard": "us_ats"}
+        )
+        assert len(chunked.calls) == 1
+
+    def test_failed_chunk_fails_the_conversion(self, chunked, monkeypatch):
+        monkeypatch.setenv("CONVERT_REPAIR_ROUNDS", "0")
+        create = chunked.create
+
+        async def broken_experience(**kwargs):
+            response = await create(**kwargs)
+            if "group of work experience entries" in kwargs["messages"][1]["content"]:
+                response.choices[0].message.content = json.dumps({"experience": "none"})
+            return response
+
+        chunked.create = broken_experience
+        response = client.post(
+            "/api/convert-resume",
+            json={"resume_text": self.RESUME_TEXT, "standard": "us_ats"}
+        )
+        assert response.status_code == 500
+        assert "experience" in response.json()["detail"]
+
+
+class TestIncrementalConversion:
+    """Test cases for /api/convert-resume/incremental"""
+
+    PREVIOUS_TEXT = (
+        "Jane Smith\njane@example.com\nSUMMARY\nBackend engineer.\n"
+        "EXPERIENCE\nEngineer, Acme\n01/2020 - Present\n- Built X\n"
+        "Intern, Globex\n06/2018 - 09/2018\n- Tested Y\nSKILLS\nPython"
+    )
+    PREVIOUS_RESUME = dict(STRUCTURED_RESUME, experience=[
+        {"title": "Engineer", "company": "Acme", "start_date": "01/2020", "end_date": "Present",
+         "achievements": ["Built X"]},
+        {"title": "Intern", "company": "Globex", "start_date": "06/2018", "end_date": "09/2018",
+         "achievements": ["Tested Y"]},
+    ])
+
+    def refresh(self, resume_text):
+        return client.post("/api/convert-resume/incremental", json={
+            "standard": "us_ats",
+            "previous_resume": self.PREVIOUS_RESUME,
+            "previous_text": self.PREVIOUS_TEXT,
+            "resume_text": resume_text,
+        })
+
+    def test_only_the_edited_section_is_converted(self, fake_openai):
+        fake_openai.content = json.dumps(dict(STRUCTURED_RESUME, summary="Rewritten.", skills=["Python", "Go"]))
+        response = self.refresh(self.PREVIOUS_TEXT.replace("SKILLS\nPython", "SKILLS\nPython, Go"))
+        assert response.status_code == 200
+        data = response.json()
+        assert data["mode"] == "incremental"
+        assert data["regenerated"] == ["skills"]
+        assert data["resume"] == dict(self.PREVIOUS_RESUME, skills=["Python", "Go"])
+
+        prompt = fake_openai.calls[0]["messages"][1]["content"]
+        assert len(fake_openai.calls) == 1
+        assert "converted separately" in prompt
+        assert prompt.endswith("SKILLS:\nPython, Go")
+
+    def test_only_the_edited_role_is_converted(self, fake_openai):
+        fake_openai.content = json.dumps({"experience": [
+            {"title": "Intern", "company": "Globex", "start_date": "06/2018", "end_date": "09/2018",
+             "achievements": ["Tested Y and Z"]},
+        ]})
+        response = self.refresh(self.PREVIOUS_TEXT.replace("- Tested Y", "- Tested Y and Z"))
+        data = response.json()
+        assert data["regenerated"] == ["experience"]
+        assert data["resume"]["experience"][0] == self.PREVIOUS_RESUME["experience"][0]
+        assert data["resume"]["experience"][1]["achievements"] == ["Tested Y and Z"]
+
+        prompt = fake_openai.calls[0]["messages"][1]["content"]
+        assert prompt.endswith("Intern, Globex\n06/2018 - 09/2018\n- Tested Y and Z")
+        assert "Acme" not in prompt.split("Resume text to convert:")[1]
+
+    def test_unchanged_text_makes_no_calls(self, fake_openai):
+        data = self.refresh(self.PREVIOUS_TEXT + "\n").json()
+        assert data["resume"] == self.PREVIOUS_RESUME
+        assert (data["regenerated"], len(data["reused"])) == ([], 5)
+        assert not fake_openai.calls
+
+    def test_unmapped_edit_falls_back_to_full_conversion(self, fake_openai):
+        response = self.refresh(self.PREVIOUS_TEXT + "\nPROJECTS\nResume converter")
+        data = response.json()
+        assert data["mode"] == "full"
+        assert data["resume"] == STRUCTURED_RESUME
+        assert data["reused"] == []
+        assert "OUTPUT FORMAT" in fake_openai.calls[0]["messages"][1]["content"]
+
+
+class TestConvertResumeStream:
+    """Test cases for /api/convert-resume/stream"""
+
+    def test_sections_stream_before_done(self, fake_openai):
+        resume = dict(STRUCTURED_RESUME, experience=[{"title": "Engineer"}, {"title": "Intern"}])
+        fake_openai.content = json.dumps(resume)
+        response = client.post(
+            "/api/convert-resume/stream",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert fake_openai.calls[0]["stream"] is True
+
+        events = read_events(response)
+        assert events[0] == ("section", {"name": "personal_info", "value": resume["personal_info"]})
+        items = [data for event, data in events if event == "item" and data["section"] == "experience"]
+        assert [item["value"]["title"] for item in items] == ["Engineer", "Intern"]
+        assert events[-1][0] == "done"
+        assert events[-1][1]["resume"] == resume
+        assert events[-1][1]["cache"] == "miss"
+
+    def test_cached_conversion_streams_immediately(self, fake_openai):
+        payload = {"resume_text": "Jane Smith", "standard": "us_ats"}
+        client.post("/api/convert-resume", json=payload)
+        events = read_events(client.post("/api/convert-resume/stream", json=payload))
+        assert len(fake_openai.calls) == 1
+        assert [data["name"] for event, data in events if event == "section"] == list(STRUCTURED_RESUME)
+        assert events[-1][1]["cache"] == "hit"
+
+    def test_invalid_response_is_an_error_event(self, fake_openai):
+        fake_openai.content = json.dumps({"summary": "No contact details"})
+        response = client.post(
+            "/api/convert-resume/stream",
+            json={"resume_text": "Jane Smith", "standard": "us_ats"}
+        )
+        event, data = read_events(response)[-1]
+        assert event == "error"
+        assert data["status_code"] == 500
+        assert "personal_info" in data["detail"]
+
+    def test_empty_text_is_rejected(self, fake_openai):
+        response = client.post(
+            "/api/convert-resume/stream",
+            json={"resume_text": "  ", "standard": "us_ats"}
+        )
+        assert response.status_code == 400
+
+
+CANONICAL_RESUME = {
+    "personal_info": {
+        "full_name": "Priya Rao",
+        "email": "priya@example.com",
+        "phone": "+91 98765 43210",
+        "location": "Bengaluru, India",
+        "notice_period": "30 days",
+    },
+    "summary": "Data engineer.",
+    "experience": [{
+        "title": "Data Engineer",
+        "company": "Acme",
+        "location": "Bengaluru",
+        "start_date": "01/2021",
+        "end_date": "Present",
+        "description": "Owns the ingestion platform.",
+        "achievements": ["Cut pipeline cost by 30%"],
+    }],
+    "education": [{
+        "degree": "B.E.",
+        "field_of_study": "Computer Science",
+        "institution": "RV College of Engineering",
+        "university": "VTU",
+        "graduation_date": "2020",
+        "percentage": "82%",
+    }],
+    "skills": [
+        {"category": "Technical Skills", "items": ["Python", "Spark"]},
+        {"category": "Soft Skills", "items": ["Mentoring"]},
+        {"category": "Languages", "items": ["English", "Kannada"]},
+    ],
+}
+
+
+class TestMultiStandardConversion:
+    """Test cases for /api/convert-resume/multi"""
+
+    def test_one_extraction_serves_every_standard(self, fake_openai):
+        fake_openai.content = json.dumps(CANONICAL_RESUME)
+        response = client.post(
+            "/api/convert-resume/multi",
+            json={"resume_text": "Priya Rao", "rewrite_summaries": False}
+        )
+        assert response.status_code == 200
+        resumes = response.json()["resumes"]
+        assert len(fake_openai.calls) == 1
+        assert set(resumes) == {"us_ats", "europass", "indian_corporate", "uk_professional"}
+
+        indian = resumes["indian_corporate"]["resume"]
+        assert indian["personal_info"]["notice_period"] == "30 days"
+        assert indian["education"][0]["university"] == "VTU"
+        assert indian["skills"] == {"technical": ["Python", "Spark"], "soft_skills": ["Mentoring"]}
+
+        europass = resumes["europass"]["resume"]
+        assert europass["personal_info"]["address"] == "Bengaluru, India"
+        assert europass["experience"][0]["description"] == "Owns the ingestion platform."
+        assert europass["education"][0]["field_of_study"] == "Computer Science"
+
+        us = resumes["us_ats"]["resume"]
+        assert "notice_period" not in us["personal_info"]
+        assert us["skills"] == ["Python", "Spark", "Mentoring", "English", "Kannada"]
+        assert resumes["uk_professional"]["resume"]["education"][0]["grade"] == "82%"
+
+    def test_summaries_are_restyled_in_one_call(self, fake_openai):
+        fake_openai.responses = [
+            json.dumps(CANONICAL_RESUME),
+            json.dumps({"summaries": {"us_ats": "ATS summary.", "europass": "EU summary."}}),
+        ]
+        response = client.post(
+            "/api/convert-resume/multi",
+            json={"resume_text": "Priya Rao", "standards": ["us_ats", "europass"]}
+        )
+        resumes = response.json()["resumes"]
+        assert len(fake_openai.calls) == 2
+        assert "us_ats, europass" in fake_openai.calls[1]["messages"][1]["content"]
+        assert resumes["us_ats"]["resume"]["summary"] == "ATS summary."
+        assert resumes["europass"]["resume"]["summary"] == "EU summary."
+
+    def test_canonical_extraction_is_cached(self, fake_openai):
+        fake_openai.content = json.dumps(CANONICAL_RESUME)
+        payload = {"resume_text": "Priya Rao", "rewrite_summaries": False}
+        client.post("/api/convert-resume/multi", json=payload)
+        response = client.post("/api/convert-resume/multi", json=payload)
+        assert response.json()["cache"] == "hit"
+        assert len(fake_openai.calls) == 1
+
+
+class TestOpenAIClientLifecycle:
+    """Test cases for the shared async client"""
+
+    async def test_client_is_created_and_closed(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        monkeypatch.setenv("OPENAI_MAX_CONNECTIONS", "7")
+        monkeypatch.setattr(convert, "openai_client", None)
+        await convert.startup_openai_client()
+        shared = convert.get_openai_client()
+        assert isinstance(shared, AsyncOpenAI)
+        assert shared._client._transport._pool._max_connections == 7
+        await convert.shutdown_openai_client()
+        assert convert.openai_client is None
+        assert shared.is_closed()
+
+    async def test_startup_without_key_defers_error(self, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setattr(convert, "openai_client", None)
+        await convert.startup_openai_client()
+        assert convert.openai_client is None
@@ -0,0 +1,68 @@
+"""
+Tests for streaming DOCX text extraction
+"""
+import zipfile
+import pytest
+from io import BytesIO
+from docx import Document
+from services.docx_text import extract_docx_text
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+MC = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+
+
+def text_box_docx() -> BytesIO:
+    """DOCX whose contact details sit in a text box with a VML fallback copy"""
+    body = f"""<w:document {W} {MC}><w:body>
+<w:p><w:r><mc:AlternateContent>
+<mc:Choice Requires="wps"><w:drawing><w:txbxContent>
+<w:p><w:r><w:t>jane@example.com</w:t></w:r></w:p>
+</w:txbxContent></w:drawing></mc:Choice>
+<mc:Fallback><w:pict><w:txbxContent>
+<w:p><w:r><w:t>jane@example.com</w:t></w:r></w:p>
+</w:txbxContent></w:pict></mc:Fallback>
+</mc:AlternateContent></w:r><w:r><w:t>Jane</w:t><w:tab/><w:t>Smith</w:t></w:r></w:p>
+</w:body></w:document>"""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", body)
+    buffer.seek(0)
+    return buffer
+
+
+class TestExtractDocxText:
+    """Test cases for extract_docx_text"""
+
+    def test_reads_body_tables_and_headers(self):
+        doc = Document()
+        doc.sections[0].header.paragraphs[0].text = "Jane Smith | jane@example.com"
+        doc.add_paragraph("Professional Summary")
+        table = doc.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = "Python"
+        table.cell(0, 1).text = "Kubernetes"
+        buffer = BytesIO()
+        doc.save(buffer)
+        buffer.seek(0)
+
+        lines = extract_docx_text(buffer).split("\n")
+        assert lines == ["Jane Smith | jane@example.com", "Professional Summary", "Python", "Kubernetes"]
+
+    def test_reads_text_boxes_once(self):
+        text = extract_docx_text(text_box_docx())
+        assert text == "jane@example.com\nJane\tSmith"
+
+    def test_tab_stops_are_not_text(self):
+        body = f"""<w:document {W}><w:body>
+<w:p><w:pPr><w:tabs><w:tab w:val="right" w:pos="9000"/><w:tab w:val="left" w:pos="200"/></w:tabs></w:pPr>
+<w:r><w:t>EXPERIENCE</w:t></w:r></w:p>
+</w:body></w:document>"""
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("word/document.xml", body)
+        buffer.seek(0)
+        assert extract_docx_text(buffer) == "EXPERIENCE"
+
+    def test_rejects_non_zip(self):
+        with pytest.raises(zipfile.BadZipFile):
+            extract_docx_text(BytesIO(b"not a docx"))
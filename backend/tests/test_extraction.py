@@ -0,0 +1,196 @@
+"""
+Tests for the process-pool extraction engine
+"""
+import asyncio
+import os
+import time
+import pytest
+from fastapi.testclient import TestClient
+from io import BytesIO
+from main import app
+from services.extraction import (
+    ExtractionEngine,
+    ExtractionError,
+    EngineOverloadedError,
+)
+
+
+def _fail(message: str):
+    raise ExtractionError(message, status_code=422)
+
+
+def _spin():
+    while True:
+        pass
+
+
+def _allocate(megabytes: int):
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def _crash():
+    os._exit(1)
+
+
+@pytest.fixture
+def pool_engine(monkeypatch):
+    """Engine backed by a single worker process"""
+    monkeypatch.setenv("PARSE_WORKERS", "1")
+    monkeypatch.setenv("PARSE_QUEUE_SIZE", "0")
+    engine = ExtractionEngine()
+    engine.start()
+    yield engine
+    engine.shutdown()
+
+
+class TestExtractionEngine:
+    """Test cases for ExtractionEngine"""
+
+    async def test_runs_job_in_process_pool(self, pool_engine):
+        """Jobs run in the pool and report latency"""
+        result = await pool_engine.run(sorted, [3, 1, 2])
+        assert result == [1, 2, 3]
+        stats = pool_engine.stats()
+        assert stats["mode"] == "process_pool"
+        assert stats["completed"] == 1
+        assert stats["queue_depth"] == 0
+        assert stats["latency_ms"]["p99"] is not None
+
+    def test_workers_are_spawned_at_start(self, monkeypatch):
+        """All workers are started up front instead of on the first jobs"""
+        monkeypatch.setenv("PARSE_WORKERS", "2")
+        engine = ExtractionEngine()
+        engine.start()
+        try:
+            assert len(engine._executor._processes) == 2
+        finally:
+            engine.shutdown()
+        assert engine.stats()["completed"] == 0
+
+    async def test_worker_errors_are_propagated(self, pool_engine):
+        """ExtractionError survives the trip back from the worker"""
+        with pytest.raises(ExtractionError) as exc_info:
+            await pool_engine.run(_fail, "bad document")
+        assert exc_info.value.status_code == 422
+        assert exc_info.value.message == "bad document"
+        assert pool_engine.stats()["failed"] == 1
+
+    async def test_rejects_jobs_when_queue_is_full(self, pool_engine):
+        """Jobs beyond workers + queue size are rejected"""
+        pool_engine._pending = 1
+        with pytest.raises(EngineOverloadedError):
+            await pool_engine.run(sorted, [1])
+        assert pool_engine.stats()["rejected"] == 1
+
+    async def test_inline_mode_without_pool(self):
+        """An engine that was never started runs jobs in a thread"""
+        engine = ExtractionEngine()
+        assert await engine.run(len, "abc") == 3
+        assert engine.stats()["mode"] == "inline"
+
+
+class TestWorkerSandbox:
+    """Test cases for worker resource limits"""
+
+    @pytest.fixture
+    def sandboxed_engine(self, monkeypatch):
+        monkeypatch.setenv("PARSE_WORKERS", "1")
+        monkeypatch.setenv("PARSE_WORKER_MEMORY_MB", "512")
+        monkeypatch.setenv("PARSE_JOB_CPU_SECONDS", "1")
+        monkeypatch.setenv("PARSE_JOB_TIMEOUT", "10")
+        engine = ExtractionEngine()
+        engine.start()
+        yield engine
+        engine.shutdown()
+
+    async def test_cpu_budget_stops_spinning_job(self, sandboxed_engine):
+        with pytest.raises(ExtractionError) as exc_info:
+            await sandboxed_engine.run(_spin)
+        assert exc_info.value.status_code == 504
+        assert await sandboxed_engine.run(len, "ok") == 2
+        assert sandboxed_engine.stats()["worker_restarts"] == 0
+
+    async def test_memory_ceiling_rejects_huge_allocation(self, sandboxed_engine):
+        with pytest.raises(ExtractionError) as exc_info:
+            await sandboxed_engine.run(_allocate, 1024)
+        assert exc_info.value.status_code == 422
+        assert await sandboxed_engine.run(_allocate, 16) == 16 * 1024 * 1024
+
+    async def test_crashed_worker_is_respawned(self, sandboxed_engine):
+        with pytest.raises(ExtractionError) as exc_info:
+            await sandboxed_engine.run(_crash)
+        assert exc_info.value.status_code == 422
+        assert sandboxed_engine.stats()["worker_restarts"] == 2
+        assert await sandboxed_engine.run(len, "ok") == 2
+
+    async def test_job_submitted_to_a_broken_pool_is_retried(self, sandboxed_engine):
+        await sandboxed_engine.run(len, "warm up")
+        executor = sandboxed_engine._executor
+        for process in list(executor._processes.values()):
+            process.kill()
+        for _ in range(100):
+            if executor._broken:
+                break
+            await asyncio.sleep(0.02)
+        assert await sandboxed_engine.run(len, "ok") == 2
+        assert sandboxed_engine.stats()["worker_restarts"] == 1
+
+    async def test_stuck_worker_is_killed_at_deadline(self, sandboxed_engine):
+        await sandboxed_engine.run(len, "warm up")
+        sandboxed_engine.job_timeout = 0.5
+        with pytest.raises(ExtractionError) as exc_info:
+            await sandboxed_engine.run(time.sleep, 60)
+        assert exc_info.value.status_code == 504
+        assert sandboxed_engine.stats()["worker_restarts"] == 1
+        sandboxed_engine.job_timeout = 10
+        assert await sandboxed_engine.run(len, "ok") == 2
+
+    async def test_job_abandoned_by_caller_is_stopped_at_deadline(self, sandboxed_engine):
+        await sandboxed_engine.run(len, "warm up")
+        sandboxed_engine.job_timeout = 1
+        with pytest.raises(asyncio.TimeoutError):
+            await sandboxed_engine.run(time.sleep, 60, timeout=0.2)
+        assert sandboxed_engine.stats()["worker_restarts"] == 0
+        await asyncio.sleep(1.5)
+        assert sandboxed_engine.stats()["worker_restarts"] == 1
+        assert await sandboxed_engine.run(len, "ok") == 2
+
+    async def test_job_abandoned_by_caller_keeps_the_pool(self, sandboxed_engine):
+        await sandboxed_engine.run(len, "warm up")
+        with pytest.raises(asyncio.TimeoutError):
+            await sandboxed_engine.run(time.sleep, 0.5, timeout=0.2)
+        await asyncio.sleep(0.5)
+        assert await sandboxed_engine.run(len, "ok") == 2
+        assert sandboxed_engine.stats()["worker_restarts"] == 0
+
+    async def test_job_lost_to_another_jobs_overrun_keeps_its_retry(self, sandboxed_engine):
+        await sandboxed_engine.run(len, "warm up")
+        job = asyncio.ensure_future(sandboxed_engine._run_in_pool(time.sleep, (0.5,), retry=False))
+        await asyncio.sleep(0.2)
+        sandboxed_engine._restart(sandboxed_engine._executor, overrun=True)
+        result, _ = await job
+        assert result is None
+        assert sandboxed_engine.stats()["worker_restarts"] == 1
+
+
+def test_parse_resume_through_lifespan_pool(monkeypatch):
+    """DOCX upload is parsed by the pool started in the lifespan"""
+    from docx import Document
+
+    monkeypatch.setenv("PARSE_WORKERS", "1")
+    doc = Document()
+    doc.add_paragraph("Pooled Resume Content")
+    buffer = BytesIO()
+    doc.save(buffer)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/parse-resume",
+            files={"file": ("resume.docx", BytesIO(buffer.getvalue()), "application/vnd.openxmlformats-officedocument.wordprocessingml.document")}
+        )
+        assert response.status_code == 200
+        assert "Pooled Resume Content" in response.json()["text"]
+
+        metrics = client.get("/metrics").json()
+        assert metrics["extraction"]["mode"] == "process_pool"
+        assert metrics["extraction"]["completed"] >= 1
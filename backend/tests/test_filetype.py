@@ -0,0 +1,77 @@
+"""
+Tests for magic-byte file type sniffing
+"""
+import zipfile
+from fastapi.testclient import TestClient
+from io import BytesIO
+from main import app
+from services.filetype import sniff_file_type, OLE_SIGNATURE
+
+client = TestClient(app)
+
+
+def write(tmp_path, content: bytes) -> str:
+    path = tmp_path / "upload.bin"
+    path.write_bytes(content)
+    return str(path)
+
+
+def make_zip(names) -> bytes:
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name in names:
+            archive.writestr(name, "<xml/>")
+    return buffer.getvalue()
+
+
+class TestSniffFileType:
+    """Test cases for sniff_file_type"""
+
+    def test_pdf(self, tmp_path, make_pdf):
+        assert sniff_file_type(write(tmp_path, make_pdf(["x"]))) == "pdf"
+
+    def test_docx(self, tmp_path):
+        content = make_zip(["[Content_Types].xml", "word/document.xml"])
+        assert sniff_file_type(write(tmp_path, content)) == "docx"
+
+    def test_other_ooxml_is_plain_zip(self, tmp_path):
+        content = make_zip(["[Content_Types].xml", "xl/workbook.xml"])
+        assert sniff_file_type(write(tmp_path, content)) == "zip"
+
+    def test_legacy_doc(self, tmp_path):
+        assert sniff_file_type(write(tmp_path, OLE_SIGNATURE + b"\x00" * 100)) == "doc"
+
+    def test_text(self, tmp_path):
+        assert sniff_file_type(write(tmp_path, "Jürgen Müller\nEngineer".encode("utf-8"))) == "text"
+
+    def test_binary_is_unknown(self, tmp_path):
+        assert sniff_file_type(write(tmp_path, b"\x89PNG\r\n\x1a\n\x00\x00")) == "unknown"
+
+
+class TestContentBasedDispatch:
+    """Test cases for parser dispatch from sniffed content"""
+
+    def test_mislabelled_pdf_is_parsed_as_pdf(self, make_pdf):
+        response = client.post(
+            "/api/parse-resume",
+            files={"file": ("resume.docx", BytesIO(make_pdf(["Mislabelled Resume"])), "application/octet-stream")}
+        )
+        assert response.status_code == 200
+        assert response.json()["file_type"] == "pdf"
+        assert "Mislabelled Resume" in response.json()["text"]
+
+    def test_fake_pdf_is_rejected_before_parsing(self):
+        response = client.post(
+            "/api/parse-resume",
+            files={"file": ("resume.pdf", BytesIO(b"not really a pdf"), "application/pdf")}
+        )
+        assert response.status_code == 400
+        assert "unsupported" in response.json()["detail"].lower()
+
+    def test_ole_doc_is_rejected(self):
+        response = client.post(
+            "/api/parse-resume",
+            files={"file": ("resume.bin", BytesIO(OLE_SIGNATURE + b"\x00" * 100), "application/octet-stream")}
+        )
+        assert response.status_code == 400
+        assert "doc format" in response.json()["detail"].lower()
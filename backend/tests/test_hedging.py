@@ -0,0 +1,84 @@
+"""
+Tests for hedged upstream calls
+"""
+import asyncio
+import pytest
+from services.hedging import Hedger
+
+
+@pytest.fixture
+def hedger(monkeypatch):
+    monkeypatch.setenv("HEDGE_PERCENTILE", "90")
+    monkeypatch.setenv("HEDGE_BUDGET", "1")
+    monkeypatch.setenv("HEDGE_MIN_SAMPLES", "5")
+    monkeypatch.setenv("HEDGE_MIN_DELAY", "0.01")
+    return Hedger()
+
+
+def calls_with_delays(delays, results=None):
+    """An fn for Hedger.run whose n-th call sleeps delays[n]; records cancellations"""
+    state = {"started": 0, "cancelled": 0}
+
+    async def fn():
+        index = state["started"]
+        state["started"] += 1
+        try:
+            await asyncio.sleep(delays[index])
+        except asyncio.CancelledError:
+            state["cancelled"] += 1
+            raise
+        result = (results or {}).get(index, index)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return fn, state
+
+
+class TestHedger:
+    """Test cases for Hedger"""
+
+    def test_delay_is_a_percentile_of_recent_latency(self, hedger):
+        assert hedger.delay([1.0] * 4) is None
+        assert hedger.delay([float(i) for i in range(1, 11)]) == 10.0
+        assert hedger.delay([0.001] * 10) == 0.01
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("HEDGE_PERCENTILE", raising=False)
+        assert Hedger().delay([1.0] * 100) is None
+
+    async def test_fast_call_is_not_hedged(self, hedger):
+        fn, state = calls_with_delays([0.0])
+        assert await hedger.run(fn, 0.2) == 0
+        assert state["started"] == 1
+        assert hedger.stats()["hedged"] == 0
+
+    async def test_slow_call_is_hedged_and_loser_cancelled(self, hedger):
+        fn, state = calls_with_delays([5.0, 0.01])
+        assert await hedger.run(fn, 0.02) == 1
+        assert state == {"started": 2, "cancelled": 1}
+        stats = hedger.stats()
+        assert (stats["hedged"], stats["wins"], stats["win_rate"]) == (1, 1, 1.0)
+
+    async def test_first_call_can_still_win(self, hedger):
+        fn, state = calls_with_delays([0.05, 5.0])
+        assert await hedger.run(fn, 0.02) == 0
+        assert state["cancelled"] == 1
+        assert hedger.stats()["wins"] == 0
+
+    async def test_failed_call_waits_for_the_other(self, hedger):
+        fn, _ = calls_with_delays([0.05, 0.1], {0: ValueError("boom")})
+        assert await hedger.run(fn, 0.02) == 1
+
+        fn, _ = calls_with_delays([0.05, 0.06], {0: ValueError("first"), 1: ValueError("second")})
+        with pytest.raises(ValueError, match="first"):
+            await hedger.run(fn, 0.02)
+
+    async def test_budget_caps_hedges(self, hedger, monkeypatch):
+        monkeypatch.setenv("HEDGE_BUDGET", "0.5")
+        hedger.configure()
+        for _ in range(4):
+            fn, _ = calls_with_delays([0.03, 0.0])
+            await hedger.run(fn, 0.01)
+        stats = hedger.stats()
+        assert (stats["hedged"], stats["over_budget"]) == (2, 2)
+        assert stats["hedge_rate"] == 0.5
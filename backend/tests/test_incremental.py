@@ -0,0 +1,46 @@
+"""
+Tests for diffing resume sections for incremental re-conversion
+"""
+from services.incremental import affected_outputs, changed_sections, match_roles, source_sections
+
+PREVIOUS = {
+    "contact": "Jane Smith\njane@example.com",
+    "experience": "Engineer, Acme\n- Built X",
+    "skills": "Python",
+}
+
+
+class TestSectionDiff:
+    """Test cases for changed_sections, affected_outputs and source_sections"""
+
+    def test_whitespace_edits_are_not_changes(self):
+        current = dict(PREVIOUS, skills="  Python ")
+        assert changed_sections(PREVIOUS, current) == []
+
+    def test_added_removed_and_edited_sections(self):
+        current = {"contact": PREVIOUS["contact"], "skills": "Python, Go", "languages": "French"}
+        assert changed_sections(PREVIOUS, current) == ["skills", "languages", "experience"]
+        assert affected_outputs(["skills", "languages", "experience"]) == {"skills", "experience"}
+
+    def test_unmapped_section_needs_full_conversion(self):
+        assert affected_outputs(["skills", "projects"]) is None
+
+    def test_source_sections_feed_outputs(self):
+        current = {"contact": "Jane", "skills": "Python", "certifications": "AWS", "education": "BSc"}
+        assert source_sections({"skills"}, current) == {"skills": "Python", "certifications": "AWS"}
+
+
+class TestMatchRoles:
+    """Test cases for match_roles"""
+
+    ROLES = ["Engineer, Acme\n- Built X", "Intern, Globex\n- Tested Y"]
+
+    def test_roles_pair_with_entries_in_order(self):
+        entries = [{"title": "Engineer", "company": "Acme"}, {"title": "Intern", "company": "Globex"}]
+        pairs = match_roles(self.ROLES, entries)
+        assert pairs[self.ROLES[1]] is entries[1]
+
+    def test_mismatched_entries_pair_nothing(self):
+        assert match_roles(self.ROLES, [{"title": "Engineer", "company": "Acme"}]) == {}
+        assert match_roles(self.ROLES, [{"company": "Globex"}, {"company": "Acme"}]) == {}
+        assert match_roles(self.ROLES, [{"title": ""}, {"title": "Intern"}]) == {}
@@ -0,0 +1,198 @@
+"""
+Tests for batch conversion jobs
+"""
+import asyncio
+import json
+import httpx
+import pytest
+from main import app
+from middleware.rate_limit import limiter
+from routers import jobs
+from services.jobs import JobQueue, StubJobBackend, job_queue
+
+
+class FailingBackend(StubJobBackend):
+    """Stub that fails items whose text starts with "fail" """
+
+    async def convert(self, resume_text, standard, sections):
+        if resume_text.startswith("fail"):
+            raise ValueError("could not convert")
+        return await super().convert(resume_text, standard, sections)
+
+
+@pytest.fixture
+async def queue(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setenv("JOB_WORKERS", "3")
+    monkeypatch.setattr(limiter, "enabled", False)
+    await job_queue.start(FailingBackend(delay=0.01))
+    yield job_queue
+    await job_queue.shutdown()
+
+
+@pytest.fixture
+async def api(queue):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def wait_until_complete(api, job_id, timeout=5.0):
+    for _ in range(int(timeout / 0.02)):
+        job = (await api.get(f"/api/convert-jobs/{job_id}")).json()
+        if job["status"] == "completed":
+            return job
+        await asyncio.sleep(0.02)
+    raise AssertionError("job did not complete")
+
+
+def batch(count, standard="us_ats"):
+    return {"items": [{"resume_text": f"Candidate {i}\nPython", "standard": standard} for i in range(count)]}
+
+
+class TestJobAPI:
+    """Test cases for /api/convert-jobs"""
+
+    async def test_job_runs_to_completion(self, api):
+        response = await api.post("/api/convert-jobs", json=batch(20))
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.json()["total"] == 20
+
+        job = await wait_until_complete(api, job_id)
+        assert job["succeeded"] == 20
+        assert job["backend"] == "stub"
+
+        page = (await api.get(f"/api/convert-jobs/{job_id}/results", params={"limit": 15})).json()
+        assert len(page["items"]) == 15
+        rest = (await api.get(f"/api/convert-jobs/{job_id}/results", params={"after": page["next"]})).json()
+        indexes = sorted(item["index"] for item in page["items"] + rest["items"])
+        assert indexes == list(range(20))
+        for item in page["items"]:
+            assert item["result"]["resume"]["personal_info"]["full_name"] == f"Candidate {item['index']}"
+
+    async def test_failures_are_recorded_per_item(self, api):
+        body = batch(2)
+        body["items"].append({"resume_text": "fail me", "standard": "europass"})
+        job_id = (await api.post("/api/convert-jobs", json=body)).json()["job_id"]
+        job = await wait_until_complete(api, job_id)
+        assert (job["succeeded"], job["failed"]) == (2, 1)
+        items = (await api.get(f"/api/convert-jobs/{job_id}/results")).json()["items"]
+        failed = [item for item in items if item["status"] == "failed"]
+        assert failed[0]["index"] == 2
+        assert failed[0]["error"] == {"status_code": 500, "detail": "could not convert"}
+
+    async def test_stream_ends_with_summary(self, api):
+        job_id = (await api.post("/api/convert-jobs", json=batch(5))).json()["job_id"]
+        response = await api.get(f"/api/convert-jobs/{job_id}/stream")
+        lines = [json.loads(line) for line in response.text.strip().split("\n")]
+        assert sorted(line["index"] for line in lines[:-1]) == list(range(5))
+        assert lines[-1]["done"] is True
+        assert lines[-1]["succeeded"] == 5
+
+    async def test_cancel_stops_queued_items(self, api, queue):
+        queue.backend.delay = 0.2
+        job_id = (await api.post("/api/convert-jobs", json=batch(10))).json()["job_id"]
+        await asyncio.sleep(0.05)
+        response = (await api.delete(f"/api/convert-jobs/{job_id}")).json()
+        assert response["cancelled"] == 7
+        job = await wait_until_complete(api, job_id)
+        assert (job["succeeded"], job["cancelled"]) == (3, 7)
+
+    async def test_invalid_batches_are_rejected(self, api):
+        assert (await api.post("/api/convert-jobs", json={"items": []})).status_code == 400
+        empty = {"items": [{"resume_text": " ", "standard": "us_ats"}]}
+        assert (await api.post("/api/convert-jobs", json=empty)).status_code == 400
+        assert (await api.get("/api/convert-jobs/unknown")).status_code == 404
+
+
+class TestJobQueue:
+    """Test cases for JobQueue persistence"""
+
+    async def test_interrupted_items_resume_after_restart(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+        monkeypatch.setenv("JOB_WORKERS", "1")
+        queue = JobQueue()
+        await queue.start(StubJobBackend(delay=10))
+        job_id = queue.create_job([{"resume_text": "Jane", "standard": "us_ats"}] * 2)
+        await asyncio.sleep(0.05)
+        assert queue.get_job(job_id)["running"] == 1
+        await queue.shutdown()
+
+        restarted = JobQueue()
+        await restarted.start(StubJobBackend())
+        for _ in range(100):
+            if restarted.get_job(job_id)["status"] == "completed":
+                break
+            await asyncio.sleep(0.02)
+        assert restarted.get_job(job_id)["succeeded"] == 2
+        await restarted.shutdown()
+
+    async def test_starting_a_queue_leaves_a_live_peers_items_running(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+        monkeypatch.setenv("JOB_WORKERS", "1")
+        first = JobQueue()
+        await first.start(StubJobBackend(delay=10))
+        job_id = first.create_job([{"resume_text": "Jane", "standard": "us_ats"}])
+        await asyncio.sleep(0.05)
+
+        second = JobQueue()
+        await second.start(StubJobBackend())
+        await asyncio.sleep(0.05)
+        assert second.get_job(job_id)["running"] == 1
+        await second.shutdown()
+        assert first.get_job(job_id)["running"] == 1
+        await first.shutdown()
+
+    async def test_items_with_an_expired_lease_run_again(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+        monkeypatch.setenv("JOB_WORKERS", "1")
+        queue = JobQueue()
+        await queue.start(StubJobBackend())
+        job_id = queue.create_job([{"resume_text": "Jane", "standard": "us_ats"}])
+        await asyncio.sleep(0.05)
+        # An item claimed by a process that died without renewing its lease
+        queue._db.execute(
+            "UPDATE job_items SET status = 'running', owner = 'gone', lease_until = 0, finished_seq = NULL"
+        )
+        assert queue._requeue_expired() == 1
+        for _ in range(100):
+            if queue.get_job(job_id)["status"] == "completed":
+                break
+            await asyncio.sleep(0.02)
+        assert queue.get_job(job_id)["succeeded"] == 1
+        await queue.shutdown()
+
+    async def test_queues_sharing_a_database_run_each_item_once(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+        monkeypatch.setenv("JOB_WORKERS", "3")
+        converted = []
+
+        class CountingBackend(StubJobBackend):
+            async def convert(self, resume_text, standard, sections):
+                converted.append(resume_text)
+                return await super().convert(resume_text, standard, sections)
+
+        first, second = JobQueue(), JobQueue()
+        await first.start(CountingBackend(delay=0.01))
+        await second.start(CountingBackend(delay=0.01))
+        job_id = first.create_job(batch(30)["items"])
+        second._wakeup.set()
+        for _ in range(200):
+            if first.get_job(job_id)["status"] == "completed":
+                break
+            await asyncio.sleep(0.02)
+        cursors = [result["cursor"] for result in first.get_results(job_id)]
+        await first.shutdown()
+        await second.shutdown()
+        assert sorted(converted) == sorted(item["resume_text"] for item in batch(30)["items"])
+        assert sorted(cursors) == list(range(1, 31))
+
+    async def test_openai_backend_uses_the_conversion_pipeline(self, monkeypatch):
+        async def fake_convert_text(text, standard):
+            return {"summary": text}, "miss", {"prompt_tokens": 1, "completion_tokens": 2}
+        monkeypatch.setattr(jobs, "convert_text", fake_convert_text)
+        result = await jobs.ConversionJobBackend().convert("Jane Smith\nSKILLS\nPython", "us_ats", None)
+        assert result["resume"] == {"summary": "CONTACT:\nJane Smith\n\nSKILLS:\nPython"}
+        assert result["usage"]["completion_tokens"] == 2
+        assert result["usage"]["budget"] == 6000
@@ -0,0 +1,63 @@
+"""
+Tests for incremental JSON object parsing
+"""
+import json
+import pytest
+from services.json_stream import JSONObjectStream
+
+DOCUMENT = {
+    "personal_info": {"full_name": "Jane \"JJ\" Smith", "note": "a, b } c"},
+    "summary": "Engineer: [backend]",
+    "experience": [
+        {"title": "Engineer", "achievements": ["Shipped {x}", "Led 3, then 5"]},
+        {"title": "Intern", "achievements": []},
+    ],
+    "education": [],
+    "skills": ["Python", "SQL"],
+}
+
+
+def feed_all(text: str, chunk_size: int) -> list:
+    parser = JSONObjectStream()
+    events = []
+    for i in range(0, len(text), chunk_size):
+        events.extend(parser.feed(text[i:i + chunk_size]))
+    assert parser.finished
+    return events
+
+
+class TestJSONObjectStream:
+    """Test cases for JSONObjectStream"""
+
+    def test_members_match_full_parse_for_any_chunking(self):
+        text = json.dumps(DOCUMENT, indent=2)
+        for chunk_size in (1, 3, 16, len(text)):
+            members = {e[1]: e[2] for e in feed_all(text, chunk_size) if e[0] == "member"}
+            assert members == DOCUMENT
+
+    def test_array_items_precede_their_member(self):
+        events = feed_all(json.dumps(DOCUMENT), 5)
+        experience = [e for e in events if e[1] == "experience"]
+        assert [e[0] for e in experience] == ["item", "item", "member"]
+        assert experience[1] == ("item", "experience", 1, DOCUMENT["experience"][1])
+
+    def test_member_is_reported_once_complete(self):
+        parser = JSONObjectStream()
+        assert parser.feed('{"summary": "Backend eng') == []
+        assert parser.feed('ineer", "sk') == [("member", "summary", "Backend engineer")]
+
+    def test_markdown_fence_is_ignored(self):
+        events = feed_all("```json\n" + json.dumps({"summary": "x"}) + "\n```", 4)
+        assert events == [("member", "summary", "x")]
+
+    def test_lenient_mode_skips_malformed_values(self):
+        parser = JSONObjectStream(strict=False)
+        events = parser.feed('{"summary": "x", "experience": [{"title": "A"}, {title: B}], "skills": ["Go"]}')
+        members = {e[1]: e[2] for e in events if e[0] == "member"}
+        assert members == {"summary": "x", "skills": ["Go"]}
+        assert parser.invalid == ["experience"]
+        assert parser.finished
+
+    def test_strict_mode_raises_on_malformed_values(self):
+        with pytest.raises(ValueError):
+            JSONObjectStream().feed('{"summary": nope, "skills": []}')
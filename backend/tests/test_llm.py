@@ -0,0 +1,179 @@
+"""
+Tests for the offline LLM backends
+"""
+import json
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from openai import AsyncOpenAI, RateLimitError
+from main import app
+from middleware.rate_limit import limiter
+from routers import convert
+from services.cache import conversion_cache
+from services.llm import RecordReplayClient, ReplayMissError, StubChatClient
+from services.upstream import upstream_limiter
+from services.routing import routing_policy
+from benchmarks import stub_openai_server
+
+client = TestClient(app)
+
+RESUME_TEXT = (
+    "Jane Smith\njane@example.com\n+1 555 010 0200\n\n"
+    "EXPERIENCE\nSenior Engineer, Acme\n- Cut latency by 40%\n\nSKILLS\nPython, SQL"
+)
+
+REQUEST = {
+    "model": "gpt-4o-mini",
+    "messages": [
+        {"role": "system", "content": "Return JSON"},
+        {"role": "user", "content": "Resume text to convert:\n" + RESUME_TEXT},
+    ],
+    "temperature": 0.3,
+}
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Select an LLM backend by name for the conversion router"""
+    monkeypatch.setattr(limiter, "enabled", False)
+    monkeypatch.setattr(convert, "openai_client", None)
+    monkeypatch.setenv("LLM_STUB_LATENCY_MS", "0")
+    conversion_cache.configure()
+    upstream_limiter.configure()
+    routing_policy.configure()
+
+    def select(name):
+        monkeypatch.setenv("LLM_BACKEND", name)
+        monkeypatch.setattr(convert, "openai_client", None)
+    return select
+
+
+class TestStubBackend:
+    """Test cases for StubChatClient"""
+
+    def test_conversion_runs_offline(self, backend, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        backend("stub")
+        response = client.post("/api/convert-resume", json={"resume_text": RESUME_TEXT, "standard": "us_ats"})
+        assert response.status_code == 200
+        resume = response.json()["resume"]
+        assert resume["personal_info"]["full_name"] == "Jane Smith"
+        assert resume["personal_info"]["email"] == "jane@example.com"
+        assert resume["experience"][0]["achievements"] == ["Cut latency by 40%"]
+        assert resume["skills"] == ["Python", "SQL"]
+        assert response.json()["usage"]["completion_tokens"] > 0
+
+    def test_multi_standard_prompts_are_answered(self, backend):
+        backend("stub")
+        response = client.post("/api/convert-resume/multi", json={"resume_text": RESUME_TEXT})
+        resumes = response.json()["resumes"]
+        assert resumes["europass"]["resume"]["skills"] == [{"category": "Technical Skills", "items": ["Python", "SQL"]}]
+        assert resumes["uk_professional"]["resume"]["summary"] == "Professional profile written for uk_professional."
+
+    def test_chunked_conversion_is_answered(self, backend, monkeypatch):
+        monkeypatch.setenv("CONVERT_CHUNK_THRESHOLD", "1")
+        monkeypatch.setenv("CONVERT_CHUNK_ROLES", "1")
+        backend("stub")
+        resume_text = RESUME_TEXT.replace("\n\nSKILLS", "\nEngineer, Globex\n- Built billing\n\nSKILLS")
+        response = client.post("/api/convert-resume", json={"resume_text": resume_text, "standard": "us_ats"})
+        resume = response.json()["resume"]
+        assert [entry["title"] for entry in resume["experience"]] == ["Senior Engineer, Acme", "Engineer, Globex"]
+        assert resume["skills"] == ["Python", "SQL"]
+
+    def test_stream_is_served(self, backend):
+        backend("stub")
+        response = client.post(
+            "/api/convert-resume/stream", json={"resume_text": RESUME_TEXT, "standard": "us_ats"}
+        )
+        assert response.text.count("event: section") == 5
+        assert "event: done" in response.text
+
+    async def test_injected_rate_limits_carry_retry_after(self):
+        stub = StubChatClient(latency_ms=0, rate_limit_rate=1.0, retry_after_ms=250)
+        with pytest.raises(RateLimitError) as error:
+            await stub.chat.completions.create(**REQUEST)
+        assert error.value.response.headers["retry-after-ms"] == "250"
+
+    async def test_latency_distribution_is_seeded(self):
+        first = StubChatClient(latency_ms=500, seed=7)
+        second = StubChatClient(latency_ms=500, seed=7)
+        samples = [first.sample_latency() for _ in range(200)]
+        assert samples == [second.sample_latency() for _ in range(200)]
+        assert 0.35 < sorted(samples)[100] < 0.65
+
+
+class TestRecordReplay:
+    """Test cases for RecordReplayClient"""
+
+    async def test_replay_serves_recorded_responses(self, tmp_path):
+        recorder = RecordReplayClient(str(tmp_path), "record", StubChatClient(latency_ms=0))
+        recorded = await recorder.chat.completions.create(**REQUEST)
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+        replayer = RecordReplayClient(str(tmp_path), "replay")
+        replayed = await replayer.chat.completions.create(**REQUEST)
+        assert replayed.choices[0].message.content == recorded.choices[0].message.content
+        assert replayed.usage.completion_tokens == recorded.usage.completion_tokens
+
+        chunks = [chunk async for chunk in await replayer.chat.completions.create(
+            **REQUEST, stream=True, stream_options={"include_usage": True}
+        )]
+        content = "".join(chunk.choices[0].delta.content for chunk in chunks if chunk.choices)
+        assert content == recorded.choices[0].message.content
+        assert chunks[-1].usage.completion_tokens == recorded.usage.completion_tokens
+
+    async def test_unrecorded_request_is_a_miss(self, tmp_path):
+        replayer = RecordReplayClient(str(tmp_path), "replay")
+        with pytest.raises(ReplayMissError):
+            await replayer.chat.completions.create(**REQUEST)
+        assert replayer.misses == 1
+
+    def test_key_ignores_transport_settings(self):
+        assert RecordReplayClient.request_key(REQUEST) == RecordReplayClient.request_key({**REQUEST, "timeout": 5})
+        changed = {**REQUEST, "temperature": 0.9}
+        assert RecordReplayClient.request_key(REQUEST) != RecordReplayClient.request_key(changed)
+
+    def test_replay_miss_through_the_endpoint(self, backend, tmp_path, monkeypatch):
+        monkeypatch.setenv("LLM_RECORD_DIR", str(tmp_path))
+        backend("replay")
+        response = client.post("/api/convert-resume", json={"resume_text": RESUME_TEXT, "standard": "us_ats"})
+        assert response.status_code == 500
+        assert "No recorded response" in response.json()["detail"]
+
+    def test_unknown_backend_is_reported(self, backend):
+        backend("llama")
+        response = client.post("/api/convert-resume", json={"resume_text": RESUME_TEXT, "standard": "us_ats"})
+        assert response.status_code == 500
+        assert "Unknown LLM_BACKEND" in response.json()["detail"]
+
+
+class TestStubServer:
+    """Test cases for the OpenAI-compatible stub server"""
+
+    @pytest.fixture
+    def openai_client(self, monkeypatch):
+        monkeypatch.setattr(stub_openai_server, "stub", StubChatClient(latency_ms=0))
+        transport = httpx.ASGITransport(app=stub_openai_server.app)
+        return AsyncOpenAI(
+            api_key="stub",
+            base_url="http://stub/v1",
+            http_client=httpx.AsyncClient(transport=transport),
+            max_retries=0,
+        )
+
+    async def test_real_client_talks_to_stub(self, openai_client):
+        completion = await openai_client.chat.completions.create(**REQUEST)
+        resume = json.loads(completion.choices[0].message.content)
+        assert resume["personal_info"]["full_name"] == "Jane Smith"
+
+        stream = await openai_client.chat.completions.create(**REQUEST, stream=True)
+        content = "".join([chunk.choices[0].delta.content async for chunk in stream if chunk.choices])
+        assert json.loads(content) == resume
+        await openai_client.close()
+
+    async def test_rate_limits_reach_the_client(self, openai_client):
+        stub_openai_server.stub.rate_limit_rate = 1.0
+        with pytest.raises(RateLimitError) as error:
+            await openai_client.chat.completions.create(**REQUEST)
+        assert error.value.response.headers["retry-after-ms"] == "1000"
+        await openai_client.close()
@@ -0,0 +1,111 @@
+"""
+Tests for page-parallel PDF extraction
+"""
+import time
+from fastapi.testclient import TestClient
+from io import BytesIO
+from main import app
+from routers import resume
+
+client = TestClient(app)
+
+
+def upload_pdf(content: bytes):
+    return client.post(
+        "/api/parse-resume",
+        files={"file": ("resume.pdf", BytesIO(content), "application/pdf")}
+    )
+
+
+class TestPageParallelExtraction:
+    """Test cases for extract_pdf"""
+
+    def test_pages_are_stitched_in_order(self, make_pdf):
+        response = upload_pdf(make_pdf(["First page", "Second page", "Third page"]))
+        assert response.status_code == 200
+        data = response.json()
+        assert data["text"] == "First page\n\nSecond page\n\nThird page"
+        assert data["page_count"] == 3
+        assert data["warnings"] == []
+
+    def test_page_cap_returns_partial_text_with_warning(self, make_pdf, monkeypatch):
+        monkeypatch.setenv("PDF_MAX_PAGES", "2")
+        response = upload_pdf(make_pdf(["Alpha", "Beta", "Gamma"]))
+        assert response.status_code == 200
+        data = response.json()
+        assert "Gamma" not in data["text"]
+        assert data["warnings"] == ["Only the first 2 of 3 pages were parsed"]
+
+    def test_slow_page_is_skipped_with_warning(self, make_pdf, monkeypatch):
+        original = resume.parse_pdf_pages
+
+        def slow_pages(source, page_indexes, engine):
+            if page_indexes == [1]:
+                time.sleep(0.5)
+            return original(source, page_indexes, engine)
+
+        monkeypatch.setattr(resume, "parse_pdf_pages", slow_pages)
+        monkeypatch.setenv("PDF_ENGINE", "pdfplumber")
+        monkeypatch.setenv("PDF_PAGE_TIMEOUT", "0.2")
+        response = upload_pdf(make_pdf(["Fast one", "Slow two", "Fast three"]))
+        assert response.status_code == 200
+        data = response.json()
+        assert data["text"] == "Fast one\n\nFast three"
+        assert data["warnings"] == ["Page 2 skipped: page time budget exceeded"]
+        assert data["cached"] is False
+
+
+    def test_busy_parser_fails_the_document(self, make_pdf, monkeypatch):
+        original = resume.extraction_engine.run
+
+        async def saturated(fn, source, page_indexes, engine, timeout=None):
+            if page_indexes == [2]:
+                raise resume.EngineOverloadedError("Parser queue is full")
+            return await original(fn, source, page_indexes, engine, timeout=timeout)
+
+        monkeypatch.setattr(resume.extraction_engine, "run", saturated)
+        monkeypatch.setenv("PDF_ENGINE", "pdfplumber")
+        response = upload_pdf(make_pdf(["One", "Two", "Three"]))
+        assert response.status_code == 503
+
+
+class TestPDFEngines:
+    """Test cases for engine selection and fallback"""
+
+    def test_fast_engine_is_used_for_clean_text(self, make_pdf):
+        response = upload_pdf(make_pdf(["Jane Smith", "Data Engineer"]))
+        assert response.status_code == 200
+        data = response.json()
+        assert data["engine"] == "pdfium"
+        assert data["text"] == "Jane Smith\n\nData Engineer"
+
+    def test_garbled_fast_output_falls_back_to_pdfplumber(self, make_pdf, monkeypatch):
+        monkeypatch.setattr(resume, "looks_garbled", lambda text: True)
+        fallbacks = client.get("/metrics").json()["extraction"]["fallbacks"]
+        response = upload_pdf(make_pdf(["Fallback Resume"]))
+        assert response.status_code == 200
+        assert response.json()["engine"] == "pdfplumber"
+        metrics = client.get("/metrics").json()["extraction"]
+        assert metrics["fallbacks"] == fallbacks + 1
+        assert metrics["engines"]["pdfplumber"]["documents"] >= 1
+
+    def test_engine_can_be_forced(self, make_pdf, monkeypatch):
+        monkeypatch.setenv("PDF_ENGINE", "pdfplumber")
+        response = upload_pdf(make_pdf(["Forced Engine Resume"]))
+        assert response.json()["engine"] == "pdfplumber"
+
+
+class TestLooksGarbled:
+    """Test cases for the fast-engine output heuristic"""
+
+    def test_accepts_normal_resume_text(self):
+        assert not resume.looks_garbled("John Doe\nSoftware Engineer • 5 years (Python, Go)")
+
+    def test_flags_empty_text(self):
+        assert resume.looks_garbled("  \n ")
+
+    def test_flags_unmapped_glyphs(self):
+        assert resume.looks_garbled("(cid:12)(cid:34)(cid:56) John")
+
+    def test_flags_text_without_spaces(self):
+        assert resume.looks_garbled("JohnDoeSoftwareEngineer" * 20)
@@ -0,0 +1,67 @@
+"""
+Tests for the prompt registry
+"""
+import pytest
+from prompts.resume_templates import (
+    get_prompt,
+    get_prompt_template,
+    PromptTemplate,
+    CHUNK_PARTS,
+    PROMPTS,
+    RESUME_STANDARDS,
+)
+
+
+class TestPromptRegistry:
+    """Test cases for the prompt registry"""
+
+    def test_templates_are_built_once(self):
+        assert get_prompt_template("us_ats") is get_prompt_template("us_ats")
+        assert get_prompt("europass") is PROMPTS["europass"]
+
+    def test_every_standard_and_helper_prompt_is_registered(self):
+        chunk_prompts = {
+            f"{name}:{part}" for name in [*RESUME_STANDARDS, "canonical"] for part in CHUNK_PARTS
+        }
+        assert set(RESUME_STANDARDS) | {"canonical", "summary_style", "section_repair"} | chunk_prompts == set(PROMPTS)
+
+    @pytest.mark.parametrize("name", list(RESUME_STANDARDS) + ["canonical"])
+    def test_chunk_prompts_split_the_output_format(self, name):
+        experience = get_prompt(f"{name}:experience")
+        profile = get_prompt(f"{name}:profile")
+        assert experience.text.endswith("{resume_text}") and profile.text.endswith("{resume_text}")
+        assert '"experience": [' in experience.text and '"skills"' not in experience.text
+        assert '"experience"' not in profile.text and '"personal_info"' in profile.text
+        base = get_prompt(name).text
+        assert base.split("CRITICAL REQUIREMENTS:")[1].split("\n\n")[0] in experience.text
+
+    @pytest.mark.parametrize("name", list(RESUME_STANDARDS) + ["canonical"])
+    def test_resume_text_comes_last(self, name):
+        template = get_prompt(name)
+        assert template.text.endswith("{resume_text}")
+        assert template.text == template.prefix + "{resume_text}"
+        assert "OUTPUT FORMAT" in template.prefix
+        assert "Return ONLY valid JSON" in template.prefix
+
+    def test_renders_share_the_static_prefix(self):
+        template = get_prompt("uk_professional")
+        first = template.render(resume_text="Jane Smith")
+        second = template.render(resume_text="John Doe")
+        assert first.startswith(template.prefix) and second.startswith(template.prefix)
+
+    def test_render_keeps_json_braces_and_does_not_recurse(self):
+        template = get_prompt("summary_style")
+        prompt = template.render(standards="us_ats", resume_facts='{"summary": "{standards}"}')
+        assert '"summaries": {' in prompt
+        assert prompt.endswith('{"summary": "{standards}"}')
+
+    def test_version_follows_content(self):
+        assert PromptTemplate("a", "Convert:\n{resume_text}").version == PromptTemplate("b", "Convert:\n{resume_text}").version
+        assert PromptTemplate("a", "Convert:\n{resume_text}").version != PromptTemplate("a", "Rewrite:\n{resume_text}").version
+        assert len({template.version for template in PROMPTS.values()}) == len(PROMPTS)
+
+    def test_unknown_prompt_is_an_error(self):
+        with pytest.raises(ValueError):
+            get_prompt("ca_standard")
+        with pytest.raises(ValueError):
+            get_prompt_template("canonical")
@@ -0,0 +1,62 @@
+"""
+Tests for structured resume validation and salvage
+"""
+import json
+from services.repair import salvage_resume, validate_resume
+
+RESUME = {
+    "personal_info": {"full_name": "Jane Smith"},
+    "summary": "Backend engineer.",
+    "experience": [{"title": "Engineer"}],
+    "education": [],
+    "skills": {"technical": ["Python"], "soft_skills": []},
+}
+
+
+class TestSalvageResume:
+    """Test cases for salvage_resume"""
+
+    def test_well_formed_response_is_parsed_whole(self):
+        assert salvage_resume("```json\n" + json.dumps(RESUME) + "\n```") == RESUME
+
+    def test_broken_member_is_dropped(self):
+        text = json.dumps(RESUME).replace('"Backend engineer."', '"Backend "engineer""')
+        salvaged = salvage_resume(text)
+        assert "summary" not in salvaged
+        assert salvaged["skills"] == RESUME["skills"]
+
+    def test_truncated_response_keeps_finished_members(self):
+        text = json.dumps(RESUME)
+        salvaged = salvage_resume(text[:text.index('"education"') + 5])
+        assert set(salvaged) == {"personal_info", "summary", "experience"}
+
+    def test_non_json_salvages_nothing(self):
+        assert salvage_resume("Sorry, I cannot help with that.") == {}
+        assert salvage_resume('["not", "an", "object"]') == {}
+
+
+class TestValidateResume:
+    """Test cases for validate_resume"""
+
+    def test_valid_resume_has_no_problems(self):
+        valid, problems = validate_resume(RESUME)
+        assert valid == RESUME
+        assert problems == {}
+
+    def test_missing_and_mistyped_sections_are_reported(self):
+        resume = dict(RESUME, summary=["Backend engineer."], experience=["Engineer"])
+        del resume["education"]
+        valid, problems = validate_resume(resume)
+        assert set(valid) == {"personal_info", "skills"}
+        assert problems["education"] == "missing"
+        assert problems["summary"].startswith("invalid")
+        assert problems["experience"].startswith("invalid")
+
+    def test_values_are_not_coerced(self):
+        _, problems = validate_resume(dict(RESUME, summary=42))
+        assert set(problems) == {"summary"}
+
+    def test_null_sections_are_valid_and_empty(self):
+        valid, problems = validate_resume(dict(RESUME, summary=None, education=None))
+        assert problems == {}
+        assert valid == dict(RESUME, summary="", education=[])
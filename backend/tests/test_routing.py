@@ -0,0 +1,77 @@
+"""
+Tests for the model routing policy
+"""
+import json
+import httpx
+import pytest
+from openai import APITimeoutError, AuthenticationError
+from services.routing import RoutingPolicy
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+@pytest.fixture
+def policy_file(tmp_path, monkeypatch):
+    """Write a policy table and point LLM_ROUTES at it"""
+    def write(routes):
+        path = tmp_path / "routes.json"
+        path.write_text(json.dumps(routes))
+        monkeypatch.setenv("LLM_ROUTES", str(path))
+        return RoutingPolicy()
+    return write
+
+
+class TestRoutingPolicy:
+    """Test cases for RoutingPolicy"""
+
+    def test_default_routes_follow_input_size(self, monkeypatch):
+        monkeypatch.delenv("LLM_ROUTES", raising=False)
+        policy = RoutingPolicy()
+        assert policy.select(200).name == "short"
+        assert policy.select(3000).name == "medium"
+        assert policy.select(50000).name == "long"
+        assert policy.select(200).timeout < policy.select(50000).timeout
+
+    def test_routes_can_be_limited_to_standards(self, policy_file):
+        policy = policy_file([
+            {"name": "eu", "standards": ["europass"], "model": "gpt-4o"},
+            {"name": "default"},
+        ])
+        assert policy.select(10, "europass").model == "gpt-4o"
+        assert policy.select(10, "us_ats").name == "default"
+
+    @pytest.mark.parametrize("routes", [
+        [],
+        [{"name": "a", "fallback": "missing"}],
+        [{"name": "a", "temperature": 0}],
+        [{"name": "a"}, {"name": "a"}],
+    ])
+    def test_invalid_tables_are_rejected(self, policy_file, routes):
+        with pytest.raises(ValueError):
+            policy_file(routes)
+
+    def test_fallback_on_timeout_only_once_per_route(self, policy_file):
+        policy = policy_file([
+            {"name": "fast", "timeout": 5, "fallback": "slow"},
+            {"name": "slow", "timeout": 60, "fallback": "fast"},
+        ])
+        fast, slow = policy.routes
+        timeout = APITimeoutError(request=REQUEST)
+        assert policy.fallback(fast, timeout, ["fast"]) is slow
+        assert policy.fallback(slow, timeout, ["fast", "slow"]) is None
+        auth = AuthenticationError("bad key", response=httpx.Response(401, request=REQUEST), body=None)
+        assert policy.fallback(fast, auth, ["fast"]) is None
+        assert fast.stats()["fell_back"] == 1
+
+    def test_stats_report_success_rate_and_latency(self, monkeypatch):
+        monkeypatch.delenv("LLM_ROUTES", raising=False)
+        policy = RoutingPolicy()
+        route = policy.select(10)
+        for latency in (1.0, 2.0, 3.0):
+            policy.record(route, latency)
+        policy.record(route, 30.0, APITimeoutError(request=REQUEST))
+        stats = policy.stats()[route.name]
+        assert (stats["calls"], stats["succeeded"], stats["failed"]) == (4, 3, 1)
+        assert stats["success_rate"] == 0.75
+        assert stats["latency_p50"] == 2.0
+        assert policy.stats()["long"]["success_rate"] is None
@@ -0,0 +1,88 @@
+"""
+Tests for resume section segmentation
+"""
+from services.sections import clean_resume_text, segment_resume, format_sections, match_heading, parse_sections
+
+RESUME = """Jane Smith
+jane@example.com | +1 555 0100
+
+PROFESSIONAL SUMMARY
+Backend engineer with 8 years of experience.
+
+Work Experience:
+Senior Engineer, Acme Corp, 2020 - Present
+- Cut p99 latency by 40%
+Jane Smith - Resume
+Page 1 of 2
+
+
+Engineer, Initech, 2016 - 2020
+Jane Smith - Resume
+Page 2 of 2
+
+EDUCATION
+BSc Computer Science, MIT, 2016
+
+Technical Skills
+Python, Go, PostgreSQL
+Jane Smith - Resume
+References available upon request"""
+
+
+class TestSegmentation:
+    """Test cases for segment_resume"""
+
+    def test_detects_sections(self):
+        sections = segment_resume(RESUME)
+        assert list(sections) == ["contact", "summary", "experience", "education", "skills"]
+        assert sections["contact"] == "Jane Smith\njane@example.com | +1 555 0100"
+        assert sections["education"] == "BSc Computer Science, MIT, 2016"
+        assert sections["skills"] == "Python, Go, PostgreSQL"
+
+    def test_drops_page_numbers_and_repeated_furniture(self):
+        experience = segment_resume(RESUME)["experience"]
+        assert "Page 1" not in experience
+        assert experience.count("Jane Smith - Resume") == 1
+        assert "\n\n\n" not in experience
+
+    def test_keeps_lines_repeated_inside_pages(self):
+        text = "\n".join(
+            f"Software Engineer\nAcme Corp\nLondon\n- Shipped project {n}\n- Led team {n}\n" for n in range(4)
+        )
+        experience = segment_resume("EXPERIENCE\n" + text)["experience"]
+        assert experience.count("Software Engineer") == 4
+        assert experience.count("Acme Corp") == 4
+
+    def test_drops_headers_around_form_feeds(self):
+        pages = ["Jane Smith | CV\nEXPERIENCE\nEngineer, Acme\n- Built X", "Jane Smith | CV\nEngineer, Initech\n- Built Y"]
+        experience = segment_resume("\f".join(pages))["experience"]
+        assert "Jane Smith | CV" not in experience
+        assert "Engineer, Initech" in experience
+
+    def test_drops_boilerplate(self):
+        assert "References" not in clean_resume_text(RESUME)
+
+    def test_drops_references_on_request_variants(self):
+        for line in ("References available on request", "references are available on request.", "References available upon request"):
+            assert clean_resume_text(f"Jane Smith\n{line}") == "Jane Smith"
+
+    def test_headings_need_a_whole_line(self):
+        assert match_heading("Skills: Python, Go") == ""
+        assert match_heading("== Education ==") == "education"
+        assert match_heading("Experience") == "experience"
+
+
+class TestFormatSections:
+    """Test cases for format_sections"""
+
+    def test_labels_sections(self):
+        text = format_sections({"contact": "Jane", "skills": "Python"})
+        assert text == "CONTACT:\nJane\n\nSKILLS:\nPython"
+
+    def test_unsegmented_text_is_not_labelled(self):
+        assert format_sections({"contact": "Just some text"}) == "Just some text"
+
+    def test_parse_sections_reverses_formatting(self):
+        sections = {"contact": "Jane\nLondon", "experience": "Engineer\n- Shipped X", "skills": "Python"}
+        assert parse_sections(format_sections(sections)) == sections
+        assert parse_sections("Just some text") == {"contact": "Just some text"}
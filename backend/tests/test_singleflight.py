@@ -0,0 +1,76 @@
+"""
+Tests for in-flight call coalescing
+"""
+import asyncio
+import pytest
+from services.singleflight import SingleFlight
+
+
+def slow_call(result, calls, delay=0.1):
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return result
+    return call
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight"""
+
+    async def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+        results = await asyncio.gather(*[
+            flight.do("key", slow_call("value", calls)) for _ in range(5)
+        ])
+        assert len(calls) == 1
+        assert [value for value, _ in results] == ["value"] * 5
+        assert [shared for _, shared in results] == [False, True, True, True, True]
+        assert flight.stats() == {"in_flight": 0, "upstream_calls": 1, "coalesced": 4, "abandoned": 0}
+
+    async def test_distinct_keys_and_later_calls_run_separately(self):
+        flight = SingleFlight()
+        calls = []
+        await asyncio.gather(flight.do("a", slow_call(1, calls)), flight.do("b", slow_call(2, calls)))
+        await flight.do("a", slow_call(1, calls))
+        assert len(calls) == 3
+
+    async def test_errors_reach_every_waiter(self):
+        flight = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.05)
+            raise ValueError("upstream failed")
+
+        results = await asyncio.gather(
+            flight.do("key", failing), flight.do("key", failing), return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        flight = SingleFlight()
+        calls = []
+        first = asyncio.ensure_future(flight.do("key", slow_call("value", calls, 0.2)))
+        second = asyncio.ensure_future(flight.do("key", slow_call("value", calls, 0.2)))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        assert await second == ("value", True)
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert flight.abandoned == 0
+
+    async def test_call_is_cancelled_when_last_waiter_leaves(self):
+        flight = SingleFlight()
+        finished = []
+
+        async def call():
+            await asyncio.sleep(0.2)
+            finished.append(1)
+
+        waiter = asyncio.ensure_future(flight.do("key", call))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        await asyncio.sleep(0.3)
+        assert finished == []
+        assert flight.stats()["in_flight"] == 0
+        assert flight.abandoned == 1
@@ -0,0 +1,71 @@
+"""
+Tests for prompt token budgeting
+"""
+import pytest
+from services.tokens import (
+    compact_text,
+    count_tokens,
+    fit_to_budget,
+    PromptTooLargeError,
+)
+
+MODEL = "gpt-4o-mini"
+
+SECTIONS = {
+    "contact": "Jane Smith\njane@example.com",
+    "experience": "\n".join(f"Engineer at Company {i}, shipped feature number {i}" for i in range(40)),
+    "skills": "Python, SQL",
+    "projects": "Open source maintainer of a popular library " * 10,
+    "awards": "Employee of the year " * 10,
+}
+
+
+class TestCompaction:
+    """Test cases for compact_text"""
+
+    def test_whitespace_and_blank_runs_collapse(self):
+        assert compact_text("Jane   Smith  \n\n\n\n  Engineer\t\tat Acme") == "Jane Smith\n\nEngineer at Acme"
+
+    def test_repeated_lines_are_kept(self):
+        text = "Senior Engineer\nAcme Corporation, London, UK\nEngineer\nAcme Corporation, London, UK"
+        assert compact_text(text) == text
+
+
+class TestBudget:
+    """Test cases for fit_to_budget"""
+
+    def test_text_within_budget_is_untouched(self):
+        text, trimmed = fit_to_budget(SECTIONS, 100000, "sections", MODEL)
+        assert trimmed == []
+        assert "AWARDS:" in text
+
+    def test_sections_policy_drops_optional_sections_first(self):
+        full = count_tokens(fit_to_budget(SECTIONS, 100000, "sections", MODEL)[0], MODEL)
+        awards = count_tokens("AWARDS:\n" + SECTIONS["awards"], MODEL)
+        text, trimmed = fit_to_budget(SECTIONS, full - awards, "sections", MODEL)
+        assert trimmed == ["awards"]
+        assert "AWARDS:" not in text
+        assert "PROJECTS:" in text
+
+    def test_truncation_keeps_a_prefix_within_budget(self):
+        text, trimmed = fit_to_budget(SECTIONS, 80, "truncate", MODEL)
+        full = fit_to_budget(SECTIONS, 100000, "truncate", MODEL)[0]
+        assert trimmed == ["truncated"]
+        assert count_tokens(text, MODEL) <= 80
+        assert text.startswith("CONTACT:\nJane Smith")
+        assert full.startswith(text)
+        assert all(line in full.split("\n") for line in text.split("\n")[:-1])
+
+    def test_truncation_cuts_a_single_long_line(self):
+        text, trimmed = fit_to_budget({"contact": " ".join(["word"] * 20000)}, 500, "truncate", MODEL)
+        assert trimmed == ["truncated"]
+        assert text.startswith("word word")
+        assert 450 <= count_tokens(text, MODEL) <= 500
+
+    def test_reject_policy_raises(self):
+        with pytest.raises(PromptTooLargeError):
+            fit_to_budget(SECTIONS, 10, "reject", MODEL)
+
+    def test_unknown_policy_is_an_error(self):
+        with pytest.raises(ValueError):
+            fit_to_budget(SECTIONS, 10, "shorten", MODEL)
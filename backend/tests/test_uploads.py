@@ -0,0 +1,84 @@
+"""
+Tests for streaming upload ingestion
+"""
+import hashlib
+import os
+import pytest
+from io import BytesIO
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+from main import app
+from services.uploads import spool_upload, UploadTooLargeError, UPLOAD_CHUNK_SIZE
+
+
+class TestSpoolUpload:
+    """Test cases for spool_upload"""
+
+    async def test_spools_upload_to_temp_file(self):
+        """Upload bytes are written to a temp file that is removed on close"""
+        upload = UploadFile(BytesIO(b"resume bytes"), filename="resume.pdf")
+        with await spool_upload(upload, max_size=1024) as spooled:
+            assert spooled.size == 12
+            assert spooled.sha256 == hashlib.sha256(b"resume bytes").hexdigest()
+            with open(spooled.path, "rb") as f:
+                assert f.read() == b"resume bytes"
+        assert not os.path.exists(spooled.path)
+
+    async def test_rejects_declared_size_without_reading(self):
+        """A declared size over the cap is rejected before any read"""
+        source = BytesIO(b"x" * 10)
+        upload = UploadFile(source, filename="resume.pdf", size=4096)
+        with pytest.raises(UploadTooLargeError) as exc_info:
+            await spool_upload(upload, max_size=1024)
+        assert exc_info.value.size == 4096
+        assert source.tell() == 0
+
+    async def test_aborts_streamed_upload_at_cap(self):
+        """Undeclared uploads stop being read once the cap is crossed"""
+        source = BytesIO(b"x" * (UPLOAD_CHUNK_SIZE * 10))
+        upload = UploadFile(source, filename="resume.pdf")
+        with pytest.raises(UploadTooLargeError):
+            await spool_upload(upload, max_size=UPLOAD_CHUNK_SIZE + 1)
+        assert source.tell() == UPLOAD_CHUNK_SIZE * 2
+
+
+class TestBodySizeLimit:
+    """Test cases for BodySizeLimitMiddleware"""
+
+    def test_declared_length_over_cap_is_rejected_unread(self):
+        client = TestClient(app)
+        response = client.post(
+            "/api/parse-resume",
+            content=b"x" * (3 * 1024 * 1024),
+            headers={"Content-Type": "multipart/form-data; boundary=b"}
+        )
+        assert response.status_code == 400
+        assert "exceeds maximum" in response.json()["detail"]
+
+    async def test_streamed_body_is_cut_off_at_cap(self):
+        pulled, sent = 0, []
+
+        part_header = (
+            b'--b\r\nContent-Disposition: form-data; name="file"; filename="resume.pdf"\r\n'
+            b"Content-Type: application/pdf\r\n\r\n"
+        )
+
+        async def receive():
+            nonlocal pulled
+            pulled += 1
+            body = part_header if pulled == 1 else b"x" * UPLOAD_CHUNK_SIZE
+            return {"type": "http.request", "body": body, "more_body": pulled < 64}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+            "scheme": "http", "path": "/api/parse-resume", "raw_path": b"/api/parse-resume",
+            "root_path": "", "query_string": b"", "server": ("test", 80), "client": ("test", 1),
+            "headers": [(b"content-type", b"multipart/form-data; boundary=b")],
+        }
+        await app(scope, receive, send)
+        assert sent[0]["status"] == 400
+        assert b"exceeds maximum" in sent[1]["body"]
+        assert pulled * UPLOAD_CHUNK_SIZE <= 2 * 1024 * 1024 + 2 * UPLOAD_CHUNK_SIZE
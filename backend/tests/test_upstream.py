@@ -0,0 +1,114 @@
+"""
+Tests for the adaptive upstream limiter
+"""
+import asyncio
+import time
+import pytest
+from openai import RateLimitError
+from services.upstream import UpstreamBusyError, UpstreamLimiter
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setenv("UPSTREAM_MIN_CONCURRENCY", "1")
+    monkeypatch.setenv("UPSTREAM_INITIAL_CONCURRENCY", "2")
+    monkeypatch.setenv("UPSTREAM_BACKOFF_BASE", "0.01")
+    return UpstreamLimiter()
+
+
+def flaky(errors, result="ok", delay=0.0):
+    """Call that raises the queued errors first, then succeeds"""
+    calls = []
+
+    async def call():
+        calls.append(time.monotonic())
+        if delay:
+            await asyncio.sleep(delay)
+        if errors:
+            raise errors.pop(0)
+        return result
+    call.calls = calls
+    return call
+
+
+class TestUpstreamLimiter:
+    """Test cases for UpstreamLimiter"""
+
+    async def test_concurrency_is_capped_and_excess_calls_queue(self, limiter):
+        active, peak = 0, 0
+
+        async def call():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+            return "ok"
+
+        results = await asyncio.gather(*[limiter.run(call) for _ in range(6)])
+        assert results == ["ok"] * 6
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    async def test_queued_call_fails_at_its_deadline(self, limiter):
+        limiter.limit = 1
+        slow = asyncio.ensure_future(limiter.run(flaky([], delay=0.3)))
+        await asyncio.sleep(0.01)
+        with pytest.raises(UpstreamBusyError):
+            await limiter.run(flaky([]), deadline=time.monotonic() + 0.05)
+        assert limiter.rejected == 1
+        assert await slow == "ok"
+
+    async def test_successes_grow_the_limit(self, limiter):
+        for _ in range(10):
+            await limiter.run(flaky([]))
+        assert limiter.limit > 2
+
+    async def test_slow_calls_are_judged_by_their_own_target(self, limiter):
+        limiter.latency_target = 0.01
+        await limiter.run(flaky([], delay=0.05), latency_target=1.0)
+        await limiter.run(flaky([], delay=0.05), latency_target=0)
+        assert limiter.decreases == 0
+        await limiter.run(flaky([], delay=0.05))
+        assert limiter.decreases == 1
+
+    async def test_rate_limit_is_retried_after_retry_after(self, limiter, rate_limit_error):
+        call = flaky([rate_limit_error({"retry-after-ms": "100"})])
+        assert await limiter.run(call) == "ok"
+        assert call.calls[1] - call.calls[0] >= 0.1
+        assert limiter.retries == 1
+        assert limiter.throttled == 1
+        assert limiter.decreases == 1
+
+    async def test_retry_after_seconds_and_dates_are_honoured(self, limiter, rate_limit_error):
+        assert limiter.retry_delay(rate_limit_error({"retry-after": "2"}), 0, time.monotonic() + 10) >= 2
+        date = "Wed, 21 Oct 2015 07:28:00 GMT"
+        assert limiter.retry_delay(rate_limit_error({"retry-after": date}), 0, time.monotonic() + 10) < 1
+
+    async def test_retry_that_would_miss_the_deadline_is_not_attempted(self, limiter, rate_limit_error):
+        call = flaky([rate_limit_error({"retry-after": "5"})])
+        with pytest.raises(RateLimitError):
+            await limiter.run(call, deadline=time.monotonic() + 1)
+        assert len(call.calls) == 1
+
+    async def test_quota_errors_are_not_retried(self, limiter, rate_limit_error):
+        call = flaky([rate_limit_error(message="insufficient_quota")])
+        with pytest.raises(RateLimitError):
+            await limiter.run(call)
+        assert len(call.calls) == 1
+
+    async def test_retries_are_bounded(self, limiter, rate_limit_error):
+        call = flaky([rate_limit_error() for _ in range(10)])
+        with pytest.raises(RateLimitError):
+            await limiter.run(call)
+        assert len(call.calls) == limiter.max_retries + 1
+
+    async def test_cancelled_call_frees_its_slot(self, limiter):
+        limiter.limit = 1
+        task = asyncio.ensure_future(limiter.run(flaky([], delay=1)))
+        waiter = asyncio.ensure_future(limiter.run(flaky([])))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        assert await waiter == "ok"
+        assert limiter.in_flight == 0
+        assert limiter.stats()["queued"] == 0